@@ -0,0 +1,83 @@
+"""Compare arrivals as a list of ``Prediction`` models and as ``PredictionColumns``.
+
+Run with ``python -m benchmarks.columnar_arrivals``. The recorded Victoria line arrivals
+are repeated ``--scale`` times to approximate a busy bus route. For both forms it times
+deserializing the response and then picking one station's arrivals sorted by ETA, and
+measures the Python heap with ``tracemalloc``: its peak while deserializing, and how
+much the result keeps hold of afterwards.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+from pydantic_tfl_api import Client
+
+from .fixtures import create_response, load_fixture
+
+FIXTURE = "arrivalsByLineId_victoria_None_Prediction"
+
+
+def time_call(fn, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def heap_mb(fn) -> tuple[float, float]:
+    # (retained, peak)
+    tracemalloc.start()
+    try:
+        result = fn()  # noqa: F841, kept alive so it counts as retained
+        current, peak = tracemalloc.get_traced_memory()
+        return current / (1024 * 1024), peak / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10, help="times to repeat the recorded predictions")
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    fixture = load_fixture(FIXTURE)
+    content = json.loads(fixture["content"]) * args.scale
+    response = create_response(fixture, json.dumps(content).encode("utf-8"))
+    station = content[0]["naptanId"]
+    client = Client()
+
+    def models():
+        return client._deserialize("Prediction", response)
+
+    def columns():
+        return client._deserialize("PredictionColumns", response)
+
+    def query_models(predictions):
+        return sorted((p for p in predictions if p.naptan_id == station), key=lambda p: p.expected_arrival)
+
+    def query_columns(result):
+        return result.filter(naptan_id=station).sort_by("expected_arrival")
+
+    predictions, prediction_columns = models(), columns()
+    print(f"{len(content)} predictions, {len(response.content) / (1024 * 1024):.1f} MB")
+    print(f"{'':<20} {'deserialize ms':>15} {'query ms':>10} {'retained MB':>12} {'peak heap MB':>13}")
+    for label, build, query, result in [
+        ("Prediction models", models, query_models, predictions),
+        ("PredictionColumns", columns, query_columns, prediction_columns),
+    ]:
+        retained, peak = heap_mb(build)
+        print(
+            f"{label:<20} {time_call(build, args.iterations) * 1000:>15.2f}"
+            f" {time_call(lambda: query(result), args.iterations) * 1000:>10.2f}"
+            f" {retained:>12.1f} {peak:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
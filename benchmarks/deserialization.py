@@ -0,0 +1,168 @@
+"""Benchmark ``Client._deserialize`` over every recorded response in ``tests/tfl_responses``.
+
+Run with ``python -m benchmarks.deserialization``. For each fixture it reports the
+throughput (MB/s of JSON and models/s, counting nested models), the per-call latency
+percentiles and the peak Python heap allocated by one call, measured with
+``tracemalloc`` in a separate call so tracing doesn't slow the timed ones.
+
+``--save`` writes the results to ``benchmarks/baselines/deserialization.json``. Later
+runs compare their median latency and peak heap with that baseline, and ``--check``
+exits with status 1 if any fixture is more than ``--tolerance`` slower or larger.
+Timings depend on the machine, so only compare runs from the same one.
+
+``--validation raw`` runs the other validation level of ``Client``, and the "vs base"
+column then compares it with the stored baseline.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from pydantic_tfl_api import Client
+
+from .fixtures import fixture_names, load_response, model_name
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "deserialization.json"
+
+
+def count_models(value) -> int:
+    if isinstance(value, BaseModel):
+        return 1 + sum(count_models(getattr(value, field)) for field in type(value).model_fields)
+    if isinstance(value, dict):
+        # validation="raw" results
+        return 1 + sum(count_models(item) for item in value.values())
+    if isinstance(value, list):
+        return sum(count_models(item) for item in value)
+    return 0
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def peak_heap_bytes(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_fixture(client: Client, fixture: str, min_time: float, min_iterations: int) -> dict:
+    response = load_response(fixture)
+    name = model_name(fixture)
+    deserialize = lambda: client._deserialize(name, response)  # noqa: E731
+    # the first call builds the model's validators, which isn't what we're measuring
+    models = count_models(deserialize())
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_iterations or time.perf_counter() - started < min_time:
+        start = time.perf_counter()
+        deserialize()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    median = statistics.median(timings)
+    size = len(response.content)
+    return {
+        "bytes": size,
+        "models": models,
+        "iterations": len(timings),
+        "p50_ms": median * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+        "mb_per_s": size / median / (1024 * 1024),
+        "models_per_s": models / median,
+        "peak_heap_bytes": peak_heap_bytes(deserialize),
+    }
+
+
+def run(fixtures: list[str], min_time: float, min_iterations: int, validation: str = "full") -> dict[str, dict]:
+    client = Client(validation=validation)
+    results = {}
+    for fixture in fixtures:
+        if load_response(fixture).status_code != 200:
+            continue
+        results[fixture] = benchmark_fixture(client, fixture, min_time, min_iterations)
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    regressions = []
+    for fixture, result in results.items():
+        base = baseline.get(fixture)
+        if base is None:
+            continue
+        for metric in ["p50_ms", "peak_heap_bytes"]:
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{fixture}: {metric} {result[metric]:.6g} vs baseline {base[metric]:.6g}"
+                    f" (+{(result[metric] / base[metric] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def report(results: dict[str, dict], baseline: dict[str, dict]):
+    print(
+        f"{'fixture':<60} {'KB':>7} {'models':>7} {'MB/s':>7} {'models/s':>10}"
+        f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'heap KB':>9} {'vs base':>8}"
+    )
+    for fixture, result in results.items():
+        base = baseline.get(fixture)
+        change = f"{(result['p50_ms'] / base['p50_ms'] - 1) * 100:+7.0f}%" if base else ""
+        print(
+            f"{fixture[:60]:<60} {result['bytes'] / 1024:>7.0f} {result['models']:>7}"
+            f" {result['mb_per_s']:>7.1f} {result['models_per_s']:>10.0f}"
+            f" {result['p50_ms']:>8.3f} {result['p95_ms']:>8.3f} {result['p99_ms']:>8.3f}"
+            f" {result['peak_heap_bytes'] / 1024:>9.0f} {change:>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixtures", nargs="*", help="fixture names to run, defaults to all of them")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to spend timing each fixture")
+    parser.add_argument("--min-iterations", type=int, default=10)
+    parser.add_argument("--validation", choices=["full", "raw"], default="full")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, e.g. 0.25 for 25%%")
+    args = parser.parse_args()
+
+    results = run(args.fixtures or fixture_names(), args.min_time, args.min_iterations, args.validation)
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline) as f:
+            baseline = json.load(f)["fixtures"]
+    report(results, baseline)
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "fixtures": results,
+            }, f, indent=2)
+            f.write("\n")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"regression: {regression}")
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Helpers for loading the recorded TfL responses in ``tests/tfl_responses``."""
+
+import json
+from pathlib import Path
+
+from requests import Response
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "tfl_responses"
+
+
+def fixture_names() -> list[str]:
+    """Names of the recorded responses, smallest first."""
+    paths = [path for path in FIXTURES_DIR.glob("*.json") if not path.stem.endswith("_expected")]
+    return [path.stem for path in sorted(paths, key=lambda path: path.stat().st_size)]
+
+
+def model_name(fixture_name: str) -> str:
+    # fixture names are {endpoint}_{endpoint_args}_{endpoint_params}_{model}
+    return fixture_name.rsplit("_", 1)[1]
+
+
+def load_fixture(fixture_name: str) -> dict:
+    with open(FIXTURES_DIR / f"{fixture_name}.json", "r") as f:
+        return json.load(f)
+
+
+def create_response(fixture: dict, content: bytes | None = None) -> Response:
+    response = Response()
+    response.status_code = fixture["status_code"]
+    response.headers = fixture["headers"]
+    response.url = fixture["url"]
+    response._content = content if content is not None else fixture["content"].encode("utf-8")
+    return response
+
+
+def load_response(fixture_name: str) -> Response:
+    return create_response(load_fixture(fixture_name))
@@ -0,0 +1,71 @@
+"""Compare deserializing disruptions that mention the same stops with and without a ``StopPointIdentityMap``.
+
+Run with ``python -m benchmarks.identity_map``. It builds ``--responses`` disruption
+responses, each with ``--disruptions`` disruptions affecting a run of the recorded
+Victoria line stop points, and keeps every result as a client holding network-wide
+disruption state would. For each client it reports the time per response and, with
+``tracemalloc``, how much of the Python heap the results keep hold of.
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from pydantic_tfl_api import Client, StopPointIdentityMap
+
+from .fixtures import create_response, load_fixture
+
+FIXTURE = "stopPointsByLineId_victoria_None_StopPoint"
+
+
+def disruption_json(affected_stops: list) -> dict:
+    return {
+        "category": "RealTime", "type": "routeInfo", "categoryDescription": "RealTime",
+        "description": "Minor delays", "affectedRoutes": [], "affectedStops": affected_stops, "closureText": "",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--responses", type=int, default=10)
+    parser.add_argument("--disruptions", type=int, default=5, help="disruptions in each response")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    fixture = load_fixture(FIXTURE)
+    stops = json.loads(fixture["content"])
+    # a fresh Date, so the responses' max-age hasn't passed and stop points can be shared across them
+    date = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    fixture["headers"] = {**fixture["headers"], "Date": date}
+    responses = []
+    for i in range(args.responses):
+        content = [disruption_json(stops[(i + j) % len(stops):][:4]) for j in range(args.disruptions)]
+        responses.append(create_response(fixture, json.dumps(content).encode("utf-8")))
+
+    print(f"{args.responses} responses of {args.disruptions} disruptions, each affecting 4 of {len(stops)} stops")
+    print(f"{'':<22} {'ms/response':>12} {'retained MB':>12}")
+    for label, identity_map in [("no identity map", lambda: None), ("StopPointIdentityMap", StopPointIdentityMap)]:
+        def run():
+            client = Client(identity_map=identity_map())
+            return [client._deserialize("Disruption", response) for response in responses]
+
+        timings = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) / args.responses)
+        gc.collect()
+        tracemalloc.start()
+        results = run()  # noqa: F841, kept alive so it counts as retained
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+        tracemalloc.stop()
+        print(f"{label:<22} {statistics.median(timings) * 1000:>12.2f} {retained:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Measure the cold start cost of importing the package and creating a ``Client``.
+
+Run with ``python -m benchmarks.import_time``. Each measurement runs in a fresh
+interpreter, so nothing is already imported. The import time of ``pydantic_tfl_api``
+is taken from ``python -X importtime``, which also lists the slowest modules it
+imported, and the time to create the first ``Client`` and to deserialize a first
+response are timed in the same process.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+COLD_START = """
+import time
+start = time.perf_counter()
+from pydantic_tfl_api import Client
+imported = time.perf_counter()
+client = Client()
+created = time.perf_counter()
+client._get_model("Line")
+first_model = time.perf_counter()
+import sys
+print(imported - start, created - imported, first_model - created,
+      sum(name.startswith("pydantic_tfl_api.models.") for name in sys.modules))
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    # lines look like "import time:  self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def importtime() -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pydantic_tfl_api"],
+        capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def cold_start() -> list[float]:
+    result = subprocess.run([sys.executable, "-c", COLD_START], capture_output=True, text=True, check=True)
+    return [float(value) for value in result.stdout.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to list")
+    args = parser.parse_args()
+
+    runs = [cold_start() for _ in range(args.runs)]
+    imported, created, first_model, model_modules = (statistics.median(column) for column in zip(*runs))
+    print(f"import pydantic_tfl_api  {imported * 1000:8.2f} ms")
+    print(f"Client()                 {created * 1000:8.2f} ms")
+    print(f"first model lookup       {first_model * 1000:8.2f} ms")
+    print(f"model modules imported   {model_modules:8.0f}")
+
+    modules = importtime()
+    package = [(us, name) for name, us in modules.items() if name.startswith("pydantic_tfl_api")]
+    print("\nslowest pydantic_tfl_api modules (cumulative, from -X importtime):")
+    for us, name in sorted(package, reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.2f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
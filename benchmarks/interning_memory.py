@@ -0,0 +1,61 @@
+"""Measure how much memory interning saves on a large ``StopPointsResponse``.
+
+Run with ``python -m benchmarks.interning_memory``. It deserializes the recorded
+overground stop points ``--responses`` times, keeping every result as a cache would,
+without interning, with a new ``Interner`` for each response, and with one ``Interner``
+shared by all of them. For each it reports the time per response and, with
+``tracemalloc``, how much of the Python heap the results (and the shared ``Interner``'s
+pools) keep hold of.
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+
+from pydantic_tfl_api import Client, Interner
+
+from .fixtures import load_response
+
+FIXTURE = "stopPointByMode_overground_None_StopPointsResponse"
+
+
+def retained_mb(fn) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()  # noqa: F841, kept alive so it counts as retained
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--responses", type=int, default=3, help="results to deserialize and keep")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--validation", choices=["full", "raw"], default="full")
+    args = parser.parse_args()
+
+    response = load_response(FIXTURE)
+    print(f"{len(response.content) / (1024 * 1024):.1f} MB response, kept {args.responses} times, "
+          f"validation={args.validation}")
+    print(f"{'':<22} {'ms/response':>12} {'retained MB':>12}")
+    for label, intern in [("no interning", lambda: False), ("Interner per response", lambda: True),
+                          ("shared Interner", Interner)]:
+        def run():
+            client = Client(validation=args.validation, intern=intern())
+            return client, [client._deserialize("StopPointsResponse", response) for _ in range(args.responses)]
+
+        timings = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) / args.responses)
+        print(f"{label:<22} {statistics.median(timings) * 1000:>12.1f} {retained_mb(run):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare deserializing the recorded TfL responses via dicts and straight from bytes.
+
+Run with ``python -m benchmarks.json_fast_path``. The "dicts" column is the previous
+path (``response.json()`` followed by ``Model(**item)`` for each element), the "bytes"
+column is ``Client._deserialize``, which validates ``response.content`` directly.
+"""
+
+import argparse
+import statistics
+import time
+
+from pydantic_tfl_api import Client
+
+from .fixtures import fixture_names, load_response, model_name
+
+
+def deserialize_via_dicts(client: Client, name: str, response):
+    shared_expiry, result_expiry = client._get_result_expiry(response)
+    Model = client._get_model(name)
+    data = response.json()
+    if isinstance(data, dict):
+        return client._create_model_with_expiry(Model, data, result_expiry, shared_expiry)
+    return [client._create_model_with_expiry(Model, item, result_expiry, shared_expiry) for item in data]
+
+
+def time_calls(fn, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    client = Client()
+    print(f"{'fixture':<70} {'size':>9} {'dicts':>10} {'bytes':>10} {'speedup':>8}")
+    for fixture in fixture_names():
+        response = load_response(fixture)
+        if response.status_code != 200:
+            continue
+        name = model_name(fixture)
+        before = time_calls(lambda: deserialize_via_dicts(client, name, response), args.iterations)
+        after = time_calls(lambda: client._deserialize(name, response), args.iterations)
+        print(
+            f"{fixture[:70]:<70} {len(response.content):>9}"
+            f" {before * 1000:>8.3f}ms {after * 1000:>8.3f}ms {before / after:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare ways of working out what changed between polls of a large line status result.
+
+Run with ``python -m benchmarks.line_status_diff``. It builds a line status response for
+``--lines`` lines, each with a disruption affecting a run of the recorded Victoria line
+stop points, and deserializes it ``--polls`` times with ``--changed`` lines changing
+severity each time, as a watch would. It reports the time per poll spent deserializing
+and working out the changes, with and without a ``StopPointIdentityMap`` sharing the
+stop points between polls, for:
+
+- ``DeltaTracker``, comparing whole lines with ``==``
+- ``LineStatusDiff``, which compares the digests recorded during deserialization, and
+  works out the severity changes and new and cleared disruptions of the lines that changed
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+
+from pydantic_tfl_api import Client, LineStatusDiff, StopPointIdentityMap
+from pydantic_tfl_api.watch import DeltaTracker, digesting
+
+from .fixtures import create_response, load_fixture
+
+FIXTURE = "stopPointsByLineId_victoria_None_StopPoint"
+
+
+def line_json(i: int, severity: int, stops: list) -> dict:
+    disruption = {
+        "category": "RealTime", "type": "routeInfo", "categoryDescription": "RealTime",
+        "description": f"Route {i}: minor delays", "affectedRoutes": [], "affectedStops": stops,
+        "closureText": "minorDelays",
+    }
+    return {
+        "id": str(i), "name": str(i), "modeName": "bus", "disruptions": [],
+        "lineStatuses": [{
+            "id": 0, "statusSeverity": severity, "statusSeverityDescription": "Minor Delays",
+            "created": "0001-01-01T00:00:00", "validityPeriods": [], "disruptions": [disruption],
+        }],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=700)
+    parser.add_argument("--changed", type=int, default=5, help="lines whose severity changes in each poll")
+    parser.add_argument("--polls", type=int, default=10)
+    args = parser.parse_args()
+
+    fixture = load_fixture(FIXTURE)
+    stops = json.loads(fixture["content"])
+    # a fresh Date, so the responses' max-age hasn't passed and stop points can be shared across them
+    date = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    fixture["headers"] = {**fixture["headers"], "Date": date}
+    responses = []
+    for poll in range(args.polls):
+        changed = {(poll * args.changed + j) % args.lines for j in range(args.changed)}
+        content = [
+            line_json(i, 6 if i in changed else 9, stops[i % len(stops):][:4]) for i in range(args.lines)
+        ]
+        responses.append(create_response(fixture, json.dumps(content).encode("utf-8")))
+
+    print(f"{args.polls} polls of {args.lines} lines, {args.changed} changing each time")
+    print(f"{'':<22} {'identity map':<14} {'deserialize ms':>15} {'diff ms':>10}")
+    trackers = [
+        ("==", DeltaTracker),
+        ("LineStatusDiff", LineStatusDiff),
+    ]
+    for label, create_tracker in trackers:
+        for identity_map in [None, StopPointIdentityMap]:
+            client = Client(identity_map=identity_map() if identity_map else None)
+            tracker = create_tracker()
+            deserialize_timings, diff_timings = [], []
+            previous = None
+            for response in responses:
+                start = time.perf_counter()
+                with digesting(tracker.digests):
+                    lines = client._deserialize("Line", response)
+                deserialized = time.perf_counter()
+                tracker.update(lines)
+                deserialize_timings.append(deserialized - start)
+                diff_timings.append(time.perf_counter() - deserialized)
+                # the previous lines are freed outside the timings, as that costs the same either way
+                previous = lines
+            del previous
+            # the first poll has nothing to compare with
+            print(
+                f"{label:<22} {'yes' if identity_map else 'no':<14} "
+                f"{statistics.median(deserialize_timings[1:]) * 1000:>15.2f} "
+                f"{statistics.median(diff_timings[1:]) * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
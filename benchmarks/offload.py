@@ -0,0 +1,85 @@
+"""Compare deserializing large responses in-process and with a ``deserialize_executor``.
+
+Run with ``python -m benchmarks.offload``. For the recorded overground ``StopPointsResponse``
+and a large arrivals response built as ``PredictionColumns``, it deserializes each
+response ``--iterations`` times in-process and with a ``ProcessPoolExecutor``, while a
+second thread ticks every millisecond. It reports the time per response, the CPU time
+the calling thread spent on it, and the longest the ticking thread was kept waiting,
+which is how long other threads of an application stall while a response is deserialized.
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pydantic_tfl_api import Client
+
+from .fixtures import create_response, load_fixture, load_response
+
+TICK = 0.001
+
+
+class Ticker(threading.Thread):
+    """Sleeps for a millisecond at a time and records the longest it overslept."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.max_stall = 0.0
+        self.running = True
+
+    def run(self):
+        while self.running:
+            start = time.perf_counter()
+            time.sleep(TICK)
+            self.max_stall = max(self.max_stall, time.perf_counter() - start - TICK)
+
+
+def arrivals_response():
+    fixture = load_fixture("arrivalsByLineId_victoria_None_Prediction")
+    predictions = json.loads(fixture["content"])
+    content = [{**prediction, "id": f"{prediction['id']}{i:03d}"} for i in range(20) for prediction in predictions]
+    return create_response(fixture, json.dumps(content).encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    responses = [
+        ("StopPointsResponse", load_response("stopPointByMode_overground_None_StopPointsResponse")),
+        ("PredictionColumns", arrivals_response()),
+    ]
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        # StopPointsResponse isn't offloaded by default, as it doesn't pay off
+        offloaded = Client(deserialize_executor=executor, offload_models={"StopPointsResponse", "PredictionColumns"})
+        clients = [("in-process", Client()), ("process pool", offloaded)]
+        print(f"{'':<20} {'':<14} {'MB':>6} {'ms':>8} {'caller CPU ms':>14} {'max stall ms':>13}")
+        for model_name, response in responses:
+            for label, client in clients:
+                # warm up the worker process and the model caches
+                client._deserialize(model_name, response)
+                timings, cpu_times, stalls = [], [], []
+                for _ in range(args.iterations):
+                    ticker = Ticker()
+                    ticker.start()
+                    time.sleep(5 * TICK)
+                    start, start_cpu = time.perf_counter(), time.thread_time()
+                    client._deserialize(model_name, response)
+                    timings.append(time.perf_counter() - start)
+                    cpu_times.append(time.thread_time() - start_cpu)
+                    ticker.running = False
+                    ticker.join()
+                    stalls.append(ticker.max_stall)
+                print(
+                    f"{model_name:<20} {label:<14} {len(response.content) / 1e6:>6.1f}"
+                    f" {statistics.median(timings) * 1000:>8.1f} {statistics.median(cpu_times) * 1000:>14.1f}"
+                    f" {statistics.median(stalls) * 1000:>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
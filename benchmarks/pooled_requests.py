@@ -0,0 +1,87 @@
+"""Compare pooled (keep-alive) and unpooled request latency against a local stub server.
+
+Run with ``python -m benchmarks.pooled_requests``. The stub speaks plain HTTP/1.1 on
+localhost, so the numbers only show the cost of TCP connection setup; against
+api.tfl.gov.uk every unpooled request also pays for a TLS handshake.
+"""
+
+import argparse
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from pydantic_tfl_api import RestClient
+
+STUB_BODY = b'[{"isTflService": true, "isFarePaying": true, "isScheduledService": true, "modeName": "tube"}]'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # headers and body go out in separate writes; don't let Nagle hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_BODY)))
+        self.end_headers()
+        self.wfile.write(STUB_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def time_calls(send, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        send().content
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, timings: list[float]):
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<10} mean {statistics.mean(timings) * 1000:7.3f} ms"
+        f"  median {statistics.median(timings) * 1000:7.3f} ms"
+        f"  p95 {p95 * 1000:7.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        # unpooled: the pre-session behaviour, a new connection for every call
+        unpooled = time_calls(lambda: requests.get(base_url + "Line/Meta/Modes?"), args.iterations)
+        with RestClient(base_url=base_url) as client:
+            pooled = time_calls(lambda: client.send_request("Line/Meta/Modes"), args.iterations)
+    finally:
+        server.shutdown()
+
+    report("unpooled", unpooled)
+    report("pooled", pooled)
+    print(f"speedup    {statistics.mean(unpooled) / statistics.mean(pooled):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
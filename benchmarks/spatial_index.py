@@ -0,0 +1,94 @@
+"""Compare nearest-stop queries on a ``StopPointIndex`` with a linear scan.
+
+Run with ``python -m benchmarks.spatial_index``. The recorded overground stop points are
+copied ``--scale`` times, each copy shifted by up to a kilometre, to approximate the number
+of bus stops in London. It times building the index, finding the 5 nearest stops and the
+stops within 500 m of random points, and rebuilding one copy with ``update``.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from math import asin, cos, radians, sin, sqrt
+from types import SimpleNamespace
+
+from pydantic_tfl_api.models import StopPointsResponse
+from pydantic_tfl_api.spatial import EARTH_RADIUS_M, StopPointIndex
+
+from .fixtures import load_fixture
+
+FIXTURE = "stopPointByMode_overground_None_StopPointsResponse"
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * asin(sqrt(a))
+
+
+def time_call(fn, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=50, help="copies of the recorded stop points")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    response = StopPointsResponse.model_validate_json(load_fixture(FIXTURE)["content"])
+    located = [sp for sp in response.stop_points if sp.lat is not None and sp.lon is not None]
+    groups = {}
+    for copy in range(args.scale):
+        dlat, dlon = rng.uniform(-0.01, 0.01), rng.uniform(-0.015, 0.015)
+        groups[copy] = [
+            SimpleNamespace(id=f"{sp.id}-{copy}", lat=sp.lat + dlat, lon=sp.lon + dlon) for sp in located
+        ]
+    stops = [stop for group in groups.values() for stop in group]
+    points = [(rng.choice(stops).lat + rng.uniform(-0.01, 0.01), rng.choice(stops).lon) for _ in range(args.queries)]
+
+    def build():
+        index = StopPointIndex()
+        for copy, group in groups.items():
+            index.update(group, group=copy)
+        return index
+
+    index = build()
+
+    def scan_nearest():
+        for lat, lon in points:
+            sorted(stops, key=lambda s: haversine(lat, lon, s.lat, s.lon))[:5]
+
+    def scan_within():
+        for lat, lon in points:
+            [s for s in stops if haversine(lat, lon, s.lat, s.lon) <= 500]
+
+    def index_nearest():
+        for lat, lon in points:
+            index.nearest(lat, lon, k=5)
+
+    def index_within():
+        for lat, lon in points:
+            index.within(lat, lon, 500)
+
+    print(f"{len(stops)} stops, {len(points)} queries")
+    print(f"build index: {time_call(build, args.iterations) * 1000:.1f} ms")
+    update_time = time_call(lambda: index.update(groups[0], group=0), args.iterations)
+    print(f"update one group of {len(located)}: {update_time * 1000:.2f} ms")
+    print(f"{'':<12} {'scan ms/query':>14} {'index ms/query':>15} {'speedup':>8}")
+    for label, scan, query in [("nearest 5", scan_nearest, index_nearest), ("within 500m", scan_within, index_within)]:
+        scan_time = time_call(scan, 1) / len(points)
+        index_time = time_call(query, args.iterations) / len(points)
+        print(f"{label:<12} {scan_time * 1000:>14.3f} {index_time * 1000:>15.3f} {scan_time / index_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Compare peak memory of full and streaming deserialization of ``StopPoint/Mode/{mode}``.
+
+Run with ``python -m benchmarks.streaming_memory``. The recorded overground response is
+repeated ``--scale`` times to approximate larger modes such as bus, and each approach
+runs in a fresh process so their peak resident set sizes can be compared. The peak size
+of the Python heap (from ``tracemalloc``, in a separate run) is reported too, as it isn't
+skewed by memory the allocator keeps hold of.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from pydantic_tfl_api import Client
+
+from .fixtures import load_fixture
+
+FIXTURE = "stopPointByMode_overground_None_StopPointsResponse"
+
+
+class FileRestClient:
+    """Stands in for RestClient, answering every request from a body on disk."""
+
+    def __init__(self, path: str, headers: dict):
+        self.path = path
+        self.headers = headers
+
+    def send_request(self, location, params=None, headers=None, stream=False):
+        response = Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.raw = open(self.path, "rb")
+        return response
+
+
+def _read_proc_status(field: str) -> float | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss():
+    # Linux only: resets the VmHWM high-water mark to the current RSS
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def current_rss_mb() -> float:
+    rss = _read_proc_status("VmRSS")
+    return rss if rss is not None else peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = _read_proc_status("VmHWM")
+    if peak is not None:
+        return peak
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def measure(mode: str, path: str, trace: bool) -> dict:
+    with open(path + ".headers") as f:
+        headers = json.load(f)
+    client = Client(rest_client=FileRestClient(path, headers))
+    # build the validators before measuring
+    client._get_model("StopPointsResponse").model_validate({"pageSize": 0, "total": 0, "page": 1})
+    reset_peak_rss()
+    baseline = current_rss_mb()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "full":
+        response = client.client.send_request("StopPoint/Mode/overground")
+        result = client._deserialize("StopPointsResponse", response)
+        count = len(result.stop_points)
+    else:
+        count = sum(1 for _ in client.iter_stop_points_by_mode("overground"))
+    elapsed = time.perf_counter() - start
+    if trace:
+        return {"peak_heap_mb": tracemalloc.get_traced_memory()[1] / (1024 * 1024)}
+    return {"mode": mode, "count": count, "seconds": elapsed, "peak_rss_mb": max(peak_rss_mb() - baseline, 0.0)}
+
+
+def run_measure(mode: str, path: str, trace: bool) -> dict:
+    command = [sys.executable, "-m", "benchmarks.streaming_memory", "--measure", mode, "--path", path]
+    if trace:
+        command.append("--trace")
+    return json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+
+
+def write_scaled_body(scale: int) -> str:
+    fixture = load_fixture(FIXTURE)
+    body = json.loads(fixture["content"])
+    body["stopPoints"] = body["stopPoints"] * scale
+    body["pageSize"] = body["total"] = len(body["stopPoints"])
+    with tempfile.NamedTemporaryFile("wb", suffix=".json", delete=False) as f:
+        f.write(json.dumps(body).encode("utf-8"))
+    with open(f.name + ".headers", "w") as headers:
+        json.dump(fixture["headers"], headers)
+    return f.name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=5, help="times to repeat the recorded stop points")
+    parser.add_argument("--measure", choices=["full", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.path, args.trace)))
+        return
+
+    path = write_scaled_body(args.scale)
+    results = []
+    try:
+        for mode in ["full", "stream"]:
+            # tracemalloc inflates the RSS, so the heap is measured in a separate run
+            results.append({**run_measure(mode, path, trace=False), **run_measure(mode, path, trace=True)})
+    finally:
+        os.remove(path)
+        os.remove(path + ".headers")
+
+    for result in results:
+        print(
+            f"{result['mode']:<7} {result['count']:>6} stop points  {result['seconds']:6.2f} s"
+            f"  peak RSS +{result['peak_rss_mb']:7.1f} MB  peak Python heap {result['peak_heap_mb']:7.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
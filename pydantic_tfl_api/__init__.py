@@ -21,10 +21,58 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from importlib import import_module
+
 from .client import Client
 from .rest_client import RestClient
+from .cache import ResponseCache
+from .columnar import PredictionColumns
+from .envelope import ResponseEnvelope
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+from .identity_map import StopPointIdentityMap
+from .interning import Interner
+from .instrumentation import RequestMetrics
+from .spatial import StopPointIndex
+from .watch import Delta
+from .diff import LineStatusDiff
+
+# imported on first use, so synchronous users don't pay for httpx, asyncio or sqlite3
+_LAZY_IMPORTS = {
+    "AsyncClient": "async_client",
+    "AsyncRestClient": "async_rest_client",
+    "SQLiteResponseCache": "sqlite_cache",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
+    'AsyncClient',
+    'AsyncRestClient',
     'Client',
-    'RestClient'
-]
\ No newline at end of file
+    'Delta',
+    'Interner',
+    'LineStatusDiff',
+    'PredictionColumns',
+    'RateLimiter',
+    'RequestMetrics',
+    'ResponseCache',
+    'ResponseEnvelope',
+    'RestClient',
+    'RetryPolicy',
+    'SQLiteResponseCache',
+    'StopPointIdentityMap',
+    'StopPointIndex'
+]
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from . import models
+from .cache import CacheEntry
+from .async_rest_client import AsyncRestClient, httpx
+from .client import Client
+from .instrumentation import current_metrics, measure, timed
+from .config import max_ids_per_request, stream_chunk_size
+from .single_flight import AsyncSingleFlight
+from .streaming import JsonArrayStream
+from .watch import Delta, DeltaTracker, digesting
+
+
+class AsyncClient(Client):
+    """AsyncClient
+
+    Asynchronous version of :class:`Client`. It exposes every endpoint method of ``Client``
+    (``get_line_status``, ``get_arrivals_by_line_id``, ...) with the same arguments, but
+    each one returns an awaitable, so many requests can be in flight on one event loop::
+
+        async with AsyncClient() as client:
+            victoria, northern = await asyncio.gather(
+                client.get_line_status("victoria"), client.get_line_status("northern")
+            )
+
+    Responses are deserialized with the same logic as ``Client``.
+
+    :param str api_token: API token to access TfL unified API
+    :param AsyncRestClient rest_client: Transport to send requests with, e.g. to configure
+        the connection pool. Defaults to an ``AsyncRestClient`` created from ``api_token``
+
+    Other keyword arguments are the same as for ``Client``.
+    """
+
+    _RETRYABLE_ERRORS = Client._RETRYABLE_ERRORS + ((httpx.TransportError,) if httpx is not None else ())
+
+    def __init__(self, api_token: str = None, rest_client: AsyncRestClient = None, **kwargs):
+        super().__init__(
+            api_token, rest_client=rest_client if rest_client is not None else AsyncRestClient(api_token), **kwargs
+        )
+
+    async def _send_request_and_deserialize(
+        self, endpoint_and_model: dict[str, str],
+        params: str | int | List[str | int] = None, endpoint_args: dict = None
+    ) -> BaseModel | List[BaseModel] | models.ApiError:
+        endpoint, model_name = self._format_endpoint(endpoint_and_model, params)
+        if self.on_request is None:
+            return await self._get_result(endpoint, model_name, endpoint_args)
+        metrics = self._create_metrics(endpoint_and_model, endpoint, model_name, endpoint_args)
+        try:
+            with measure(metrics):
+                return await self._get_result(endpoint, model_name, endpoint_args)
+        except Exception as e:
+            metrics.error = e
+            raise
+        finally:
+            self.on_request(metrics)
+
+    async def _get_result(
+        self, endpoint: str, model_name: str, endpoint_args: dict
+    ) -> BaseModel | List[BaseModel] | models.ApiError:
+        cache_key = self._get_cache_key(endpoint, endpoint_args, model_name)
+        cached = self._get_cache_entry(cache_key)
+        metrics = current_metrics()
+        if cached is not None and cached.is_fresh():
+            self._record_cache_outcome(metrics, "hit")
+            await self._offload_cached_value(cached, model_name)
+            return self._get_cached_result(cached, model_name)
+        self._record_cache_outcome(metrics, "miss")
+        if self.single_flight is None:
+            return await self._fetch(endpoint, model_name, endpoint_args, cache_key, cached)
+        try:
+            return await self.single_flight.do(
+                cache_key, lambda: self._fetch(endpoint, model_name, endpoint_args, cache_key, cached))
+        finally:
+            self._record_coalesced(metrics)
+
+    async def _fetch(
+        self, endpoint: str, model_name: str, endpoint_args: dict, cache_key: str, cached: Optional[CacheEntry]
+    ) -> BaseModel | List[BaseModel] | models.ApiError:
+        attempts = self.retry.start("GET") if self.retry is not None else None
+        metrics = current_metrics()
+        while True:
+            if metrics is not None:
+                metrics.attempts += 1
+            try:
+                response = await self.client.send_request(
+                    endpoint, endpoint_args, headers=self._get_validator_headers(cached))
+            except self._RETRYABLE_ERRORS as e:
+                delay = attempts.next_delay(error=e) if attempts is not None else None
+                if delay is None:
+                    raise
+            else:
+                self._record_response(metrics, response)
+                delay = attempts.next_delay(response) if attempts is not None else None
+                if delay is None:
+                    transfer = None
+                    if response.status_code == 200 and self._should_offload(model_name, response.content):
+                        # wait for the worker without blocking the event loop
+                        with timed("validate"):
+                            transfer = await asyncio.wrap_future(self._offload(model_name, response.content))
+                    elif response.status_code == 304 and cached is not None:
+                        await self._offload_cached_value(cached, model_name)
+                    return self._handle_response(model_name, response, cache_key, cached, transfer)
+            with timed("backoff"):
+                await asyncio.sleep(delay)
+
+    async def _offload_cached_value(self, entry: CacheEntry, model_name: str):
+        # deserializes a raw cached body in the worker, if it would be offloaded, before
+        # _load_cached_value would otherwise block the event loop waiting for it
+        if entry.value is not None or entry.content is None or not self._should_offload(model_name, entry.content):
+            return
+        with timed("validate"):
+            transfer = await asyncio.wrap_future(self._offload(model_name, entry.content))
+        entry.value = self._deserialize(model_name, self._response_from_cache_entry(entry), transfer)
+
+    @staticmethod
+    def _create_single_flight() -> AsyncSingleFlight:
+        return AsyncSingleFlight()
+
+    async def _iter_request_and_deserialize(
+        self, endpoint_and_model: dict[str, str], model_name: str,
+        params: str | int | List[str | int] = None, endpoint_args: dict = None, array_key: str = None,
+    ) -> AsyncIterator[BaseModel | models.ApiError]:
+        endpoint, _ = self._format_endpoint(endpoint_and_model, params)
+        async with self.client.stream_request(endpoint, endpoint_args) as response:
+            if response.status_code != 200:
+                await response.aread()
+                yield self._deserialize_error(self.client._to_requests_response(response))
+                return
+            stream = JsonArrayStream(array_key)
+            Model = self._get_model(model_name)
+            shared_expiry, result_expiry = self._get_result_expiry(response)
+            interner = self._create_interner()
+            # streamed results are always validated
+            resolver = self._create_resolver(result_expiry, "full")
+            async for chunk in response.aiter_bytes(stream_chunk_size):
+                for item in stream.feed(chunk):
+                    yield self._create_streamed_model(Model, item, interner, resolver, result_expiry, shared_expiry)
+            for item in stream.close():
+                yield self._create_streamed_model(Model, item, interner, resolver, result_expiry, shared_expiry)
+
+    async def watch(
+        self, method: str | Callable[..., Any], *args: Any, key: Callable[[Any], Any] = None,
+        min_interval: float = 1.0, default_interval: float = 30.0, error_interval: float = 30.0,
+        emit_empty: bool = False, tracker: DeltaTracker = None, **kwargs: Any,
+    ) -> AsyncIterator[Delta]:
+        """Poll an endpoint for as long as the iterator is iterated, and yield what has changed.
+
+        The asynchronous version of :meth:`Client.watch`::
+
+            async for delta in client.watch("get_line_status_by_mode", "tube"):
+                print(delta.changed)
+        """
+        fetch = getattr(self, method) if isinstance(method, str) else method
+        tracker = tracker if tracker is not None else DeltaTracker(key)
+        while True:
+            with digesting(tracker.digests):
+                result = await fetch(*args, **kwargs)
+            delta, delay = self._track(result, tracker, min_interval, default_interval, error_interval)
+            if delta or emit_empty:
+                yield delta
+            await asyncio.sleep(delay)
+
+    async def paginate_stop_points_by_mode(
+        self, mode: str, prefetch: int = 2
+    ) -> AsyncIterator[models.StopPoint | models.ApiError]:
+        """
+        Iterate over the stop points for a mode, page by page, in order.
+
+        The asynchronous version of :meth:`Client.paginate_stop_points_by_mode`, which
+        fetches up to ``prefetch`` pages ahead as tasks on the event loop.
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+        stop_points, pages = self._read_stop_point_page(await self.get_stop_points_by_mode(mode, page=1))
+        for stop_point in stop_points:
+            yield stop_point
+        if pages <= 1:
+            return
+        in_flight = deque(
+            asyncio.ensure_future(self.get_stop_points_by_mode(mode, page))
+            for page in range(2, min(pages, prefetch + 1) + 1)
+        )
+        next_page = len(in_flight) + 2
+        try:
+            while in_flight:
+                result = await in_flight.popleft()
+                if next_page <= pages:
+                    in_flight.append(asyncio.ensure_future(self.get_stop_points_by_mode(mode, next_page)))
+                    next_page += 1
+                stop_points, page_count = self._read_stop_point_page(result)
+                for stop_point in stop_points:
+                    yield stop_point
+                if not page_count:
+                    return
+        finally:
+            # when the caller stops early, or a page fails, don't send the queued requests
+            for task in in_flight:
+                task.cancel()
+
+    async def gather(
+        self, calls: Iterable[str | Callable[..., Any] | Tuple[Any, ...]], max_workers: int = 8,
+        timeout: float = None,
+    ) -> List[Any]:
+        """Make many endpoint calls at once, and return their results in the order of ``calls``.
+
+        The asynchronous version of :meth:`Client.gather`, which runs the calls as tasks on
+        the event loop, up to ``max_workers`` at a time. Calls that haven't finished at the
+        ``timeout`` are cancelled.
+        """
+        resolved = [self._resolve_call(call) for call in calls]
+        if not resolved:
+            return []
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def run(method: Callable[..., Any], args: tuple):
+            async with semaphore:
+                return await method(*args)
+
+        tasks = [asyncio.ensure_future(run(method, args)) for method, args in resolved]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        results = []
+        for task, (method, args) in zip(tasks, resolved):
+            if task not in done:
+                results.append(self._call_error(method, args, TimeoutError(f"Not finished within {timeout}s")))
+            elif task.cancelled():
+                # e.g. cancelled by something the call was waiting on
+                results.append(self._call_error(method, args, asyncio.CancelledError("Cancelled")))
+            elif task.exception() is not None:
+                results.append(self._call_error(method, args, task.exception()))
+            else:
+                results.append(task.result())
+        return results
+
+    async def _get_many(
+        self, endpoint_and_model: dict[str, str], ids: Iterable[str], key: Callable[[BaseModel], str],
+        endpoint_args: dict = None, group: bool = False,
+        chunk_size: int = max_ids_per_request, max_workers: int = 8,
+    ) -> dict[str, Any]:
+        chunks = self._chunk_ids(ids, chunk_size)
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def fetch(chunk: List[str]):
+            async with semaphore:
+                return await self._send_request_and_deserialize(endpoint_and_model, ",".join(chunk), endpoint_args)
+
+        results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+        return self._merge_many(chunks, results, key, group)
+
+    async def close(self):
+        """Close the underlying transport and release its pooled connections."""
+        await self.client.close()
+
+    def __enter__(self):
+        raise TypeError("AsyncClient must be used with 'async with'")
+
+    def __exit__(self, exc_type, exc_value, traceback):  # pragma: no cover
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,166 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+from .config import base_url
+from .instrumentation import RequestMetrics, current_metrics, timed
+from .rate_limit import RateLimiter
+from .rest_client import RestClient
+
+
+class AsyncRestClient():
+    """AsyncRestClient.
+
+    Asynchronous counterpart of :class:`RestClient`. Requests are sent through a pooled
+    ``httpx.AsyncClient``, so a single event loop can keep many requests in flight over
+    a bounded set of reused connections. Responses are returned as ``requests.Response``
+    objects so they can be deserialized exactly like those from ``RestClient``.
+
+    Requires the optional ``httpx`` dependency (``pip install pydantic-tfl-api[async]``).
+
+    :param str app_key: App key to access TfL unified API
+    :param int max_connections: Maximum number of concurrent connections
+    :param int max_keepalive_connections: Maximum number of idle connections kept open for reuse
+    :param float keepalive_expiry: Seconds an idle connection is kept open for
+    :param float timeout: Timeout in seconds for each request, or ``None`` to wait forever
+    :param str base_url: Root URL of the API, e.g. to point the client at a local stub
+    :param RateLimiter rate_limiter: Limits how fast requests are sent, e.g. to stay within
+        the app key's quota. Can be shared with other clients using the same app key
+    """
+
+    def __init__(
+        self,
+        app_key: str = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        timeout: float | None = None,
+        base_url: str = base_url,
+        rate_limiter: RateLimiter = None,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncRestClient requires httpx. Install it with `pip install pydantic-tfl-api[async]`."
+            )
+        self.app_key = {"app_key": app_key} if app_key else None
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.session = self._create_session()
+
+    def _create_session(self) -> "httpx.AsyncClient":
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        return httpx.AsyncClient(limits=limits, timeout=self.timeout)
+
+    async def send_request(self, location, params=None, headers=None) -> Response:
+        request_headers = self._get_request_headers()
+        if headers:
+            request_headers.update(headers)
+        if self.rate_limiter is not None:
+            with timed("queue"):
+                await self.rate_limiter.acquire_async()
+        metrics = current_metrics()
+        if metrics is None:
+            response = await self.session.get(
+                self.base_url + location + "?" + self._get_query_strings(params),
+                headers=request_headers,
+            )
+            return self._to_requests_response(response)
+        trace = _Trace(metrics)
+        response = await self.session.get(
+            self.base_url + location + "?" + self._get_query_strings(params),
+            headers=request_headers,
+            extensions={"trace": trace},
+        )
+        trace.finish()
+        return self._to_requests_response(response)
+
+    @staticmethod
+    def _to_requests_response(response: "httpx.Response") -> Response:
+        result = Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers)
+        result._content = response.content
+        result.url = str(response.url)
+        result.reason = response.reason_phrase
+        result.encoding = response.encoding
+        return result
+
+    @asynccontextmanager
+    async def stream_request(self, location, params=None, headers=None) -> AsyncIterator["httpx.Response"]:
+        """Send a request and yield the response before its body has been read.
+
+        Iterate over the body with ``response.aiter_bytes()``.
+        """
+        request_headers = self._get_request_headers()
+        if headers:
+            request_headers.update(headers)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        async with self.session.stream(
+            "GET",
+            self.base_url + location + "?" + self._get_query_strings(params),
+            headers=request_headers,
+        ) as response:
+            yield response
+
+    async def close(self):
+        """Close the session and any pooled connections."""
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    _get_request_headers = RestClient._get_request_headers
+    _get_query_strings = RestClient._get_query_strings
+
+
+class _Trace:
+    """Adds the connection, time to first byte and download times from httpcore's trace events to ``metrics``."""
+
+    # the events opening a connection, over HTTP/1.1 and HTTP/2
+    _CONNECT_EVENTS = ("connection.connect_tcp", "connection.start_tls")
+    _SEND_EVENTS = ("http11.send_request_headers", "http2.send_request_headers")
+    _HEADERS_EVENTS = ("http11.receive_response_headers", "http2.receive_response_headers")
+
+    def __init__(self, metrics: RequestMetrics):
+        self.metrics = metrics
+        # a reused connection takes no time to open
+        metrics.connect = metrics.connect or 0.0
+        self.started: dict[str, float] = {}
+        self.headers_received: Optional[float] = None
+
+    async def __call__(self, event_name: str, info: dict[str, Any]):
+        now = time.perf_counter()
+        name, _, stage = event_name.rpartition(".")
+        if stage == "started":
+            self.started[name] = now
+        elif stage == "complete":
+            if name in self._CONNECT_EVENTS:
+                self.metrics.add("connect", now - self.started[name])
+            elif name in self._HEADERS_EVENTS:
+                self.headers_received = now
+                sent = next((self.started[event] for event in self._SEND_EVENTS if event in self.started), None)
+                if sent is not None:
+                    self.metrics.add("ttfb", now - sent)
+
+    def finish(self):
+        # httpx reads the body once the headers are in
+        if self.headers_received is not None:
+            self.metrics.add("download", time.perf_counter() - self.headers_received)
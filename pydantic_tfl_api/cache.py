@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    revalidations: int = 0
+
+
+@dataclass
+class CacheEntry:
+    """A cached result, the time it expires at and the validators used to revalidate it.
+
+    :param value: The deserialized result
+    :param datetime expires: When the result stops being fresh, e.g. from the ``max-age`` directive
+    :param str etag: The response's ``ETag`` header, sent back as ``If-None-Match``
+    :param str last_modified: The response's ``Last-Modified`` header, sent back as ``If-Modified-Since``
+    :param bytes content: The raw response body, for caches that store responses rather than results
+    :param dict headers: The raw response headers, for caches that store responses rather than results
+    """
+    value: Any
+    expires: Optional[datetime]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content: Optional[bytes] = None
+    headers: Optional[dict[str, str]] = None
+
+    def is_fresh(self, now: Optional[datetime] = None) -> bool:
+        if self.expires is None:
+            return False
+        return (now or datetime.now(timezone.utc)) < self.expires
+
+    def get_validator_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """In-memory cache of deserialized responses.
+
+    Entries are kept until they are evicted, least recently used first, once the cache
+    holds more than ``maxsize`` of them. The cache is safe to share between threads.
+
+    Cached results are returned as the same objects each time, so callers should treat
+    them as read-only.
+
+    :param int maxsize: Maximum number of entries to keep
+    """
+
+    # ResponseCache keeps deserialized results, so it doesn't need the raw response
+    stores_raw_response = False
+
+    def __init__(self, maxsize: int = 256):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the entry for ``key``, fresh or not, and count a hit if it is fresh."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            if entry is not None and entry.is_fresh():
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+            return entry
+
+    def set(self, key: Hashable, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def revalidate(self, key: Hashable, expires: Optional[datetime]):
+        """Extend the expiry of the entry for ``key`` after the server confirmed it is unchanged."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.expires = expires
+            self._stats.revalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._stats.hits, self._stats.misses, self._stats.evictions, self._stats.revalidations
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
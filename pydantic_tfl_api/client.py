@@ -22,38 +22,161 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .config import endpoints
+from __future__ import annotations
+
+from .cache import CacheEntry, ResponseCache
+from .columnar import PredictionColumns
+from .envelope import ResponseEnvelope
+from .identity_map import Resolver, StopPointIdentityMap
+from .instrumentation import RequestMetrics, current_metrics, measure, timed
+from .interning import Interner
+from .offload import Transfer, deserialize_in_worker, unpack
+from .config import endpoints, max_ids_per_request, stream_chunk_size
 from .rest_client import RestClient
-from importlib import import_module
-from typing import Any, Literal, List, Optional, Tuple
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+from .streaming import JsonArrayStream
+from .watch import Delta, DeltaTracker, digesting, is_digesting, next_delay, record_digests, unwrap
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Callable, Collection, Iterable, Iterator, Literal, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode
 from requests import Response
-import pkgutil
-from pydantic import BaseModel
+from requests.structures import CaseInsensitiveDict
+from pydantic import BaseModel, TypeAdapter
 from . import models
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import json
+import re
+import requests
+import time
+
+_JSON_ARRAY_START = re.compile(rb"\s*\[")
+
+ValidationLevel = Literal["full", "raw"]
+
+# results that aren't pydantic models, built straight from the parsed JSON
+_RESULT_BUILDERS: dict[str, Callable[[Any], Any]] = {
+    "PredictionColumns": PredictionColumns.from_json,
+}
+
+# the arrivals endpoint, with the predictions built into PredictionColumns rather than
+# models. It isn't a TfL endpoint of its own, so it isn't in config.endpoints
+_ARRIVAL_COLUMNS_BY_LINE_ID = {"uri": "Line/{0}/Arrivals", "model": "PredictionColumns"}
+
+
+@lru_cache(maxsize=None)
+def _get_list_adapter(Model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[Model])
+
+
+def _submit_in_context(executor: Executor, fn: Callable[..., Any], *args: Any) -> Future:
+    # the worker runs in a copy of the caller's context, e.g. to keep its rate limiter lane
+    return executor.submit(copy_context().run, fn, *args)
 
 
 class Client:
     """Client
 
     :param str api_token: API token to access TfL unified API
+    :param RestClient rest_client: Transport to send requests with, e.g. to configure the
+        connection pool. Defaults to a ``RestClient`` created from ``api_token``
+    :param ResponseCache cache: Cache for responses, e.g. a ``ResponseCache`` or a
+        ``SQLiteResponseCache``. Results are served from the cache until the expiry given by
+        the response's ``max-age`` directive
+    :param bool coalesce_requests: Send a single request for concurrent calls to the same
+        endpoint with the same arguments, and give every caller its result. The callers
+        share the same result objects, as they would a cached result, so copy a result
+        before changing it
+    :param bool envelope: Return each result wrapped in a ``ResponseEnvelope``, which holds
+        the expiry and other response metadata once, instead of setting ``content_expires``
+        and ``shared_expires`` on every model. Errors are still returned as ``ApiError``
+    :param str validation: How responses are turned into results. ``"full"`` validates
+        them with pydantic. ``"raw"`` returns the parsed JSON as dicts and lists, which is
+        the fastest, e.g. for polling loops. Errors are always validated. Streamed results
+        are always validated too
+    :param intern: Deduplicate repeated strings and identical nested models, such as the
+        ``Line`` references on every ``StopPoint``, within each result. Results use much
+        less memory but take longer to deserialize. Pass an ``Interner`` to also share
+        values across responses
+    :param StopPointIdentityMap identity_map: Share one ``StopPoint`` instance for each
+        ``naptan_id`` in and across results, rather than validating the same stop point
+        again wherever it appears. Not used with ``"raw"`` validation
+    :param RetryPolicy retry: Retry requests that fail with a transient error, such as a
+        429 or 503, or without a response, backing off between attempts. Streamed requests
+        aren't retried
+    :param Executor deserialize_executor: Executor to deserialize large responses in,
+        usually a ``ProcessPoolExecutor``, so parsing and validating them doesn't hold this
+        process's GIL
+    :param int offload_threshold: Size in bytes from which responses are deserialized with
+        the ``deserialize_executor``; smaller ones are quicker to deserialize here
+    :param offload_models: Names of the results to deserialize with the
+        ``deserialize_executor``. By default only ``PredictionColumns``, which cost almost
+        nothing to send back. Models such as ``StopPointsResponse`` take most of the time
+        validating them would to unpickle, so offloading them saves little of this
+        process's CPU and adds the round trip to every call. Models are not offloaded with
+        an ``identity_map`` or ``"raw"`` validation
+    :param on_request: Called with a ``RequestMetrics`` after each call to an endpoint
+        method, giving its URL, status, size, cache outcome and where the time went, e.g.
+        to send them to a metrics system. It is called from the thread or coroutine that
+        made the call, and an exception it raises is raised from the call
     """
 
-    def __init__(self, api_token: str = None):
-        self.client = RestClient(api_token)
+    # failures to get a response that are worth retrying
+    _RETRYABLE_ERRORS: Tuple[type[Exception], ...] = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(
+        self,
+        api_token: str = None,
+        rest_client: RestClient = None,
+        cache: ResponseCache = None,
+        coalesce_requests: bool = True,
+        envelope: bool = False,
+        validation: ValidationLevel = "full",
+        intern: bool | Interner = False,
+        identity_map: StopPointIdentityMap = None,
+        retry: RetryPolicy = None,
+        deserialize_executor: Executor = None,
+        offload_threshold: int = 1024 * 1024,
+        offload_models: Collection[str] = None,
+        on_request: Callable[[RequestMetrics], None] = None,
+    ):
+        if validation not in ("full", "raw"):
+            raise ValueError(f"validation must be 'full' or 'raw', not {validation!r}")
+        self.client = rest_client if rest_client is not None else RestClient(api_token)
+        self.cache = cache
+        self.single_flight = self._create_single_flight() if coalesce_requests else None
+        self.envelope = envelope
+        self.validation = validation
+        self.intern = intern
+        self.identity_map = identity_map
+        self.retry = retry
+        self.deserialize_executor = deserialize_executor
+        self.offload_threshold = offload_threshold
+        self.offload_models = frozenset(offload_models if offload_models is not None else _RESULT_BUILDERS)
+        self.on_request = on_request
         self.models = self._load_models()
 
-    def _load_models(self):
-        models_dict = {}
-        for importer, modname, ispkg in pkgutil.iter_modules(models.__path__):
-            module = import_module(f".models.{modname}", __package__)
-            for model_name in dir(module):
-                attr = getattr(module, model_name)
-                if isinstance(attr, type) and issubclass(attr, BaseModel):
-                    models_dict[model_name] = attr
-        # print(models_dict)
-        return models_dict
+    @staticmethod
+    def _create_single_flight() -> SingleFlight:
+        return SingleFlight()
+
+    def close(self):
+        """Close the underlying transport and release its pooled connections."""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _load_models(self) -> Mapping[str, type[BaseModel]]:
+        # the registry imports each model the first time it is looked up
+        return models.registry
 
     @staticmethod
     def _parse_int_or_none(value: str) -> int | None:
@@ -95,37 +218,101 @@ class Client:
 
         return s_maxage_expiry, maxage_expiry
 
-    def _deserialize(self, model_name: str, response: Response) -> Any:
+    def _deserialize(self, model_name: str, response: Response, transfer: Transfer = None) -> Any:
         shared_expiry, result_expiry = self._get_result_expiry(response)
-        Model = self._get_model(model_name)
-        data = response.json()
 
-        result = self._create_model_instance(
-            Model, data, result_expiry, shared_expiry)
+        # errors are always validated, have no expiry fields, and are never wrapped so
+        # callers can keep checking isinstance(result, ApiError)
+        if model_name == "ApiError":
+            return self._validate_json(self._get_model(model_name), response.content)
+        with timed("validate", exclude="parse"):
+            if transfer is None and self._should_offload(model_name, response.content):
+                transfer = self._offload(model_name, response.content).result()
+            if transfer is not None:
+                result = unpack(transfer)
+            else:
+                result = self._load_result(model_name, response.content, result_expiry)
+        if model_name not in _RESULT_BUILDERS:
+            interner = self._create_interner()
+            if interner is not None:
+                interner.intern(result)
+            if self._should_digest():
+                record_digests(result)
+        if self.envelope:
+            return ResponseEnvelope.from_response(result, response, result_expiry, shared_expiry)
+        self._set_expiry(result, result_expiry, shared_expiry)
 
         return result
 
+    def _load_result(self, model_name: str, content: bytes, expires: Optional[datetime] = None) -> Any:
+        builder = _RESULT_BUILDERS.get(model_name)
+        if builder is not None:
+            return builder(self._parse_json(content))
+        return self._load_content(self._get_model(model_name), content, expires)
+
+    @staticmethod
+    def _parse_json(content: bytes) -> Any:
+        with timed("parse"):
+            return json.loads(content)
+
+    def _should_digest(self) -> bool:
+        # with an identity map, the stop points that make up most of a result are shared
+        # between fetches, and comparing them by identity is cheaper than digesting them
+        return is_digesting() and self.identity_map is None and self.validation != "raw"
+
+    def _should_offload(self, model_name: str, content: bytes) -> bool:
+        if self.deserialize_executor is None or model_name not in self.offload_models:
+            return False
+        if len(content) < self.offload_threshold:
+            return False
+        # the identity map is only in this process, and parsed JSON is no cheaper to send
+        # back than to parse again
+        return model_name in _RESULT_BUILDERS or (self.identity_map is None and self.validation != "raw")
+
+    def _offload(self, model_name: str, content: bytes) -> Future:
+        return self.deserialize_executor.submit(deserialize_in_worker, model_name, content, self.validation)
+
+    def _load_content(self, Model: type[BaseModel], content: bytes, expires: Optional[datetime] = None) -> Any:
+        if self.validation == "raw":
+            return self._parse_json(content)
+        resolver = self._create_resolver(expires)
+        if resolver is not None:
+            # stop points are replaced with their shared instances, which are kept as they are
+            return self._validate_python(Model, resolver.resolve(Model, self._parse_json(content)))
+        return self._validate_json(Model, content)
+
+    def _create_resolver(self, expires: Optional[datetime], validation: ValidationLevel = None) -> Optional[Resolver]:
+        validation = validation or self.validation
+        if self.identity_map is None or validation == "raw":
+            return None
+        return self.identity_map.resolver(expires, self._validate_python)
+
+    @staticmethod
+    def _validate_json(Model: type[BaseModel], content: bytes) -> BaseModel | List[BaseModel]:
+        # validate the raw bytes directly, without building an intermediate tree of dicts
+        if _JSON_ARRAY_START.match(content):
+            return _get_list_adapter(Model).validate_json(content)
+        return Model.model_validate_json(content)
+
+    @staticmethod
+    def _validate_python(Model: type[BaseModel], data: Any) -> BaseModel | List[BaseModel]:
+        if isinstance(data, list):
+            return _get_list_adapter(Model).validate_python(data)
+        # an instance, e.g. a shared StopPoint, is returned as it is
+        return Model.model_validate(data)
+
+    def _create_interner(self) -> Optional[Interner]:
+        # a shared Interner, a new one for each response, or None
+        if isinstance(self.intern, Interner):
+            return self.intern
+        return Interner() if self.intern else None
+
     def _get_model(self, model_name: str) -> BaseModel:
         Model = self.models.get(model_name)
         if Model is None:
             raise ValueError(f"No model found with name {model_name}")
         return Model
 
-    def _create_model_instance(
-        self, Model: BaseModel,
-        response_json: Any,
-        result_expiry: datetime | None,
-        shared_expiry: datetime | None
-    ) -> BaseModel | List[BaseModel]:
-        if isinstance(response_json, dict):
-            return self._create_model_with_expiry(Model, response_json, result_expiry, shared_expiry)
-        else:
-            return [
-                self._create_model_with_expiry(
-                    Model, item, result_expiry, shared_expiry)
-                for item in response_json
-            ]
-
     def _create_model_with_expiry(
         self, Model: BaseModel, response_json: Any, result_expiry: Optional[datetime], shared_expiry: Optional[datetime]
     ):
@@ -134,6 +321,19 @@ class Client:
         instance.shared_expires = shared_expiry
         return instance
 
+    def _create_streamed_model(
+        self, Model: BaseModel, item: dict, interner: Optional[Interner], resolver: Optional[Resolver],
+        result_expiry: Optional[datetime], shared_expiry: Optional[datetime]
+    ) -> BaseModel:
+        if resolver is not None:
+            instance = self._validate_python(Model, resolver.resolve(Model, item))
+            self._set_expiry(instance, result_expiry, shared_expiry)
+        else:
+            instance = self._create_model_with_expiry(Model, item, result_expiry, shared_expiry)
+        if interner is not None:
+            interner.intern(instance)
+        return instance
+
     def _deserialize_error(self, response: Response) -> models.ApiError:
         # if content is json, deserialize it, otherwise manually create an ApiError object
         if response.headers.get("Content-Type") == "application/json":
@@ -151,19 +351,359 @@ class Client:
         self, endpoint_and_model: dict[str, str],
         params: str | int | List[str | int] = None, endpoint_args: dict = None
     ) -> BaseModel | List[BaseModel] | models.ApiError:
+        endpoint, model_name = self._format_endpoint(endpoint_and_model, params)
+        if self.on_request is None:
+            return self._get_result(endpoint, model_name, endpoint_args)
+        metrics = self._create_metrics(endpoint_and_model, endpoint, model_name, endpoint_args)
+        try:
+            with measure(metrics):
+                return self._get_result(endpoint, model_name, endpoint_args)
+        except Exception as e:
+            metrics.error = e
+            raise
+        finally:
+            self.on_request(metrics)
+
+    def _get_result(
+        self, endpoint: str, model_name: str, endpoint_args: dict
+    ) -> BaseModel | List[BaseModel] | models.ApiError:
+        cache_key = self._get_cache_key(endpoint, endpoint_args, model_name)
+        cached = self._get_cache_entry(cache_key)
+        metrics = current_metrics()
+        if cached is not None and cached.is_fresh():
+            self._record_cache_outcome(metrics, "hit")
+            return self._get_cached_result(cached, model_name)
+        self._record_cache_outcome(metrics, "miss")
+        if self.single_flight is None:
+            return self._fetch(endpoint, model_name, endpoint_args, cache_key, cached)
+        try:
+            return self.single_flight.do(
+                cache_key, lambda: self._fetch(endpoint, model_name, endpoint_args, cache_key, cached))
+        finally:
+            self._record_coalesced(metrics)
+
+    def _create_metrics(
+        self, endpoint_and_model: dict[str, str], endpoint: str, model_name: str, endpoint_args: dict = None
+    ) -> RequestMetrics:
+        # custom transports may not have a base URL
+        url = getattr(self.client, "base_url", "") + endpoint + "?" + urlencode(endpoint_args or {})
+        return RequestMetrics(endpoint_and_model["uri"], model_name, url)
+
+    def _record_cache_outcome(self, metrics: Optional[RequestMetrics], outcome: str):
+        if metrics is not None and self.cache is not None:
+            metrics.cache = outcome
+
+    @staticmethod
+    def _record_coalesced(metrics: Optional[RequestMetrics]):
+        # only the call that fetched the result sent any requests
+        if metrics is not None:
+            metrics.coalesced = metrics.attempts == 0
+
+    @staticmethod
+    def _record_response(metrics: Optional[RequestMetrics], response: Response):
+        if metrics is not None:
+            metrics.status = response.status_code
+            metrics.bytes_received += len(response.content)
+
+    def _fetch(
+        self, endpoint: str, model_name: str, endpoint_args: dict, cache_key: str, cached: Optional[CacheEntry]
+    ) -> BaseModel | List[BaseModel] | models.ApiError:
+        attempts = self.retry.start("GET") if self.retry is not None else None
+        metrics = current_metrics()
+        while True:
+            if metrics is not None:
+                metrics.attempts += 1
+            try:
+                response = self.client.send_request(
+                    endpoint, endpoint_args, headers=self._get_validator_headers(cached))
+            except self._RETRYABLE_ERRORS as e:
+                delay = attempts.next_delay(error=e) if attempts is not None else None
+                if delay is None:
+                    raise
+            else:
+                self._record_response(metrics, response)
+                delay = attempts.next_delay(response) if attempts is not None else None
+                if delay is None:
+                    return self._handle_response(model_name, response, cache_key, cached)
+            with timed("backoff"):
+                time.sleep(delay)
+
+    @staticmethod
+    def _format_endpoint(
+        endpoint_and_model: dict[str, str], params: str | int | List[str | int] = None
+    ) -> Tuple[str, str]:
         if params is None:
             params = []
         if not isinstance(params, list):
             params = [params]
+        return endpoint_and_model["uri"].format(*params), endpoint_and_model["model"]
 
-        endpoint = endpoint_and_model["uri"].format(*params)
-        model_name = endpoint_and_model["model"]
-
-        response = self.client.send_request(endpoint, endpoint_args)
-
+    def _handle_response(
+        self, model_name: str, response: Response, cache_key: str = None, cached: CacheEntry = None,
+        transfer: Transfer = None,
+    ) -> BaseModel | List[BaseModel] | models.ApiError:
+        if response.status_code == 304 and cached is not None:
+            return self._revalidate_cached(model_name, cache_key, cached, response)
         if response.status_code != 200:
             return self._deserialize_error(response)
-        return self._deserialize(model_name, response)
+        result = self._deserialize(model_name, response, transfer)
+        self._store_in_cache(cache_key, response, result)
+        return result
+
+    @staticmethod
+    def _get_cache_key(endpoint: str, endpoint_args: dict, model_name: str) -> str:
+        # one response can be built into more than one kind of result, e.g. arrivals as
+        # Prediction models or as PredictionColumns, and each is cached separately
+        return endpoint + "?" + urlencode(endpoint_args or {}) + "#" + model_name
+
+    def _get_cache_entry(self, cache_key: str) -> Optional[CacheEntry]:
+        if self.cache is None:
+            return None
+        return self.cache.get(cache_key)
+
+    def _load_cached_value(self, entry: CacheEntry, model_name: str):
+        # caches that store raw responses hand back the body to deserialize. It's only
+        # deserialized once the result is known to be current, so a stale entry that is
+        # replaced by a new response is never deserialized
+        if entry.value is None and entry.content is not None:
+            entry.value = self._deserialize(model_name, self._response_from_cache_entry(entry))
+
+    @staticmethod
+    def _response_from_cache_entry(entry: CacheEntry) -> Response:
+        response = Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(entry.headers or {})
+        response._content = entry.content
+        return response
+
+    def _get_cached_result(self, cached: CacheEntry, model_name: str) -> Any:
+        self._load_cached_value(cached, model_name)
+        if isinstance(cached.value, ResponseEnvelope):
+            return cached.value.cached_copy()
+        return cached.value
+
+    @staticmethod
+    def _get_validator_headers(cached: Optional[CacheEntry]) -> dict[str, str]:
+        return cached.get_validator_headers() if cached is not None else {}
+
+    def _store_in_cache(self, cache_key: str | None, response: Response, result: Any):
+        if self.cache is None or cache_key is None:
+            return
+        _, result_expiry = self._get_result_expiry(response)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if result_expiry is None and etag is None and last_modified is None:
+            return
+        entry = CacheEntry(result, result_expiry, etag, last_modified)
+        if getattr(self.cache, "stores_raw_response", False):
+            entry.content = response.content
+            entry.headers = dict(response.headers)
+        self.cache.set(cache_key, entry)
+
+    def _revalidate_cached(self, model_name: str, cache_key: str, cached: CacheEntry, response: Response) -> Any:
+        # 304 Not Modified: the cached result is still current, so only its expiry changes
+        self._record_cache_outcome(current_metrics(), "revalidated")
+        shared_expiry, result_expiry = self._get_result_expiry(response)
+        self.cache.revalidate(cache_key, result_expiry)
+        self._load_cached_value(cached, model_name)
+        self._set_expiry(cached.value, result_expiry, shared_expiry)
+        return self._get_cached_result(cached, model_name)
+
+    @staticmethod
+    def _set_expiry(result: Any, result_expiry: Optional[datetime], shared_expiry: Optional[datetime]):
+        if isinstance(result, ResponseEnvelope):
+            result.content_expires = result_expiry
+            result.shared_expires = shared_expiry
+            return
+        for instance in result if isinstance(result, list) else [result]:
+            if isinstance(instance, dict):
+                # validation="raw" results have nowhere to keep the expiry
+                continue
+            instance.content_expires = result_expiry
+            instance.shared_expires = shared_expiry
+
+    def _iter_request_and_deserialize(
+        self, endpoint_and_model: dict[str, str], model_name: str,
+        params: str | int | List[str | int] = None, endpoint_args: dict = None, array_key: str = None,
+    ) -> Iterator[BaseModel | models.ApiError]:
+        endpoint, _ = self._format_endpoint(endpoint_and_model, params)
+        response = self.client.send_request(endpoint, endpoint_args, stream=True)
+        try:
+            if response.status_code != 200:
+                yield self._deserialize_error(response)
+                return
+            stream = JsonArrayStream(array_key)
+            Model = self._get_model(model_name)
+            shared_expiry, result_expiry = self._get_result_expiry(response)
+            interner = self._create_interner()
+            # streamed results are always validated
+            resolver = self._create_resolver(result_expiry, "full")
+            for chunk in response.iter_content(chunk_size=stream_chunk_size):
+                for item in stream.feed(chunk):
+                    yield self._create_streamed_model(Model, item, interner, resolver, result_expiry, shared_expiry)
+            for item in stream.close():
+                yield self._create_streamed_model(Model, item, interner, resolver, result_expiry, shared_expiry)
+        finally:
+            response.close()
+
+    def watch(
+        self, method: str | Callable[..., Any], *args: Any, key: Callable[[Any], Any] = None,
+        min_interval: float = 1.0, default_interval: float = 30.0, error_interval: float = 30.0,
+        emit_empty: bool = False, tracker: DeltaTracker = None, **kwargs: Any,
+    ) -> Iterator[Delta]:
+        """Poll an endpoint for as long as the generator is iterated, and yield what has changed.
+
+        ``method`` is called with ``args`` and ``kwargs`` to fetch the result, e.g.
+        ``client.watch("get_line_status_by_mode", "tube")``. Each fetch is scheduled for when
+        the previous result expires, going by its ``max-age``, but at least ``min_interval``
+        seconds after the previous fetch. Results without an expiry are fetched every
+        ``default_interval`` seconds.
+
+        Each result is compared with the previous one by the natural id of its items (a
+        line's ``id``, a prediction's ``id``, a stop point's ``naptan_id``, ...), or by
+        ``key`` if it's given. A :class:`Delta` is yielded with the items that were added,
+        changed or removed. The first one has every item in ``added``. Fetches that change
+        nothing yield nothing unless ``emit_empty`` is set. An ``ApiError`` is yielded as a
+        ``Delta`` with ``error`` set, and the fetch is retried after ``error_interval`` seconds.
+
+        Pass a ``tracker`` to work out the changes some other way, e.g. a
+        :class:`~pydantic_tfl_api.diff.LineStatusDiff` to get the severity changes and the new
+        and cleared disruptions of each line.
+        """
+        fetch = getattr(self, method) if isinstance(method, str) else method
+        tracker = tracker if tracker is not None else DeltaTracker(key)
+        while True:
+            with digesting(tracker.digests):
+                result = fetch(*args, **kwargs)
+            delta, delay = self._track(result, tracker, min_interval, default_interval, error_interval)
+            if delta or emit_empty:
+                yield delta
+            time.sleep(delay)
+
+    @staticmethod
+    def _track(
+        result: Any, tracker: DeltaTracker, min_interval: float, default_interval: float, error_interval: float,
+    ) -> Tuple[Delta, float]:
+        # the changes in a watched result, and the seconds until it should be fetched again
+        if isinstance(result, models.ApiError):
+            return Delta(error=result), error_interval
+        items, expires = unwrap(result)
+        delta = tracker.update(items)
+        delta.content_expires = expires
+        return delta, next_delay(expires, min_interval, default_interval)
+
+    def gather(
+        self, calls: Iterable[str | Callable[..., Any] | Tuple[Any, ...]], max_workers: int = 8,
+        timeout: float = None,
+    ) -> List[Any]:
+        """Make many endpoint calls at once, and return their results in the order of ``calls``.
+
+        Each call is a method name or bound method, followed by its arguments, e.g.::
+
+            victoria, arrivals, route = client.gather([
+                ("get_line_status", "victoria"),
+                ("get_arrivals_by_line_id", "victoria"),
+                (client.get_route_by_line_id_with_direction, "victoria", "inbound"),
+            ])
+
+        Up to ``max_workers`` calls run at once on worker threads, sharing the transport's
+        connection pool, so a batch takes about as long as its slowest calls rather than
+        the sum of them all. A call that raises, e.g. after a connection error, gives an
+        ``ApiError`` with the exception's type rather than stopping the batch, and so does
+        each call that hasn't finished ``timeout`` seconds after the batch started. Calls
+        still waiting for a worker at the timeout are never made; those already running
+        finish in the background.
+
+        :raises AttributeError: if a method name isn't a method of the client
+        """
+        resolved = [self._resolve_call(call) for call in calls]
+        if not resolved:
+            return []
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(resolved)))
+        try:
+            futures = [_submit_in_context(executor, method, *args) for method, args in resolved]
+            done, _ = wait(futures, timeout)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        results = []
+        for future, (method, args) in zip(futures, resolved):
+            if future not in done:
+                results.append(self._call_error(method, args, TimeoutError(f"Not finished within {timeout}s")))
+            elif future.exception() is not None:
+                results.append(self._call_error(method, args, future.exception()))
+            else:
+                results.append(future.result())
+        return results
+
+    def _resolve_call(self, call: str | Callable[..., Any] | Tuple[Any, ...]) -> Tuple[Callable[..., Any], tuple]:
+        # the method to call and its arguments
+        if isinstance(call, str) or callable(call):
+            method, args = call, ()
+        else:
+            method, *args = call
+        return getattr(self, method) if isinstance(method, str) else method, tuple(args)
+
+    @staticmethod
+    def _call_error(method: Callable[..., Any], args: tuple, error: BaseException) -> models.ApiError:
+        # stands in for the result of a call that didn't return one
+        return models.ApiError(
+            timestampUtc=datetime.now(timezone.utc),
+            exceptionType=type(error).__name__,
+            httpStatusCode=0,
+            httpStatus="No response",
+            relativeUri=f"{getattr(method, '__name__', method)}{args!r}",
+            message=str(error),
+        )
+
+    def _get_many(
+        self, endpoint_and_model: dict[str, str], ids: Iterable[str], key: Callable[[BaseModel], str],
+        endpoint_args: dict = None, group: bool = False,
+        chunk_size: int = max_ids_per_request, max_workers: int = 8,
+    ) -> dict[str, Any]:
+        chunks = self._chunk_ids(ids, chunk_size)
+        if not chunks:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            futures = [
+                _submit_in_context(
+                    executor, self._send_request_and_deserialize, endpoint_and_model, ",".join(chunk), endpoint_args)
+                for chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+        return self._merge_many(chunks, results, key, group)
+
+    @staticmethod
+    def _get_key(name: str, alias: str) -> Callable[[Any], str]:
+        # results are dicts keyed by the JSON names when validation="raw"
+        return lambda item: item[alias] if isinstance(item, dict) else getattr(item, name)
+
+    @staticmethod
+    def _chunk_ids(ids: Iterable[str], chunk_size: int) -> List[List[str]]:
+        if isinstance(ids, str):
+            ids = [ids]
+        unique_ids = list(dict.fromkeys(ids))
+        return [unique_ids[i:i + chunk_size] for i in range(0, len(unique_ids), chunk_size)]
+
+    @staticmethod
+    def _merge_many(
+        chunks: List[List[str]], results: List[Any], key: Callable[[BaseModel], str], group: bool
+    ) -> dict[str, Any]:
+        merged = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, models.ApiError):
+                # the whole request failed, so report the error against every id in it
+                merged.update((id, result) for id in chunk)
+                continue
+            if isinstance(result, ResponseEnvelope):
+                result = result.items
+            if group:
+                merged.update((id, []) for id in chunk)
+            for item in result if isinstance(result, list) else [result]:
+                if group:
+                    merged.setdefault(key(item), []).append(item)
+                else:
+                    merged[key(item)] = item
+        return merged
 
     def get_stop_points_by_line_id(
         self, line_id: str
@@ -252,10 +792,17 @@ class Client:
         )
 
     def get_stop_points_by_mode(
-        self, mode: str
+        self, mode: str, page: int = None
     ) -> models.StopPointsResponse | List[models.StopPointsResponse] | models.ApiError:
+        """
+        Get the stop points for a mode, or one ``page`` of them, counting from 1.
+
+        Modes with many stop points, such as bus, are split into pages of ``page_size``
+        stop points. Without ``page`` only the first page is returned; see
+        ``paginate_stop_points_by_mode`` to get every page.
+        """
         return self._send_request_and_deserialize(
-            endpoints["stopPointByMode"], mode
+            endpoints["stopPointByMode"], mode, {"page": page} if page is not None else None
         )
 
     def get_stop_point_meta_modes(
@@ -271,3 +818,135 @@ class Client:
         return self._send_request_and_deserialize(
             endpoints["arrivalsByLineId"], line_id
         )
+
+    def get_arrival_columns_by_line_id(self, line_id: str) -> PredictionColumns | models.ApiError:
+        """
+        Get the arrival predictions for a line as ``PredictionColumns``.
+
+        The predictions are stored as arrays, one per field, and built straight from the
+        response without a ``Prediction`` model for each of them, which suits large
+        prediction sets that are filtered, sorted or handed to analytics code.
+        """
+        return self._send_request_and_deserialize(
+            _ARRIVAL_COLUMNS_BY_LINE_ID, line_id
+        )
+
+    def get_line_status_many(
+        self, line_ids: Iterable[str], include_details: bool = None,
+        chunk_size: int = max_ids_per_request, max_workers: int = 8,
+    ) -> dict[str, models.Line | models.ApiError]:
+        """
+        Get the status of many lines, keyed by line id.
+
+        The ids are sent ``chunk_size`` at a time as comma-separated lists, with up to
+        ``max_workers`` requests in flight at once. If a request fails, each of its ids maps
+        to the ``ApiError``.
+        """
+        return self._get_many(
+            endpoints["lineStatus"], line_ids, self._get_key("id", "id"), {"detail": include_details},
+            chunk_size=chunk_size, max_workers=max_workers,
+        )
+
+    def get_arrivals_by_line_ids(
+        self, line_ids: Iterable[str], chunk_size: int = max_ids_per_request, max_workers: int = 8,
+    ) -> dict[str, List[models.Prediction] | models.ApiError]:
+        """
+        Get the arrival predictions for many lines, as a list for each line id.
+
+        Requests are batched as for ``get_line_status_many``.
+        """
+        return self._get_many(
+            endpoints["arrivalsByLineId"], line_ids, self._get_key("line_id", "lineId"), group=True,
+            chunk_size=chunk_size, max_workers=max_workers,
+        )
+
+    def get_stop_points_by_ids(
+        self, ids: Iterable[str], chunk_size: int = max_ids_per_request, max_workers: int = 8,
+    ) -> dict[str, models.StopPoint | models.ApiError]:
+        """
+        Get many stop points, keyed by naptan id.
+
+        Requests are batched as for ``get_line_status_many``.
+        """
+        return self._get_many(
+            endpoints["stopPointById"], ids, self._get_key("naptan_id", "naptanId"),
+            chunk_size=chunk_size, max_workers=max_workers,
+        )
+
+    def iter_stop_points_by_mode(self, mode: str) -> Iterator[models.StopPoint | models.ApiError]:
+        """
+        Iterate over the stop points for a mode as they are received.
+
+        Unlike ``get_stop_points_by_mode``, the response is parsed incrementally and each
+        ``StopPoint`` is yielded as soon as it has been downloaded and validated, so memory
+        use stays flat however large the response is. Results are not cached. If the request
+        fails, the only item is the ``ApiError``.
+        """
+        return self._iter_request_and_deserialize(
+            endpoints["stopPointByMode"], "StopPoint", mode, array_key="stopPoints"
+        )
+
+    def paginate_stop_points_by_mode(
+        self, mode: str, prefetch: int = 2
+    ) -> Iterator[models.StopPoint | models.ApiError]:
+        """
+        Iterate over the stop points for a mode, page by page, in order.
+
+        The first page gives the number of pages, from its ``total`` and ``page_size``.
+        While its stop points are being used the next ``prefetch`` pages are requested
+        in the background, and each time a page is used up the page after those is
+        requested, so at most ``prefetch`` requests are in flight and only those pages
+        and the current one are held in memory, however many pages there are. Pages go
+        through the cache, if the client has one. If a page fails, its ``ApiError`` is
+        the last item.
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+        stop_points, pages = self._read_stop_point_page(self.get_stop_points_by_mode(mode, page=1))
+        yield from stop_points
+        if pages <= 1:
+            return
+        with ThreadPoolExecutor(max_workers=min(prefetch, pages - 1)) as executor:
+            def fetch(page: int) -> Future:
+                return _submit_in_context(executor, self.get_stop_points_by_mode, mode, page)
+
+            in_flight = deque(fetch(page) for page in range(2, min(pages, prefetch + 1) + 1))
+            next_page = len(in_flight) + 2
+            try:
+                while in_flight:
+                    result = in_flight.popleft().result()
+                    if next_page <= pages:
+                        in_flight.append(fetch(next_page))
+                        next_page += 1
+                    stop_points, page_count = self._read_stop_point_page(result)
+                    yield from stop_points
+                    if not page_count:
+                        return
+            finally:
+                # when the caller stops early, or a page fails, don't send the queued requests
+                for future in in_flight:
+                    future.cancel()
+
+    @staticmethod
+    def _read_stop_point_page(result: Any) -> Tuple[List[Any], int]:
+        # the stop points on a page of a StopPointsResponse and the number of pages, or
+        # the error and 0
+        if isinstance(result, models.ApiError):
+            return [result], 0
+        if isinstance(result, ResponseEnvelope):
+            result = result.items
+        if isinstance(result, dict):
+            # validation="raw"
+            stop_points, total, page_size = result.get("stopPoints"), result["total"], result["pageSize"]
+        else:
+            stop_points, total, page_size = result.stop_points, result.total, result.page_size
+        pages = -(-total // page_size) if page_size else 1
+        return stop_points or [], pages
+
+    def iter_stop_points_by_line_id(self, line_id: str) -> Iterator[models.StopPoint | models.ApiError]:
+        """
+        Iterate over the stop points for a line as they are received.
+
+        See ``iter_stop_points_by_mode``.
+        """
+        return self._iter_request_and_deserialize(endpoints["stopPointsByLineId"], "StopPoint", line_id)
@@ -0,0 +1,230 @@
+from array import array
+from datetime import datetime, timezone
+from itertools import compress
+from typing import Any, Callable, Collection, Iterable, Iterator, List, Optional
+
+from pydantic import TypeAdapter
+
+# stored for missing numbers and times. The largest 64 bit integer, so they sort last
+MISSING = 2 ** 63 - 1
+
+
+_datetime_adapter = TypeAdapter(datetime)
+
+
+def _json_key(name: str) -> str:
+    # e.g. time_to_station -> timeToStation
+    first, *rest = name.split("_")
+    return first + "".join(word.title() for word in rest)
+
+
+def _to_int(value: Any) -> int:
+    return MISSING if value is None else int(value)
+
+
+def _parse_datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # e.g. a trailing "Z" or 7 digit fractions, which fromisoformat only accepts from Python 3.11
+        return _datetime_adapter.validate_python(value)
+
+
+def _to_epoch(value: Optional[str], parsed: dict) -> int:
+    # responses repeat the same few timestamps, so each string is only parsed once
+    epoch = parsed.get(value)
+    if epoch is None:
+        if value is None:
+            return MISSING
+        when = _parse_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        epoch = parsed[value] = int(when.timestamp())
+    return epoch
+
+
+class CodedColumn:
+    """A column of repeated strings, stored as an integer code for each row plus the distinct values.
+
+    :param array codes: The code of each row, an index into ``values``
+    :param list values: The distinct values, in the order they were first seen
+    """
+
+    def __init__(self, codes: array, values: List[Optional[str]]):
+        self.codes = codes
+        self.values = values
+
+    @classmethod
+    def from_values(cls, values: Iterable[Optional[str]]) -> "CodedColumn":
+        lookup: dict[Optional[str], int] = {}
+        distinct: List[Optional[str]] = []
+        codes = array("q")
+        for value in values:
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(distinct)
+                distinct.append(value)
+            codes.append(code)
+        return cls(codes, distinct)
+
+    def code_of(self, value: Optional[str]) -> Optional[int]:
+        """The code for ``value``, or ``None`` if no row has it."""
+        try:
+            return self.values.index(value)
+        except ValueError:
+            return None
+
+    def take(self, indices: List[int]) -> "CodedColumn":
+        codes = self.codes
+        return CodedColumn(array("q", [codes[i] for i in indices]), self.values)
+
+    def sort_keys(self) -> List[int]:
+        """The rank of each row's value in sorted order, with ``None`` last."""
+        values = self.values
+        order = sorted(range(len(values)), key=lambda code: (values[code] is None, values[code] or ""))
+        rank = [0] * len(values)
+        for position, code in enumerate(order):
+            rank[code] = position
+        return [rank[code] for code in self.codes]
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self.values[self.codes[index]]
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        values = self.values
+        return (values[code] for code in self.codes)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class PredictionColumns:
+    """Arrival predictions stored column by column rather than as a list of ``Prediction`` models.
+
+    Numeric columns are ``array("q")`` (64 bit integers), with the times in seconds since
+    the epoch, so they can be wrapped without copying, e.g. with
+    ``numpy.frombuffer(columns.time_to_station, dtype=numpy.int64)``. String columns are
+    :class:`CodedColumn`s. ``PredictionColumns`` are built straight from the parsed JSON,
+    without creating a model for each prediction.
+
+    A missing number or time is stored as :data:`MISSING`, the largest 64 bit integer, so
+    it sorts after every other value and is never less than one. ``row`` returns ``None``
+    for it, and ``filter`` matches it with ``None``.
+
+    ``filter``, ``select`` and ``sort_by`` return new ``PredictionColumns`` holding the
+    matching rows.
+    """
+
+    INTEGER_COLUMNS = ("id", "operation_type", "time_to_station")
+    TIME_COLUMNS = ("timestamp", "expected_arrival", "time_to_live")
+    CODED_COLUMNS = (
+        "vehicle_id", "naptan_id", "station_name", "line_id", "line_name", "platform_name", "direction",
+        "bearing", "destination_naptan_id", "destination_name", "current_location", "towards", "mode_name",
+    )
+    COLUMNS = INTEGER_COLUMNS + TIME_COLUMNS + CODED_COLUMNS
+
+    def __init__(self, columns: dict[str, Any], length: int):
+        self._columns = columns
+        self._length = length
+        self.content_expires: Optional[datetime] = None
+        self.shared_expires: Optional[datetime] = None
+
+    @classmethod
+    def from_json(cls, predictions: List[dict]) -> "PredictionColumns":
+        """Build the columns from the parsed JSON of an arrivals response."""
+        columns: dict[str, Any] = {}
+        for name in cls.INTEGER_COLUMNS:
+            key = _json_key(name)
+            columns[name] = array("q", [_to_int(prediction.get(key)) for prediction in predictions])
+        parsed: dict = {}
+        for name in cls.TIME_COLUMNS:
+            key = _json_key(name)
+            columns[name] = array("q", [_to_epoch(prediction.get(key), parsed) for prediction in predictions])
+        for name in cls.CODED_COLUMNS:
+            key = _json_key(name)
+            columns[name] = CodedColumn.from_values(prediction.get(key) for prediction in predictions)
+        return cls(columns, len(predictions))
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.__dict__["_columns"][name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}") from None
+
+    def __len__(self) -> int:
+        return self._length
+
+    def take(self, indices: Iterable[int]) -> "PredictionColumns":
+        """The rows at ``indices``, in that order."""
+        indices = list(indices)
+        columns = {}
+        for name, column in self._columns.items():
+            if isinstance(column, CodedColumn):
+                columns[name] = column.take(indices)
+            else:
+                columns[name] = array("q", [column[i] for i in indices])
+        result = PredictionColumns(columns, len(indices))
+        result.content_expires = self.content_expires
+        result.shared_expires = self.shared_expires
+        return result
+
+    def select(self, mask: Iterable[bool]) -> "PredictionColumns":
+        """The rows where ``mask`` is true, e.g. ``columns.select(t < 300 for t in columns.time_to_station)``."""
+        return self.take(compress(range(self._length), mask))
+
+    def filter(self, **conditions: Any) -> "PredictionColumns":
+        """The rows whose columns equal the given values, e.g. ``columns.filter(naptan_id="940GZZLUOXC")``.
+
+        A condition can also be a list, set or tuple of values to accept any of them, and
+        ``None`` matches missing values.
+        """
+        mask: Optional[List[bool]] = None
+        for name, wanted in conditions.items():
+            column = self._get_column(name)
+            wanted = set(wanted) if isinstance(wanted, (list, set, frozenset, tuple)) else {wanted}
+            if isinstance(column, CodedColumn):
+                # compare the codes, so each row is an integer lookup rather than a string comparison
+                wanted_codes = {column.code_of(value) for value in wanted} - {None}
+                matches = [code in wanted_codes for code in column.codes]
+            else:
+                wanted = {MISSING if value is None else value for value in wanted}
+                matches = [value in wanted for value in column]
+            mask = matches if mask is None else [a and b for a, b in zip(mask, matches)]
+        return self.select(mask) if mask is not None else self.take(range(self._length))
+
+    def sort_by(self, *names: str, reverse: bool = False) -> "PredictionColumns":
+        """The rows sorted by the given columns, e.g. ``columns.sort_by("station_name", "expected_arrival")``."""
+        keys = [self._get_sort_keys(name) for name in names]
+        sort_key: Callable[[int], Any] = keys[0].__getitem__ if len(keys) == 1 else (
+            lambda i: tuple(key[i] for key in keys))
+        return self.take(sorted(range(self._length), key=sort_key, reverse=reverse))
+
+    def row(self, index: int) -> dict[str, Any]:
+        """The prediction at ``index`` as a dict, with the times as timezone aware datetimes.
+
+        Missing numbers and times are ``None``.
+        """
+        row = {}
+        for name in self.COLUMNS:
+            value = self._columns[name][index]
+            if value == MISSING and name not in self.CODED_COLUMNS:
+                value = None
+            elif name in self.TIME_COLUMNS:
+                value = datetime.fromtimestamp(value, timezone.utc)
+            row[name] = value
+        return row
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        return (self.row(i) for i in range(self._length))
+
+    def _get_column(self, name: str) -> Any:
+        if name not in self._columns:
+            raise ValueError(f"Unknown column {name!r}")
+        return self._columns[name]
+
+    def _get_sort_keys(self, name: str) -> Collection:
+        column = self._get_column(name)
+        return column.sort_keys() if isinstance(column, CodedColumn) else column
+
+    def __repr__(self) -> str:
+        return f"<PredictionColumns {self._length} predictions>"
@@ -23,6 +23,12 @@
 
 base_url = "https://api.tfl.gov.uk/"
 
+# the most ids the API accepts in one comma-separated list
+max_ids_per_request = 20
+
+# bytes read at a time when streaming a response
+stream_chunk_size = 64 * 1024
+
 endpoints = {
     'stopPointsByLineId': {"uri": 'Line/{0}/StopPoints', "model" : "StopPoint"},
     'lineMetaModes': {"uri": 'Line/Meta/Modes', "model" : "Mode"},
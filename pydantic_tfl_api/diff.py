@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from .watch import Delta, DeltaTracker, content_digest
+
+
+@dataclass
+class SeverityChange:
+    """A line whose status severities have changed, e.g. from 10 (Good Service) to 6 (Severe Delays).
+
+    :param str line_id: The line's ``id``
+    :param tuple old: The severity of each of the line's statuses before, most severe first
+    :param tuple new: The severity of each of its statuses now
+    :param tuple descriptions: The description of each severity now
+    """
+    line_id: str
+    old: tuple[int, ...]
+    new: tuple[int, ...]
+    descriptions: tuple[str, ...]
+
+
+@dataclass
+class LineStatusChanges(Delta):
+    """A :class:`Delta` of ``Line`` results, with what changed in the lines that changed.
+
+    Lines in ``added`` and ``removed`` aren't described again in the other lists.
+
+    :param list severity_changes: A :class:`SeverityChange` for each line whose severities changed
+    :param list new_disruptions: ``(line id, Disruption)`` for each disruption that has started
+    :param list cleared_disruptions: ``(line id, Disruption)`` for each disruption that has ended
+    """
+    severity_changes: list[SeverityChange] = field(default_factory=list)
+    new_disruptions: list[tuple[str, Any]] = field(default_factory=list)
+    cleared_disruptions: list[tuple[str, Any]] = field(default_factory=list)
+
+
+class LineStatusDiff(DeltaTracker):
+    """Works out how the status of each line changes between fetches of a ``Line`` result.
+
+    Pass it to ``Client.watch`` to get :class:`LineStatusChanges` rather than plain deltas::
+
+        for changes in client.watch("get_line_status_by_mode", "tube", tracker=LineStatusDiff()):
+            for change in changes.severity_changes:
+                print(change.line_id, change.descriptions)
+
+    A watch records a digest of each line's JSON as it's deserialized, and a line whose
+    digest hasn't changed is the same without looking inside it. Only the lines whose
+    digest has changed have their ``line_statuses`` and ``disruptions`` compared, with
+    ``==``, so a line is ``changed`` only if its statuses or disruptions have changed, not
+    e.g. its name. Lines without a digest are always compared: those passed to
+    :meth:`update` directly, and those of a client with a ``StopPointIdentityMap``, as the
+    stop points it shares between fetches are recognised by identity more cheaply than
+    they are digested. The disruptions of a changed line are matched by content, wherever
+    they appear on the line or its statuses, so a disruption whose text is updated shows
+    up as one cleared and one new disruption.
+    """
+
+    digests = True
+
+    def __init__(self):
+        super().__init__(same=_same_status)
+
+    def update(self, items: Iterable[Any]) -> LineStatusChanges:
+        """Replace the tracked lines with ``items`` and return what changed."""
+        previous = self.items
+        changes = self._update(items, LineStatusChanges())
+        for line_id, line in changes.changed.items():
+            self._compare(line_id, previous[line_id], line, changes)
+        return changes
+
+    def _compare(self, line_id: str, old: Any, new: Any, changes: LineStatusChanges):
+        old_statuses, new_statuses = old.line_statuses or [], new.line_statuses or []
+        old_severities = tuple(status.status_severity for status in old_statuses)
+        new_severities = tuple(status.status_severity for status in new_statuses)
+        if old_severities != new_severities:
+            changes.severity_changes.append(SeverityChange(
+                line_id, old_severities, new_severities,
+                tuple(status.status_severity_description for status in new_statuses),
+            ))
+        old_disruptions, new_disruptions = _disruptions(old), _disruptions(new)
+        changes.new_disruptions.extend(
+            (line_id, disruption) for key, disruption in new_disruptions.items() if key not in old_disruptions)
+        changes.cleared_disruptions.extend(
+            (line_id, disruption) for key, disruption in old_disruptions.items() if key not in new_disruptions)
+
+
+def _disruptions(line: Any) -> dict[str, Any]:
+    # the distinct disruptions of the line and of its statuses, keyed by their JSON, as
+    # models can't be hashed
+    disruptions = {}
+    for disruption in line.disruptions or []:
+        disruptions.setdefault(disruption.model_dump_json(), disruption)
+    for status in line.line_statuses or []:
+        for disruption in status.disruptions or []:
+            disruptions.setdefault(disruption.model_dump_json(), disruption)
+    return disruptions
+
+
+def _same_status(old: Any, new: Any) -> bool:
+    old_digest = content_digest(old)
+    if old_digest is not None and old_digest == content_digest(new):
+        return True
+    return old.line_statuses == new.line_statuses and old.disruptions == new.disruptions
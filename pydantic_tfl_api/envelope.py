@@ -0,0 +1,63 @@
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Generic, Optional, TypeVar
+
+from requests import Response
+
+T = TypeVar("T")
+
+
+@dataclass
+class ResponseEnvelope(Generic[T]):
+    """A deserialized result together with the metadata of the response it came from.
+
+    Returned by a ``Client`` created with ``envelope=True``. The expiry is held once here
+    rather than on each of the items.
+
+    :param items: The deserialized result, a model or a list of models
+    :param int status_code: The HTTP status code of the response
+    :param datetime content_expires: When the result stops being fresh, from the ``max-age`` directive
+    :param datetime shared_expires: When the result stops being fresh for shared caches, from ``s-maxage``
+    :param datetime date: When the response was generated, from its ``Date`` header
+    :param int age: Seconds the response had spent in upstream caches, from its ``Age`` header
+    :param timedelta elapsed: Time between sending the request and receiving the response headers
+    :param str url: The URL the response was fetched from
+    :param bool from_cache: Whether the result was served from the client's cache
+    """
+    items: T
+    status_code: int
+    content_expires: Optional[datetime] = None
+    shared_expires: Optional[datetime] = None
+    date: Optional[datetime] = None
+    age: Optional[int] = None
+    elapsed: Optional[timedelta] = None
+    url: Optional[str] = None
+    from_cache: bool = False
+
+    @classmethod
+    def from_response(
+        cls, items: T, response: Response,
+        content_expires: Optional[datetime] = None, shared_expires: Optional[datetime] = None,
+    ) -> "ResponseEnvelope[T]":
+        date = response.headers.get("Date")
+        age = response.headers.get("Age")
+        return cls(
+            items=items,
+            status_code=response.status_code,
+            content_expires=content_expires,
+            shared_expires=shared_expires,
+            date=parsedate_to_datetime(date) if date else None,
+            age=int(age) if age is not None and age.isdigit() else None,
+            elapsed=getattr(response, "elapsed", None),
+            url=response.url,
+        )
+
+    def is_fresh(self, now: Optional[datetime] = None) -> bool:
+        if self.content_expires is None:
+            return False
+        return (now or datetime.now(timezone.utc)) < self.content_expires
+
+    def cached_copy(self) -> "ResponseEnvelope[T]":
+        """A copy of the envelope marked as served from the cache, sharing the same items."""
+        return replace(self, from_cache=True)
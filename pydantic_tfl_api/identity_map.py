@@ -0,0 +1,180 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Callable, List, Optional, Tuple, Union, get_args, get_origin
+from weakref import WeakValueDictionary
+
+from pydantic import BaseModel
+
+from . import models
+
+
+class StopPointIdentityMap:
+    """Shares one ``StopPoint`` instance for each ``naptan_id`` across results.
+
+    Stop points turn up in many results: in ``Disruption.affected_stops``, in
+    ``StopPoint.children`` and in the stop points of each line. With an identity map,
+    a stop point that has already been built is reused rather than validated again,
+    wherever it appears, so holding many results that mention the same stops costs one
+    instance per stop.
+
+    Within a response, every stop point with the same ``naptan_id`` is the same
+    instance. Across responses, a stop point is reused until the response it came from
+    expires, going by its ``max-age``, after which the next response to include it
+    replaces it. The map only holds weak references, so stop points are forgotten once
+    no result refers to them.
+
+    Shared instances are the same object everywhere they appear, so changing one
+    changes it everywhere. A stop point returned at the top level of a result has the
+    ``content_expires`` and ``shared_expires`` of the latest response that returned it.
+
+    The map is safe to share between threads, e.g. those of ``Client.gather``.
+    """
+
+    def __init__(self):
+        self._stop_points: WeakValueDictionary[str, BaseModel] = WeakValueDictionary()
+        self._expires: dict[str, datetime] = {}
+        self._lock = Lock()
+
+    def get(self, naptan_id: str, now: Optional[datetime] = None) -> Optional[BaseModel]:
+        """The stop point with ``naptan_id``, or ``None`` if there isn't one or it has expired."""
+        with self._lock:
+            stop_point = self._stop_points.get(naptan_id)
+            if stop_point is None:
+                self._expires.pop(naptan_id, None)
+                return None
+            expires = self._expires.get(naptan_id)
+        if expires is None or expires <= (now or datetime.now(timezone.utc)):
+            return None
+        return stop_point
+
+    def add(self, stop_point: BaseModel, expires: datetime):
+        """Share ``stop_point`` until ``expires``, replacing any stop point with the same ``naptan_id``."""
+        with self._lock:
+            self._stop_points[stop_point.naptan_id] = stop_point
+            self._expires[stop_point.naptan_id] = expires
+
+    def clear(self):
+        with self._lock:
+            self._stop_points.clear()
+            self._expires.clear()
+
+    def resolver(self, expires: Optional[datetime], build: Callable[[type[BaseModel], dict], BaseModel]) -> "Resolver":
+        """A :class:`Resolver` for a response that expires at ``expires``, building new stop points with ``build``."""
+        return Resolver(self, expires, build)
+
+    def __contains__(self, naptan_id: str) -> bool:
+        return self.get(naptan_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._stop_points)
+
+
+def _model_of(annotation: Any) -> Tuple[Optional[type[BaseModel]], bool]:
+    # (model, is_list) for a field annotated with a model, a list of them, or Optional of either
+    origin = get_origin(annotation)
+    if origin is Union:
+        types = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _model_of(types[0]) if len(types) == 1 else (None, False)
+    if origin in (list, List):
+        (item_type,) = get_args(annotation) or (Any,)
+        Model, _ = _model_of(item_type)
+        return Model, True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def _get_plan(Model: type[BaseModel]) -> List[Tuple[str, str, type[BaseModel], bool]]:
+    # (JSON key, field name, model, is_list) for each field that can hold stop points
+    plan = []
+    for name, field in Model.model_fields.items():
+        FieldModel, is_list = _model_of(field.annotation)
+        if FieldModel is not None and _can_hold_stop_points(FieldModel):
+            plan.append((field.alias or name, name, FieldModel, is_list))
+    return plan
+
+
+def _can_hold_stop_points(Model: type[BaseModel], visiting: frozenset = frozenset()) -> bool:
+    if Model is models.StopPoint:
+        return True
+    if Model in visiting:
+        return False
+    visiting = visiting | {Model}
+    for field in Model.model_fields.values():
+        FieldModel, _ = _model_of(field.annotation)
+        if FieldModel is not None and _can_hold_stop_points(FieldModel, visiting):
+            return True
+    return False
+
+
+class Resolver:
+    """Replaces the stop points in the parsed JSON of one response with shared instances.
+
+    :param StopPointIdentityMap identity_map: The map to look stop points up in and add new ones to
+    :param datetime expires: When the response expires, or ``None`` if it has no ``max-age``
+    :param build: Function building a ``StopPoint`` from its JSON, e.g. with validation
+    """
+
+    def __init__(
+        self, identity_map: StopPointIdentityMap, expires: Optional[datetime],
+        build: Callable[[type[BaseModel], dict], BaseModel],
+    ):
+        self.identity_map = identity_map
+        self.expires = expires
+        self.build = build
+        self.now = datetime.now(timezone.utc)
+        # every stop point in this response, whether or not it can be shared beyond it
+        self.seen: dict[str, BaseModel] = {}
+
+    def resolve(self, Model: type[BaseModel], data: Any) -> Any:
+        """Resolve the stop points in ``data``, the JSON of a ``Model`` or a list of them.
+
+        Stop points are replaced with instances, nested ones first, and everything else is
+        left as JSON for the caller to build, which keeps the instances as they are.
+        """
+        if isinstance(data, list):
+            return [self._resolve_object(Model, item) for item in data]
+        return self._resolve_object(Model, data)
+
+    def _resolve_object(self, Model: type[BaseModel], data: Any) -> Any:
+        if not isinstance(data, dict):
+            return data
+        if Model is models.StopPoint:
+            return self._resolve_stop_point(data)
+        self._resolve_fields(Model, data)
+        return data
+
+    def _resolve_fields(self, Model: type[BaseModel], data: dict):
+        for key, name, FieldModel, is_list in _get_plan(Model):
+            if key not in data:
+                if name not in data:
+                    continue
+                key = name
+            value = data[key]
+            if is_list and isinstance(value, list):
+                data[key] = [self._resolve_object(FieldModel, item) for item in value]
+            else:
+                data[key] = self._resolve_object(FieldModel, value)
+
+    def _resolve_stop_point(self, data: dict) -> BaseModel:
+        naptan_id = data.get("naptanId", data.get("naptan_id"))
+        shareable = isinstance(naptan_id, str)
+        if shareable:
+            stop_point = self.seen.get(naptan_id)
+            if stop_point is None:
+                stop_point = self.identity_map.get(naptan_id, self.now)
+            if stop_point is not None:
+                # reused as it is, without looking at its children
+                self.seen[naptan_id] = stop_point
+                return stop_point
+        self._resolve_fields(models.StopPoint, data)
+        stop_point = self.build(models.StopPoint, data)
+        if shareable:
+            self.seen[naptan_id] = stop_point
+            # a response without a max-age is stale straight away, so its stop points are
+            # only shared within it
+            if self.expires is not None and self.expires > self.now:
+                self.identity_map.add(stop_point, self.expires)
+        return stop_point
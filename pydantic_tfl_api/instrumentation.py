@@ -0,0 +1,147 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Literal, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+CacheOutcome = Literal["hit", "miss", "revalidated"]
+
+_current_metrics: ContextVar[Optional["RequestMetrics"]] = ContextVar("request_metrics", default=None)
+
+
+@dataclass
+class RequestMetrics:
+    """Where the time went in one call to an endpoint method, passed to a ``Client``'s ``on_request``.
+
+    Timings are in seconds, and summed over every attempt when a call is retried. Each is
+    ``None`` when that step didn't happen, e.g. no time is spent on the network when the
+    result comes from the cache, or when it can't be measured: ``connect``, ``ttfb`` and
+    ``download`` are only reported by ``RestClient`` and ``AsyncRestClient``.
+
+    :param str endpoint: The endpoint's URI template, e.g. ``"Line/{0}/Status"``
+    :param str model_name: The model the response is deserialized into
+    :param str url: The URL requested, without the app key
+    :param int status: The HTTP status of the last response
+    :param int bytes_received: The size of the response bodies
+    :param str cache: ``"hit"`` when the result came from the cache, ``"revalidated"`` when
+        the server confirmed the cached result with a 304, ``"miss"`` otherwise, or ``None``
+        without a cache
+    :param bool coalesced: The call was given the result of a concurrent call to the same
+        endpoint rather than sending its own request, so has no network timings
+    :param int attempts: Requests sent, more than one when retried
+    :param float queue: Time waiting for the rate limiter
+    :param float connect: Time opening connections, including the TLS handshake. ``0.0``
+        when a pooled connection was reused
+    :param float ttfb: Time from sending the request to receiving the response headers
+    :param float download: Time reading the response body
+    :param float backoff: Time waiting between retries
+    :param float parse: Time parsing JSON into dicts and lists. ``None`` when the response
+        is validated straight from the JSON, as happens with ``"full"`` validation, which
+        parses and validates in one pass, so the time is all in ``validate``
+    :param float validate: Time building the result from the response, or waiting for
+        it to be built by the ``deserialize_executor``
+    :param float total: Time for the whole call
+    :param Exception error: The exception the call raised, if any
+    """
+    endpoint: str
+    model_name: str
+    url: str
+    status: Optional[int] = None
+    bytes_received: int = 0
+    cache: Optional[CacheOutcome] = None
+    coalesced: bool = False
+    attempts: int = 0
+    queue: Optional[float] = None
+    connect: Optional[float] = None
+    ttfb: Optional[float] = None
+    download: Optional[float] = None
+    backoff: Optional[float] = None
+    parse: Optional[float] = None
+    validate: Optional[float] = None
+    total: Optional[float] = None
+    error: Optional[BaseException] = None
+
+    def add(self, name: str, seconds: float):
+        """Add ``seconds`` to the timing ``name``."""
+        setattr(self, name, (getattr(self, name) or 0.0) + seconds)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """The :class:`RequestMetrics` of the call being made, or ``None`` if it isn't instrumented."""
+    return _current_metrics.get()
+
+
+@contextmanager
+def measure(metrics: RequestMetrics) -> Iterator[RequestMetrics]:
+    """Record the timings of the code inside the ``with`` block in ``metrics``.
+
+    Like rate limiter lanes, the metrics follow the code into coroutines and the transport,
+    which adds the network timings to them.
+    """
+    token = _current_metrics.set(metrics)
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.total = time.perf_counter() - start
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def timed(name: str, exclude: str = None) -> Iterator[None]:
+    """Add the time spent inside the ``with`` block to the current metrics' timing ``name``.
+
+    :param str exclude: A timing whose time added inside the block isn't counted again in ``name``
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    excluded = getattr(metrics, exclude) or 0.0 if exclude else 0.0
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if exclude:
+            elapsed -= (getattr(metrics, exclude) or 0.0) - excluded
+        metrics.add(name, elapsed)
+
+
+class _TimedConnectMixin:
+    # connections are opened lazily by the thread sending the request, so the time is
+    # added to that call's metrics
+    def connect(self):
+        with timed("connect"):
+            super().connect()
+
+
+class TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """An ``HTTPAdapter`` that adds the time spent opening connections to the current metrics."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
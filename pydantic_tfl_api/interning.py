@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Any, Hashable, Iterable, Tuple
+
+from pydantic import BaseModel
+
+# the key of a value that can't be compared, which stops the models containing it from being shared
+_UNSHAREABLE = object()
+_SCALAR_TYPES = frozenset({bool, int, float})
+
+
+class Interner:
+    """Deduplicates repeated strings and identical nested models in deserialized results.
+
+    Large responses repeat the same values many times, e.g. a ``StopPointsResponse`` for
+    a mode has the same ``modes``, ``AdditionalProperties`` categories and keys, and the
+    same few ``Line`` references on thousands of stop points. ``intern`` replaces each
+    repeated string and datetime with the first one seen, and each nested model in
+    ``shared_models`` with the first identical model seen, so every copy after the first
+    costs only a reference.
+
+    Shared models are the same object wherever they appear, so changing one changes it
+    everywhere. The top-level results themselves are never replaced.
+
+    Use one ``Interner`` per response, or keep one to share values across responses; its
+    pools grow with every distinct value it sees until ``clear`` is called.
+
+    :param shared_models: Names of the models to deduplicate
+    """
+
+    SHARED_MODELS = frozenset({
+        "AdditionalProperties", "Crowding", "Identifier", "Line", "LineGroup", "LineModeGroup",
+        "PassengerFlow", "TrainLoading", "ValidityPeriod",
+    })
+
+    def __init__(self, shared_models: Iterable[str] = SHARED_MODELS):
+        self.shared_models = frozenset(shared_models)
+        self._strings: dict[str, str] = {}
+        self._objects: dict[Hashable, Any] = {}
+
+    def intern(self, result: Any) -> Any:
+        """Intern the contents of ``result``, a model, a dict or a list of them, in place and return it."""
+        for item in result if isinstance(result, list) else [result]:
+            if isinstance(item, BaseModel):
+                self._intern_fields(item)
+            elif isinstance(item, (dict, list)):
+                self._intern(item)
+        return result
+
+    def clear(self):
+        """Forget the values seen so far."""
+        self._strings.clear()
+        self._objects.clear()
+
+    def __len__(self) -> int:
+        return len(self._strings) + len(self._objects)
+
+    def _intern(self, value: Any) -> Tuple[Any, Hashable]:
+        # returns the interned value and a key identifying its contents
+        if isinstance(value, str):
+            value = self._strings.setdefault(value, value)
+            return value, value
+        if value is None or isinstance(value, (bool, int, float)):
+            return value, value
+        if isinstance(value, BaseModel):
+            return self._intern_model(value)
+        if isinstance(value, list):
+            keys = []
+            for i, item in enumerate(value):
+                value[i], key = self._intern(item)
+                keys.append(key)
+            return value, _UNSHAREABLE if any(key is _UNSHAREABLE for key in keys) else tuple(keys)
+        if isinstance(value, dict):
+            for name, item in value.items():
+                value[name], _ = self._intern(item)
+            return value, _UNSHAREABLE
+        if isinstance(value, datetime):
+            # equal datetimes can be in different time zones, so the zone is part of the key
+            key = (datetime, value, value.tzinfo)
+            value = self._objects.setdefault(key, value)
+            return value, key
+        return value, _UNSHAREABLE
+
+    def _intern_fields(self, model: BaseModel) -> Hashable:
+        fields = model.__dict__
+        strings = self._strings
+        keys = []
+        shareable = True
+        for name, value in fields.items():
+            # most fields are strings, numbers or None, so those are handled inline
+            value_type = type(value)
+            if value_type is str:
+                value = fields[name] = strings.setdefault(value, value)
+                keys.append(value)
+            elif value is None or value_type in _SCALAR_TYPES:
+                keys.append(value)
+            else:
+                fields[name], key = self._intern(value)
+                keys.append(key)
+                shareable = shareable and key is not _UNSHAREABLE
+        return tuple(keys) if shareable else _UNSHAREABLE
+
+    def _intern_model(self, model: BaseModel) -> Tuple[BaseModel, Hashable]:
+        keys = self._intern_fields(model)
+        Model = type(model)
+        if keys is _UNSHAREABLE or Model.__name__ not in self.shared_models or model.__pydantic_extra__:
+            return model, _UNSHAREABLE
+        key = (Model, frozenset(model.__pydantic_fields_set__), keys)
+        model = self._objects.setdefault(key, model)
+        # the canonical model is kept alive by the pool, so its id identifies it
+        return model, (Model, id(model))
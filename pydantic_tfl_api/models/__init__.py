@@ -24,45 +24,85 @@
 # SOFTWARE.
 
 
-from .additional_properties import AdditionalProperties  # no dependencies
-from .line_mode_group import LineModeGroup  # no dependencies
-from .line_group import LineGroup  # no dependencies
-from .stop_point import (
-    StopPoint,
-)  # dependent on Line (commented out), LineGroup, LineModeGroup, AdditionalProperties
-from .stop_points_response import StopPointsResponse  # dependent on StopPoint
-
-from .route_section_naptan_entry_sequence import (
-    RouteSectionNaptanEntrySequence,
-)  # dependent on StopPoint
-from .affected_route import (
-    AffectedRoute,
-)  # dependent on RouteSectionNaptanEntrySequence
-from .disruption import Disruption  # dependent on AffectedRoute and StopPoint
-
-from .service_type import ServiceType  # no dependencies
-from .route_section import RouteSection  # no dependencies
-
-from .passenger_flow import PassengerFlow  # no dependencies
-from .train_loading import TrainLoading  # no dependencies
-from .crowding import Crowding  # dependent on PassengerFlow and TrainLoading
-
-from .validity_period import ValidityPeriod  # no dependencies
-from .line_status import LineStatus  # dependent on ValidityPeriod
-
-from .line import (
-    Line,
-)  # dependent on Disruption, LineStatus, RouteSection, ServiceType, Crowding
-
-from .prediction_timing import PredictionTiming  # no dependencies
-from .prediction import Prediction  # dependent on PredictionTiming
-
-from .api_error import ApiError  # no dependencies
-from .mode import Mode  # no dependencies
-
-from .matched_stop import MatchedStop  # no dependencies
-from .ordered_route import OrderedRoute  # no dependencies
-from .route_sequence import RouteSequence  # dependent on MatchedStop and OrderedRoute
+from collections.abc import Mapping
+from importlib import import_module
+
+# the module each model is defined in. Models are imported the first time they are used,
+# so a process only builds the pydantic schemas of the models it needs
+_MODEL_MODULES = {
+    "AdditionalProperties": "additional_properties",
+    "AffectedRoute": "affected_route",
+    "ApiError": "api_error",
+    "Crowding": "crowding",
+    "Disruption": "disruption",
+    "Line": "line",
+    "LineGroup": "line_group",
+    "LineModeGroup": "line_mode_group",
+    "LineStatus": "line_status",
+    "Mode": "mode",
+    "MatchedStop": "matched_stop",
+    "OrderedRoute": "ordered_route",
+    "PassengerFlow": "passenger_flow",
+    "Prediction": "prediction",
+    "PredictionTiming": "prediction_timing",
+    "RouteSection": "route_section",
+    "RouteSectionNaptanEntrySequence": "route_section_naptan_entry_sequence",
+    "RouteSequence": "route_sequence",
+    "ServiceType": "service_type",
+    "StopPoint": "stop_point",
+    "StopPointsResponse": "stop_points_response",
+    "TrainLoading": "train_loading",
+    "ValidityPeriod": "validity_period",
+}
+
+
+# models that contain StopPoint, which refers to Line. StopPoint can only be completed
+# once Line is defined, so line.py is imported before any of them is returned
+_LINE_CYCLE_MODELS = frozenset({
+    "AffectedRoute",
+    "Disruption",
+    "LineStatus",
+    "RouteSectionNaptanEntrySequence",
+    "StopPoint",
+    "StopPointsResponse",
+})
+
+
+def __getattr__(name: str):
+    module_name = _MODEL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name in _LINE_CYCLE_MODELS:
+        import_module(".line", __name__)
+    Model = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = Model
+    return Model
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODEL_MODULES))
+
+
+class ModelRegistry(Mapping):
+    """Read-only mapping of model names to model classes.
+
+    Each model's module is imported the first time the model is looked up.
+    """
+
+    def __getitem__(self, name: str):
+        if name not in _MODEL_MODULES:
+            raise KeyError(name)
+        Model = globals().get(name)
+        return Model if Model is not None else __getattr__(name)
+
+    def __iter__(self):
+        return iter(_MODEL_MODULES)
+
+    def __len__(self) -> int:
+        return len(_MODEL_MODULES)
+
+
+registry = ModelRegistry()
 
 __all__ = [
     "AdditionalProperties",
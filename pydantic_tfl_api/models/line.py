@@ -7,6 +7,7 @@ from .line_status import LineStatus
 from .route_section import RouteSection
 from .service_type import ServiceType
 from .crowding import Crowding
+from .stop_point import StopPoint
 
 
 class Line(BaseModel):
@@ -24,3 +25,7 @@ class Line(BaseModel):
     shared_expires: Optional[datetime] = Field(None)
 
     model_config = {'populate_by_name': True}
+
+
+# StopPoint refers to Line, so it can only be completed now Line is defined
+StopPoint.model_rebuild()
@@ -1,13 +1,19 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from datetime import datetime
 
 
 from .line_group import LineGroup
 from .line_mode_group import LineModeGroup
 from .additional_properties import AdditionalProperties
-# note additional import from .line import Line
-# at the end of the file
+
+if TYPE_CHECKING:
+    from .line import Line
+
+# StopPoint refers to Line, which can't be imported here without a circular import, so
+# line.py completes StopPoint once Line is defined. models.registry imports line.py
+# whenever a model containing StopPoint is looked up
+
 
 class StopPoint(BaseModel):
     naptan_id: str = Field(alias="naptanId")
@@ -43,10 +49,3 @@ class StopPoint(BaseModel):
     shared_expires: Optional[datetime] = Field(None)
 
     model_config = {"populate_by_name": True}
-
-
-# we have to import Line after StopPoint is defined or we get a circular reference
-from .line import Line  # noqa: E402
-
-# Rebuild the model to reference Line
-StopPoint.model_rebuild()
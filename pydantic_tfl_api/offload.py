@@ -0,0 +1,79 @@
+import pickle
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional
+
+from pydantic import BaseModel
+
+# items pickled together; results are unpickled a chunk at a time, so other threads get
+# the GIL in between rather than waiting for the whole result
+CHUNK_SIZE = 100
+
+
+class Transfer(NamedTuple):
+    """A result packed by a worker process for the trip back to the client.
+
+    A large result is split into pickled chunks of :data:`CHUNK_SIZE` items: the items of
+    a list result, or of the long list fields of a model result such as a
+    ``StopPointsResponse``'s ``stop_points``, with the rest of the model pickled on its own.
+    """
+
+    #: the pickled result, without the items of its long list fields; None for a list result
+    result: Optional[bytes]
+    #: the pickled chunks of each long list field, by field name
+    fields: dict[str, List[bytes]]
+    #: the pickled chunks of a list result
+    items: Optional[List[bytes]] = None
+
+
+def deserialize_in_worker(model_name: str, content: bytes, validation: str) -> Transfer:
+    """Deserialize a response body into ``model_name`` results, and pack them with :func:`pack`.
+
+    Runs in a worker process of a ``Client``'s ``deserialize_executor``.
+    """
+    return pack(_get_worker_client(validation)._load_result(model_name, content))
+
+
+@lru_cache(maxsize=None)
+def _get_worker_client(validation: str):
+    # imported here, as the client imports this module
+    from .client import Client
+    return Client(validation=validation, coalesce_requests=False)
+
+
+def pack(result: Any) -> Transfer:
+    """Pickle ``result`` in chunks."""
+    if isinstance(result, list):
+        return Transfer(None, {}, _pickle_chunks(result))
+    if isinstance(result, BaseModel):
+        fields = {
+            name: value for name, value in result.__dict__.items()
+            if isinstance(value, list) and len(value) > CHUNK_SIZE
+        }
+        if fields:
+            shell = result.model_copy(update={name: [] for name in fields})
+            return Transfer(
+                pickle.dumps(shell, pickle.HIGHEST_PROTOCOL),
+                {name: _pickle_chunks(value) for name, value in fields.items()},
+            )
+    return Transfer(pickle.dumps(result, pickle.HIGHEST_PROTOCOL), {})
+
+
+def unpack(transfer: Transfer) -> Any:
+    """Rebuild the result packed by :func:`pack`."""
+    if transfer.result is None:
+        return _unpickle_chunks(transfer.items)
+    result = pickle.loads(transfer.result)
+    for name, chunks in transfer.fields.items():
+        result.__dict__[name] = _unpickle_chunks(chunks)
+    return result
+
+
+def _pickle_chunks(items: list) -> List[bytes]:
+    return [pickle.dumps(items[i:i + CHUNK_SIZE], pickle.HIGHEST_PROTOCOL) for i in range(0, len(items), CHUNK_SIZE)]
+
+
+def _unpickle_chunks(chunks: List[bytes]) -> list:
+    items = []
+    for chunk in chunks:
+        items.extend(pickle.loads(chunk))
+    return items
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Condition
+from typing import Callable, Iterator, Optional, Sequence
+
+# the shortest a waiter sleeps for, so coroutines behind the head of the queue don't spin
+_MIN_DELAY = 0.001
+
+_current_lane: ContextVar[Optional[str]] = ContextVar("rate_limit_lane", default=None)
+
+
+@contextmanager
+def lane(name: str) -> Iterator[None]:
+    """Send the requests made inside the ``with`` block through the rate limiter's ``name`` lane.
+
+    The lane follows the code into coroutines and the worker threads of
+    ``Client.get_line_status_many`` and friends, e.g.::
+
+        with lane("background"):
+            client.get_stop_points_by_mode("bus")
+    """
+    token = _current_lane.set(name)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+@dataclass
+class LaneStats:
+    """How long requests in one lane have waited for the rate limiter."""
+
+    requests: int = 0
+    #: requests that couldn't be sent straight away
+    delayed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    #: requests waiting now
+    queued: int = 0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class RateLimiter:
+    """Token bucket limiting how fast requests are sent, with priority lanes.
+
+    The bucket holds up to ``burst`` tokens and refills at ``rate`` tokens a second.
+    Each request takes a token, waiting for one if the bucket is empty. Waiting requests
+    are served lane by lane in the order of ``lanes``, and first come first served
+    within a lane, so interactive lookups in the first lane go ahead of any background
+    refreshes queued behind them. Requests outside a :func:`lane` block use the first
+    lane.
+
+    One limiter can be shared by every ``RestClient`` and ``AsyncRestClient`` using the
+    same app key: threads wait with :meth:`acquire` and coroutines with
+    :meth:`acquire_async`, which doesn't block the event loop.
+
+    :param float rate: Requests per second allowed on average
+    :param int burst: Requests that can be sent at once after a quiet spell
+    :param lanes: Names of the lanes, most urgent first
+    """
+
+    def __init__(
+        self, rate: float, burst: int = 1, lanes: Sequence[str] = ("interactive", "background"),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if not lanes:
+            raise ValueError("at least one lane is needed")
+        self.rate = rate
+        self.burst = burst
+        self.lanes = tuple(lanes)
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._queues: dict[str, deque] = {name: deque() for name in self.lanes}
+        self._condition = Condition()
+        self.stats: dict[str, LaneStats] = {name: LaneStats() for name in self.lanes}
+
+    def acquire(self, lane: str = None) -> float:
+        """Wait for a token, blocking the thread, and return how many seconds that took."""
+        ticket, lane, start = self._join(lane)
+        delayed = False
+        with self._condition:
+            try:
+                while True:
+                    delay = self._try_take(ticket, lane)
+                    if delay is None:
+                        break
+                    delayed = True
+                    # a waiter behind the head of the queue is woken when the head takes
+                    # its token; the head wakes itself when the next token is due
+                    self._condition.wait(delay if self._is_next(ticket, lane) else None)
+            finally:
+                self._leave(ticket, lane)
+        return self._record(lane, start, delayed)
+
+    async def acquire_async(self, lane: str = None) -> float:
+        """Wait for a token without blocking the event loop, and return how many seconds that took."""
+        ticket, lane, start = self._join(lane)
+        delayed = False
+        try:
+            while True:
+                with self._condition:
+                    delay = self._try_take(ticket, lane)
+                if delay is None:
+                    break
+                delayed = True
+                # coroutines can't be woken by the condition, so they check again once the
+                # next token is due
+                await asyncio.sleep(delay)
+        finally:
+            with self._condition:
+                self._leave(ticket, lane)
+        return self._record(lane, start, delayed)
+
+    def _join(self, lane: Optional[str]):
+        lane = lane or _current_lane.get() or self.lanes[0]
+        if lane not in self._queues:
+            raise ValueError(f"Unknown lane {lane!r}, expected one of {self.lanes}")
+        ticket = object()
+        with self._condition:
+            self._queues[lane].append(ticket)
+            self.stats[lane].queued += 1
+        return ticket, lane, self._clock()
+
+    def _leave(self, ticket: object, lane: str):
+        queue = self._queues[lane]
+        if ticket in queue:
+            queue.remove(ticket)
+            self.stats[lane].queued -= 1
+            # the next waiter may now be at the head
+            self._condition.notify_all()
+
+    def _try_take(self, ticket: object, lane: str) -> Optional[float]:
+        # takes a token and returns None, or returns the seconds until one could be taken
+        self._refill()
+        if not self._is_next(ticket, lane):
+            # the waiter at the head of the queue takes the next token, so this one has to
+            # wait for at least the token after that
+            return max((2 - self._tokens) / self.rate, _MIN_DELAY)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return None
+        return (1 - self._tokens) / self.rate
+
+    def _is_next(self, ticket: object, lane: str) -> bool:
+        for name in self.lanes:
+            queue = self._queues[name]
+            if queue:
+                return name == lane and queue[0] is ticket
+        return False
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _record(self, lane: str, start: float, delayed: bool) -> float:
+        wait = self._clock() - start
+        with self._condition:
+            stats = self.stats[lane]
+            stats.requests += 1
+            stats.total_wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+            if delayed:
+                stats.delayed += 1
+        return wait
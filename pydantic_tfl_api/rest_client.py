@@ -21,25 +21,108 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import time
+
 import requests
 try:
     from urllib.parse import urlencode
 except ImportError:
     from urllib import urlencode
 from .config import base_url
+from .instrumentation import TimedHTTPAdapter, current_metrics, timed
+from .rate_limit import RateLimiter
+
 
 class RestClient():
     """RestClient.
 
+    Requests are sent through a long-lived :class:`requests.Session`, so TCP and TLS
+    connections to the API are pooled and reused between calls. Close the client (or use
+    it as a context manager) to release the pooled connections.
+
     :param str app_key: App key to access TfL unified API
+    :param int pool_connections: Number of per-host connection pools to keep
+    :param int pool_maxsize: Maximum number of connections kept open to a single host
+    :param bool pool_block: Wait for a free connection when ``pool_maxsize`` is reached,
+        rather than opening (and then discarding) an extra one
+    :param bool keep_alive: Reuse connections between requests. If ``False`` every request
+        asks the server to close the connection once the response has been read
+    :param float timeout: Timeout in seconds for each request, or ``None`` to wait forever
+    :param str base_url: Root URL of the API, e.g. to point the client at a local stub
+    :param RateLimiter rate_limiter: Limits how fast requests are sent, e.g. to stay within
+        the app key's quota. Can be shared with other clients using the same app key
     """
 
-    def __init__(self, app_key: str = None):
+    def __init__(
+        self,
+        app_key: str = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: float | None = None,
+        base_url: str = base_url,
+        rate_limiter: RateLimiter = None,
+    ):
         self.app_key = {"app_key": app_key} if app_key else None
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = TimedHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
 
-    def send_request(self, location, params=None):
+    def send_request(self, location, params=None, headers=None, stream=False):
         request_headers = self._get_request_headers()
-        return requests.get(base_url + location + "?" + self._get_query_strings(params), headers=request_headers)
+        if headers:
+            request_headers.update(headers)
+        if self.rate_limiter is not None:
+            with timed("queue"):
+                self.rate_limiter.acquire()
+        metrics = current_metrics()
+        if metrics is not None:
+            # a reused connection takes no time to open
+            metrics.connect = connect = metrics.connect or 0.0
+            start = time.perf_counter()
+        response = self.session.get(
+            self.base_url + location + "?" + self._get_query_strings(params),
+            headers=request_headers,
+            timeout=self.timeout,
+            stream=stream,
+        )
+        if metrics is not None:
+            # requests times up to the response headers, including opening the connection,
+            # then reads the body
+            elapsed = response.elapsed.total_seconds()
+            metrics.add("ttfb", elapsed - (metrics.connect - connect))
+            if not stream:
+                metrics.add("download", time.perf_counter() - start - elapsed)
+        return response
+
+    def close(self):
+        """Close the session and any pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _get_request_headers(self):
         request_headers = {
@@ -53,4 +136,4 @@ class RestClient():
     def _get_query_strings(self, params):
         if params is None:
             params = {}
-        return urlencode(params)
\ No newline at end of file
+        return urlencode(params)
@@ -0,0 +1,158 @@
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from typing import Callable, Collection, Optional
+
+from requests import Response
+
+
+@dataclass
+class RetryStats:
+    """What a :class:`RetryPolicy` has done, to help tune it."""
+
+    #: calls made under the policy, however many attempts each took
+    calls: int = 0
+    retries: int = 0
+    #: retries by the status code that caused them
+    retries_by_status: dict[int, int] = field(default_factory=dict)
+    #: retries after the request failed to get a response at all
+    retried_errors: int = 0
+    #: calls that failed even after retrying, because they ran out of retries or time
+    gave_up: int = 0
+    #: seconds spent waiting between attempts
+    total_delay: float = 0.0
+
+
+class RetryPolicy:
+    """Retries requests that fail with a transient error, backing off exponentially.
+
+    A request is retried if the API responds with one of ``statuses``, e.g. a 429 when
+    the app key's quota is used up or a 503 from the caching layer, or if no response
+    arrives at all, e.g. after a connection error or a timeout. Only ``methods`` are
+    retried, which are safe to send again.
+
+    Before retry ``n`` (counting from 0) the client waits a random time between 0 and
+    ``min(max_delay, base_delay * 2 ** n)`` ("full jitter"), so clients that failed
+    together don't all retry together. If the response has a ``Retry-After`` header,
+    the client waits that long instead. The error is returned, or raised, once
+    ``max_retries`` retries have failed, when the server asks for a longer wait than
+    ``max_delay``, or when the next attempt would start after the call's ``deadline``.
+
+    One policy can be shared between clients; :attr:`stats` covers all of them.
+
+    :param int max_retries: Retries after the first attempt
+    :param float base_delay: Seconds to wait, at most, before the first retry
+    :param float max_delay: Longest wait between attempts, in seconds
+    :param float deadline: Seconds from the start of a call after which it isn't retried
+        any more, or ``None`` for no limit
+    :param statuses: Status codes to retry
+    :param methods: HTTP methods to retry
+    :param bool retry_errors: Retry requests that fail without a response
+    :param bool jitter: Wait a random fraction of the backoff rather than all of it
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        deadline: Optional[float] = None,
+        statuses: Collection[int] = (429, 500, 502, 503, 504),
+        methods: Collection[str] = ("GET",),
+        retry_errors: bool = True,
+        jitter: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.retry_errors = retry_errors
+        self.jitter = jitter
+        self.clock = clock
+        self.stats = RetryStats()
+        self._lock = Lock()
+
+    def start(self, method: str = "GET") -> "RetryAttempts":
+        """Start a call, and return the :class:`RetryAttempts` that decides when to retry it."""
+        with self._lock:
+            self.stats.calls += 1
+        return RetryAttempts(self, method.upper() in self.methods)
+
+    def backoff(self, retry: int) -> float:
+        """The seconds to wait before retry number ``retry``, counting from 0."""
+        delay = min(self.max_delay, self.base_delay * 2 ** retry)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def retry_after(response: Response, now: Optional[datetime] = None) -> Optional[float]:
+        """The seconds the ``Retry-After`` header asks the client to wait, if it has one."""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+    def _record(self, delay: Optional[float], status: Optional[int] = None, gave_up: bool = False):
+        with self._lock:
+            if gave_up:
+                self.stats.gave_up += 1
+            if delay is None:
+                return
+            self.stats.retries += 1
+            self.stats.total_delay += delay
+            if status is None:
+                self.stats.retried_errors += 1
+            else:
+                self.stats.retries_by_status[status] = self.stats.retries_by_status.get(status, 0) + 1
+
+
+class RetryAttempts:
+    """Decides, after each attempt of one call, whether and how long to wait before retrying it."""
+
+    def __init__(self, policy: RetryPolicy, retryable: bool):
+        self.policy = policy
+        self.retryable = retryable
+        self.retries = 0
+        self.started = policy.clock()
+
+    def next_delay(self, response: Response = None, error: Exception = None) -> Optional[float]:
+        """The seconds to wait before retrying after ``response`` or ``error``, or ``None`` not to retry."""
+        policy = self.policy
+        if error is not None:
+            status = None
+            failed = policy.retry_errors
+        else:
+            status = response.status_code
+            failed = status in policy.statuses
+        if not failed:
+            return None
+        delay = self._get_delay(response)
+        policy._record(delay, status, gave_up=delay is None)
+        if delay is not None:
+            self.retries += 1
+        return delay
+
+    def _get_delay(self, response: Optional[Response]) -> Optional[float]:
+        policy = self.policy
+        if not self.retryable or self.retries >= policy.max_retries:
+            return None
+        retry_after = policy.retry_after(response) if response is not None else None
+        if retry_after is not None and retry_after > policy.max_delay:
+            return None
+        delay = retry_after if retry_after is not None else policy.backoff(self.retries)
+        if policy.deadline is not None and policy.clock() - self.started + delay > policy.deadline:
+            return None
+        return delay
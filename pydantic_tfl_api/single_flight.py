@@ -0,0 +1,80 @@
+import asyncio
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into a single call.
+
+    The first caller for a key runs the function. Callers that arrive with the same key
+    while it is still running wait for it and get the same result (or exception), rather
+    than running the function again. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """Coalesces concurrent coroutine calls that share a key into a single call.
+
+    The asyncio counterpart of :class:`SingleFlight`. The function runs in a task of its
+    own, which every caller waits for, so cancelling one caller doesn't cancel the others.
+    The task is only cancelled once every caller waiting for it has been cancelled.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _AsyncCall] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _AsyncCall(asyncio.ensure_future(fn()))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # every caller has given up
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: "_AsyncCall"):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+class _AsyncCall:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
@@ -0,0 +1,220 @@
+from array import array
+from math import asin, ceil, cos, floor, pi, radians, sin, sqrt
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from .envelope import ResponseEnvelope
+
+EARTH_RADIUS_M = 6_371_008.8
+METRES_PER_DEGREE_LAT = 111_320.0
+
+
+class _Cell:
+    """The points in one grid cell, with their coordinates in radians in arrays for computing distances in bulk."""
+
+    __slots__ = ("keys", "items", "lats", "lons", "cos_lats")
+
+    def __init__(self):
+        self.keys: List[Hashable] = []
+        self.items: List[Any] = []
+        self.lats = array("d")
+        self.lons = array("d")
+        self.cos_lats = array("d")
+
+    def add(self, key: Hashable, item: Any, lat: float, lon: float):
+        self.keys.append(key)
+        self.items.append(item)
+        self.lats.append(radians(lat))
+        self.lons.append(radians(lon))
+        self.cos_lats.append(cos(radians(lat)))
+
+    def remove(self, key: Hashable):
+        i = self.keys.index(key)
+        for column in (self.keys, self.items, self.lats, self.lons, self.cos_lats):
+            del column[i]
+
+    def distances(self, lat_rad: float, lon_rad: float, cos_lat: float) -> List[float]:
+        # haversine distances in metres to every point in the cell
+        return [
+            2 * EARTH_RADIUS_M * asin(sqrt(min(
+                1.0,
+                sin((other_lat - lat_rad) / 2) ** 2 + cos_lat * other_cos_lat * sin((other_lon - lon_rad) / 2) ** 2,
+            )))
+            for other_lat, other_lon, other_cos_lat in zip(self.lats, self.lons, self.cos_lats)
+        ]
+
+
+class StopPointIndex:
+    """Grid index of stop points, or anything else with ``lat`` and ``lon``, for finding nearby stops.
+
+    Points are bucketed into grid cells ``cell_size`` metres from north to south, so a query
+    only measures the distance to the points in the cells that can be within range. Points are
+    identified by ``key``, their ``id`` by default, and adding a point with the same key
+    again replaces it.
+
+    Points can be added in groups, e.g. one per line, so that refreshing one line's stops
+    with :meth:`update` only touches that line's points. A point in several groups stays
+    in the index until it has been removed from all of them.
+
+    :param stop_points: Points to index, e.g. a list of ``StopPoint`` or a ``StopPointsResponse``
+    :param float cell_size: Width of the grid cells in metres
+    :param key: Function returning the key that identifies a point
+    """
+
+    def __init__(
+        self, stop_points: Iterable[Any] = (), cell_size: float = 500.0,
+        key: Callable[[Any], Hashable] = lambda stop_point: stop_point.id,
+    ):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.key = key
+        self._cell_lat = cell_size / METRES_PER_DEGREE_LAT
+        # cells span the same number of degrees of longitude, so they are cell_size wide at
+        # the equator and narrower further north or south, which only means searching a few
+        # more of them
+        self._cell_lon = self._cell_lat
+        self._cells: dict[Tuple[int, int], _Cell] = {}
+        self._locations: dict[Hashable, Tuple[Tuple[int, int], Any]] = {}
+        self._groups: dict[Hashable, set] = {}
+        self._memberships: dict[Hashable, set] = {}
+        self.update(stop_points)
+
+    @staticmethod
+    def _unwrap(stop_points: Any) -> Iterable[Any]:
+        if isinstance(stop_points, ResponseEnvelope):
+            stop_points = stop_points.items
+        if hasattr(stop_points, "stop_points"):
+            # a StopPointsResponse
+            return stop_points.stop_points or []
+        if hasattr(stop_points, "lat") and hasattr(stop_points, "lon"):
+            return [stop_points]
+        return stop_points
+
+    def _cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        return floor(lat / self._cell_lat), floor(lon / self._cell_lon)
+
+    def _add(self, key: Hashable, item: Any):
+        if key in self._locations:
+            self._remove(key)
+        cell_key = self._cell_of(item.lat, item.lon)
+        cell = self._cells.get(cell_key)
+        if cell is None:
+            cell = self._cells[cell_key] = _Cell()
+        cell.add(key, item, item.lat, item.lon)
+        self._locations[key] = (cell_key, item)
+
+    def _remove(self, key: Hashable):
+        cell_key, _ = self._locations.pop(key)
+        cell = self._cells[cell_key]
+        cell.remove(key)
+        if not cell.keys:
+            del self._cells[cell_key]
+
+    def update(self, stop_points: Iterable[Any], group: Hashable = None):
+        """Add or replace ``stop_points``.
+
+        If ``group`` is given, the points replace that group's previous points: any that
+        aren't in ``stop_points`` are removed, unless they also belong to another group.
+        """
+        keys = set()
+        for item in self._unwrap(stop_points):
+            if item.lat is None or item.lon is None:
+                continue
+            key = self.key(item)
+            keys.add(key)
+            self._add(key, item)
+            self._memberships.setdefault(key, set()).add(group)
+        if group is None:
+            return
+        for key in self._groups.get(group, set()) - keys:
+            self._leave_group(key, group)
+        self._groups[group] = keys
+
+    def remove(self, key: Hashable):
+        """Remove the point with ``key`` from the index and every group."""
+        self._remove(key)
+        for group in self._memberships.pop(key, set()):
+            if group is not None:
+                self._groups[group].discard(key)
+
+    def remove_group(self, group: Hashable):
+        """Remove the points of ``group``, except those that also belong to another group."""
+        for key in self._groups.pop(group, set()):
+            self._leave_group(key, group)
+
+    def _leave_group(self, key: Hashable, group: Hashable):
+        memberships = self._memberships.get(key)
+        if memberships is None:
+            return
+        memberships.discard(group)
+        if not memberships:
+            del self._memberships[key]
+            self._remove(key)
+
+    def within(self, lat: float, lon: float, radius: float) -> List[Tuple[float, Any]]:
+        """The points within ``radius`` metres of ``(lat, lon)``, as ``(distance, point)`` pairs, nearest first."""
+        lat_rad, lon_rad = radians(lat), radians(lon)
+        cos_lat = cos(lat_rad)
+        lat_span = radius / METRES_PER_DEGREE_LAT
+        # the cells furthest from the equator are the narrowest, so they set the longitude span
+        max_abs_lat = min(abs(lat) + lat_span, 89.9)
+        lon_span = min(lat_span / cos(radians(max_abs_lat)), 180.0)
+        min_row, min_column = self._cell_of(lat - lat_span, lon - lon_span)
+        max_row, max_column = self._cell_of(lat + lat_span, lon + lon_span)
+
+        found = []
+        if lon_span >= 180.0:
+            # every longitude is in range, including those across the antimeridian
+            cells = [cell for (row, _), cell in self._cells.items() if min_row <= row <= max_row]
+        elif (max_row - min_row + 1) * (max_column - min_column + 1) > len(self._cells):
+            # the search area covers more cells than there are, so check each of those instead
+            cells = [
+                cell for (row, column), cell in self._cells.items()
+                if min_row <= row <= max_row and min_column <= column <= max_column
+            ]
+        else:
+            cells = [
+                cell for cell in (
+                    self._cells.get((row, column))
+                    for row in range(min_row, max_row + 1)
+                    for column in range(min_column, max_column + 1)
+                )
+                if cell is not None
+            ]
+        for cell in cells:
+            for distance, item in zip(cell.distances(lat_rad, lon_rad, cos_lat), cell.items):
+                if distance <= radius:
+                    found.append((distance, item))
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    def nearest(
+        self, lat: float, lon: float, k: int = 1, max_distance: Optional[float] = None
+    ) -> List[Tuple[float, Any]]:
+        """The ``k`` points nearest to ``(lat, lon)``, as ``(distance, point)`` pairs, nearest first.
+
+        If ``max_distance`` is given, points further away than that many metres are left out.
+        """
+        if k < 1 or not self._locations:
+            return []
+        radius = self.cell_size
+        while True:
+            if max_distance is not None and radius >= max_distance:
+                return self.within(lat, lon, max_distance)[:k]
+            found = self.within(lat, lon, radius)
+            if len(found) >= k or radius >= pi * EARTH_RADIUS_M:
+                return found[:k]
+            # each search covers at least the whole of the previous one
+            radius *= ceil(sqrt(k / max(len(found), 1))) + 1
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._locations
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._locations[key][1]
+
+    def __iter__(self) -> Iterator[Any]:
+        return (item for _, item in self._locations.values())
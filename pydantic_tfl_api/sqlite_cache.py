@@ -0,0 +1,198 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+from .cache import CacheEntry, CacheStats
+
+
+class SQLiteResponseCache:
+    """Response cache stored in an SQLite database, which can be shared between processes.
+
+    Unlike :class:`ResponseCache`, this stores the raw response body and headers, so a new
+    process (e.g. a restarted worker) can start from the results that other processes have
+    already fetched rather than going to the network. The database is opened in WAL mode,
+    so any number of processes can read while one writes.
+
+    The most recently used results are also kept deserialized in memory, so repeated hits
+    in the same process don't pay for deserialization again.
+
+    :param str path: Path of the database file. It is created if it doesn't exist
+    :param int maxsize: Maximum number of responses to keep in the database. The oldest
+        responses are removed first
+    :param int memory_maxsize: Maximum number of deserialized results to keep in memory
+    :param float timeout: Seconds to wait for another process to release a lock on the database
+    """
+
+    stores_raw_response = True
+
+    def __init__(self, path: str, maxsize: int = 1024, memory_maxsize: int = 32, timeout: float = 30.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.path = path
+        self.maxsize = maxsize
+        self.memory_maxsize = memory_maxsize
+        self.timeout = timeout
+        self._local = threading.local()
+        self._memory: OrderedDict[str, tuple[float, CacheEntry]] = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+        self._create_table()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, so each thread gets its own
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _create_table(self):
+        self._get_connection().execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                headers TEXT NOT NULL,
+                expires REAL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL
+            )
+            """
+        )
+        self._get_connection().execute(
+            "CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)"
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for ``key``, fresh or not, and count a hit if it is fresh."""
+        connection = self._get_connection()
+        row = connection.execute(
+            "SELECT expires, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            entry = None
+        else:
+            entry = self._get_entry(connection, key, *row)
+        with self._lock:
+            if entry is not None and entry.is_fresh():
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+        return entry
+
+    def _get_entry(
+        self, connection: sqlite3.Connection, key: str, expires: Optional[float],
+        etag: Optional[str], last_modified: Optional[str], stored_at: float
+    ) -> Optional[CacheEntry]:
+        with self._lock:
+            memorised = self._memory.get(key)
+            if memorised is not None and memorised[0] == stored_at:
+                # the same response, possibly revalidated by another process since
+                entry = memorised[1]
+                entry.expires = self._from_timestamp(expires)
+                self._memory.move_to_end(key)
+                return entry
+        row = connection.execute("SELECT content, headers FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(
+            value=None,
+            expires=self._from_timestamp(expires),
+            etag=etag,
+            last_modified=last_modified,
+            content=row[0],
+            headers=json.loads(row[1]),
+        )
+        self._remember(key, stored_at, entry)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        if entry.content is None:
+            raise ValueError("SQLiteResponseCache needs the raw response content")
+        stored_at = time.time()
+        connection = self._get_connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO responses (key, content, headers, expires, etag, last_modified, stored_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                entry.content,
+                json.dumps(entry.headers or {}),
+                self._to_timestamp(entry.expires),
+                entry.etag,
+                entry.last_modified,
+                stored_at,
+            ),
+        )
+        evicted = connection.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        ).rowcount
+        with self._lock:
+            self._stats.evictions += max(evicted, 0)
+        self._remember(key, stored_at, entry)
+
+    def revalidate(self, key: str, expires: Optional[datetime]):
+        """Extend the expiry of the entry for ``key`` after the server confirmed it is unchanged."""
+        updated = self._get_connection().execute(
+            "UPDATE responses SET expires = ? WHERE key = ?", (self._to_timestamp(expires), key)
+        ).rowcount
+        with self._lock:
+            memorised = self._memory.get(key)
+            if memorised is not None:
+                memorised[1].expires = expires
+            if updated:
+                self._stats.revalidations += 1
+
+    def _remember(self, key: str, stored_at: float, entry: CacheEntry):
+        if self.memory_maxsize < 1:
+            return
+        with self._lock:
+            self._memory[key] = (stored_at, entry)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_maxsize:
+                self._memory.popitem(last=False)
+
+    def clear(self):
+        self._get_connection().execute("DELETE FROM responses")
+        with self._lock:
+            self._memory.clear()
+
+    def close(self):
+        """Close this thread's connection to the database."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @property
+    def stats(self) -> CacheStats:
+        """Counts for this process only."""
+        with self._lock:
+            return CacheStats(
+                self._stats.hits, self._stats.misses, self._stats.evictions, self._stats.revalidations
+            )
+
+    def __len__(self) -> int:
+        return self._get_connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self._get_connection().execute(
+            "SELECT 1 FROM responses WHERE key = ?", (key,)
+        ).fetchone() is not None
+
+    @staticmethod
+    def _to_timestamp(value: Optional[datetime]) -> Optional[float]:
+        return value.timestamp() if value is not None else None
+
+    @staticmethod
+    def _from_timestamp(value: Optional[float]) -> Optional[datetime]:
+        return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
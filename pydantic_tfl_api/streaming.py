@@ -0,0 +1,140 @@
+import codecs
+import json
+import re
+from typing import Any, Generator, List, Optional
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NEED_MORE = object()
+# drop the consumed part of the buffer once it gets this long
+_TRIM_THRESHOLD = 64 * 1024
+
+
+class JsonArrayStream:
+    """Incrementally parses the items of a JSON array from a body that arrives in chunks.
+
+    Feed it the body a chunk at a time and it returns each item of the array as soon as it
+    has been received in full, so only the current item and a chunk of unparsed text are
+    held in memory rather than the whole body and every item::
+
+        stream = JsonArrayStream(key="stopPoints")
+        for chunk in response.iter_content(65536):
+            for item in stream.feed(chunk):
+                ...
+        stream.close()
+
+    :param str key: Name of the top-level property holding the array, for bodies that are
+        an object (such as ``StopPointsResponse``). ``None`` if the body is itself an array.
+        The object's other top-level properties are collected in :attr:`metadata`
+    """
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self.metadata: dict[str, Any] = {}
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._done = False
+        self._parser = self._parse()
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Add the next chunk of the body and return the items it completed."""
+        if self._pos > _TRIM_THRESHOLD:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        self._buffer += self._text_decoder.decode(data)
+        return self._run()
+
+    def close(self) -> List[Any]:
+        """Mark the end of the body and return any remaining items.
+
+        :raises ValueError: if the body ended before the array did
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._eof = True
+        items = self._run()
+        if not self._done:
+            raise ValueError("JSON body ended unexpectedly")
+        return items
+
+    def _run(self) -> List[Any]:
+        items = []
+        if self._done:
+            return items
+        for item in self._parser:
+            if item is _NEED_MORE:
+                return items
+            items.append(item)
+        self._done = True
+        return items
+
+    def _parse(self) -> Generator[Any, None, None]:
+        if self.key is None:
+            yield from self._expect("[")
+            yield from self._parse_array()
+            return
+        yield from self._expect("{")
+        while (yield from self._peek()) != "}":
+            name = yield from self._parse_value()
+            yield from self._expect(":")
+            if name == self.key and (yield from self._peek()) == "[":
+                self._pos += 1
+                yield from self._parse_array()
+            else:
+                self.metadata[name] = yield from self._parse_value()
+            if (yield from self._peek()) == ",":
+                self._pos += 1
+        self._pos += 1
+
+    def _parse_array(self) -> Generator[Any, None, None]:
+        if (yield from self._peek()) == "]":
+            self._pos += 1
+            return
+        while True:
+            yield (yield from self._parse_value())
+            separator = yield from self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' at position {self._pos - 1} of JSON chunk")
+
+    def _peek(self) -> Generator[Any, None, str]:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                raise ValueError("JSON body ended unexpectedly")
+            yield _NEED_MORE
+
+    def _expect(self, character: str) -> Generator[Any, None, None]:
+        if (yield from self._peek()) != character:
+            raise ValueError(f"Expected '{character}' at position {self._pos} of JSON chunk")
+        self._pos += 1
+
+    def _parse_value(self) -> Generator[Any, None, Any]:
+        yield from self._peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                yield from self._wait_for_more()
+                continue
+            if end == len(self._buffer) and not self._eof:
+                # a number at the end of the buffer may continue in the next chunk
+                yield from self._wait_for_more()
+                continue
+            self._pos = end
+            return value
+
+    def _wait_for_more(self) -> Generator[Any, None, None]:
+        # wait until the unparsed text has doubled before trying again, so a value that
+        # spans many small chunks isn't re-parsed from the start for every one of them
+        wanted = 2 * (len(self._buffer) - self._pos)
+        yield _NEED_MORE
+        while not self._eof and len(self._buffer) - self._pos < wanted:
+            yield _NEED_MORE
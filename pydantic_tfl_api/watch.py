@@ -0,0 +1,175 @@
+import hashlib
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Generic, Hashable, Iterable, Iterator, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from .envelope import ResponseEnvelope
+
+T = TypeVar("T")
+
+# set on every top-level model each time it's fetched, so they aren't part of its content
+EXPIRY_FIELDS = frozenset({"content_expires", "shared_expires"})
+
+# (field name, JSON name) of the natural id of each model that can be watched
+NATURAL_KEYS: dict[str, tuple[str, str]] = {
+    "Line": ("id", "id"),
+    "Prediction": ("id", "id"),
+    "StopPoint": ("naptan_id", "naptanId"),
+    "Mode": ("mode_name", "modeName"),
+}
+
+# set while a watch fetches a result for a tracker that compares content digests
+_digesting: ContextVar[bool] = ContextVar("digesting", default=False)
+# id of each item fetched while digesting -> (weak reference to it, its content digest);
+# models aren't hashable, so they can't be the keys of a WeakKeyDictionary
+_digests: dict[int, tuple[weakref.ref, bytes]] = {}
+
+
+def natural_key(item: Any) -> Hashable:
+    """The natural id of ``item``, e.g. a ``Line``'s ``id`` or a ``StopPoint``'s ``naptan_id``."""
+    if isinstance(item, dict):
+        # validation="raw" results are keyed by the JSON names
+        for _, alias in NATURAL_KEYS.values():
+            if alias in item:
+                return item[alias]
+    else:
+        names = NATURAL_KEYS.get(type(item).__name__)
+        if names is not None:
+            return getattr(item, names[0])
+    raise ValueError(f"No natural key for {type(item).__name__}, pass a key function to watch")
+
+
+def same_content(old: Any, new: Any) -> bool:
+    """Whether ``old`` and ``new`` hold the same data, ignoring when they were fetched."""
+    if old is new:
+        return True
+    if isinstance(old, BaseModel) and isinstance(new, BaseModel):
+        if type(old) is not type(new):
+            return False
+        old_fields, new_fields = old.__dict__, new.__dict__
+        return all(
+            old_fields[name] == new_fields.get(name) for name in old_fields if name not in EXPIRY_FIELDS
+        )
+    return old == new
+
+
+@contextmanager
+def digesting(enabled: bool = True) -> Iterator[None]:
+    """Record a content digest of each item of the results deserialized inside the ``with`` block.
+
+    Like request metrics, it follows the code into gathered calls and coroutines.
+    """
+    token = _digesting.set(enabled)
+    try:
+        yield
+    finally:
+        _digesting.reset(token)
+
+
+def is_digesting() -> bool:
+    """Whether the results being deserialized should have their items' digests recorded."""
+    return _digesting.get()
+
+
+def record_digests(result: Any):
+    """Record a content digest of each model in ``result``, for :func:`content_digest`.
+
+    The digest is taken over the model's JSON, without its expiry fields, so it only
+    depends on the model's content.
+    """
+    for item in result if isinstance(result, list) else [result]:
+        digest = hashlib.blake2b(item.model_dump_json(exclude=EXPIRY_FIELDS).encode("utf-8"), digest_size=16).digest()
+        key = id(item)
+        _digests[key] = (weakref.ref(item, lambda _, key=key: _digests.pop(key, None)), digest)
+
+
+def content_digest(item: Any) -> Optional[bytes]:
+    """The digest recorded for ``item`` when it was deserialized, or ``None`` if there isn't one."""
+    entry = _digests.get(id(item))
+    if entry is None or entry[0]() is not item:
+        return None
+    return entry[1]
+
+
+@dataclass
+class Delta(Generic[T]):
+    """What changed between two fetches of a watched result, keyed by each item's natural id.
+
+    :param dict added: Items that weren't in the previous result
+    :param dict changed: Items whose content has changed, with their new value
+    :param dict removed: Items that are no longer in the result, with their last value
+    :param error: The ``ApiError`` returned instead of a result, if the fetch failed
+    :param datetime content_expires: When the result stops being fresh, i.e. when it will be fetched again
+    """
+    added: dict[Hashable, T] = field(default_factory=dict)
+    changed: dict[Hashable, T] = field(default_factory=dict)
+    removed: dict[Hashable, T] = field(default_factory=dict)
+    error: Optional[Any] = None
+    content_expires: Optional[datetime] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed or self.error is not None)
+
+
+class DeltaTracker:
+    """Keeps the latest items of a watched result and works out what each new result changes.
+
+    :param key: Function returning the natural id of an item. Defaults to :func:`natural_key`
+    :param same: Function deciding whether two versions of an item hold the same data
+    """
+
+    # whether ``same`` uses content digests, so a watch should record them as it fetches
+    digests = False
+
+    def __init__(
+        self, key: Callable[[Any], Hashable] = None, same: Callable[[Any, Any], bool] = same_content,
+    ):
+        self.key = key or natural_key
+        self.same = same
+        self.items: dict[Hashable, Any] = {}
+
+    def update(self, items: Iterable[Any]) -> Delta:
+        """Replace the tracked items with ``items`` and return what changed."""
+        return self._update(items, Delta())
+
+    def _update(self, items: Iterable[Any], delta: Delta) -> Delta:
+        current = {}
+        for item in items:
+            key = self.key(item)
+            current[key] = item
+            previous = self.items.get(key)
+            if previous is None:
+                delta.added[key] = item
+            elif not self.same(previous, item):
+                delta.changed[key] = item
+        delta.removed = {key: item for key, item in self.items.items() if key not in current}
+        self.items = current
+        return delta
+
+
+def unwrap(result: Any) -> tuple[List[Any], Optional[datetime]]:
+    """The items of a result as a list, and when the result expires."""
+    expires = None
+    if isinstance(result, ResponseEnvelope):
+        expires = result.content_expires or result.shared_expires
+        result = result.items
+    items = result if isinstance(result, list) else [result]
+    if expires is None:
+        for item in items[:1]:
+            expires = getattr(item, "content_expires", None) or getattr(item, "shared_expires", None)
+    return items, expires
+
+
+def next_delay(
+    expires: Optional[datetime], min_interval: float, default_interval: float, now: Optional[datetime] = None,
+) -> float:
+    """Seconds to wait before fetching a result that expires at ``expires`` again."""
+    if expires is None:
+        return default_interval
+    delay = (expires - (now or datetime.now(timezone.utc))).total_seconds()
+    return max(min_interval, delay)
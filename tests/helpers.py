@@ -0,0 +1,125 @@
+import io
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+from requests.models import Response
+
+from pydantic_tfl_api import Client
+from pydantic_tfl_api.config import base_url
+from pydantic_tfl_api.rest_client import RestClient
+
+if TYPE_CHECKING:
+    from pydantic_tfl_api import AsyncClient
+
+RESPONSES_DIR = Path(__file__).parent / "tfl_responses"
+
+MODE_JSON = [{"isTflService": True, "isFarePaying": True, "isScheduledService": True, "modeName": "tube"}]
+
+
+def load_fixture(fixture_name: str) -> dict:
+    """The recorded response ``fixture_name`` from ``tfl_responses``, with its status code, headers and content."""
+    with open(RESPONSES_DIR / f"{fixture_name}.json") as f:
+        return json.load(f)
+
+
+def load_fixture_json(fixture_name: str):
+    """The parsed JSON body of the recorded response ``fixture_name``."""
+    return json.loads(load_fixture(fixture_name)["content"])
+
+
+def prediction_json(**overrides) -> dict:
+    prediction = {
+        "id": "1", "operationType": 1, "vehicleId": "v1", "naptanId": "A", "stationName": "Station A",
+        "lineId": "victoria", "lineName": "Victoria", "bearing": "", "destinationNaptanId": "Z",
+        "destinationName": "Brixton", "timestamp": "2024-07-15T15:40:43.0884097Z", "timeToStation": 60,
+        "currentLocation": "", "towards": "Brixton", "expectedArrival": "2024-07-15T15:41:43Z",
+        "timeToLive": "2024-07-15T15:42:13Z", "modeName": "tube",
+        "timing": {
+            "countdownServerAdjustment": "00:00:00", "source": "2024-07-15T15:40:00Z",
+            "insert": "2024-07-15T15:40:00Z", "read": "2024-07-15T15:40:00Z", "sent": "2024-07-15T15:40:43Z",
+            "received": "0001-01-01T00:00:00Z",
+        },
+    }
+    return {**prediction, **overrides}
+
+
+def create_cacheable_response(content, max_age: int | None = 60) -> Response:
+    response = Response()
+    response.status_code = 200
+    response._content = bytes(json.dumps(content), 'utf-8')
+    response.headers = {
+        "Content-Type": "application/json",
+        "Date": datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT"),
+    }
+    if max_age is not None:
+        response.headers["Cache-Control"] = f"public, must-revalidate, max-age={max_age}, s-maxage={max_age * 2}"
+    return response
+
+
+def create_not_modified_response(max_age: int = 60) -> Response:
+    response = create_cacheable_response(None, max_age)
+    response.status_code = 304
+    response._content = b""
+    return response
+
+
+def create_fixture_response(fixture_name: str) -> Response:
+    """The recorded response ``fixture_name`` as a ``requests`` response."""
+    fixture = load_fixture(fixture_name)
+    response = Response()
+    response.status_code = fixture["status_code"]
+    response.headers = fixture["headers"]
+    response.url = fixture["url"]
+    response._content = fixture["content"].encode("utf-8")
+    return response
+
+
+def create_streaming_response(fixture_name: str) -> Response:
+    """The recorded response ``fixture_name``, with a body that can only be read as a stream."""
+    fixture = load_fixture(fixture_name)
+    response = Response()
+    response.status_code = fixture["status_code"]
+    response.headers = fixture["headers"]
+    response.raw = io.BytesIO(fixture["content"].encode("utf-8"))
+    return response
+
+
+def error_response(status_code: int, retry_after: str = None) -> Response:
+    response = create_cacheable_response("error")
+    response.status_code = status_code
+    response.reason = "Error"
+    response.url = "/uri"
+    response.headers["Content-Type"] = "text/html"
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+def create_client(responses, **kwargs) -> Client:
+    """A ``Client`` whose ``RestClient`` is a mock, available as ``client.client``.
+
+    :param responses: The responses, or exceptions, to return from each request in turn,
+        or a function taking the arguments of ``send_request`` that returns them
+    """
+    rest_client = Mock(spec=RestClient)
+    rest_client.base_url = base_url
+    rest_client.send_request.side_effect = responses
+    return Client(rest_client=rest_client, **kwargs)
+
+
+def create_async_client(responses, **kwargs) -> "AsyncClient":
+    """An ``AsyncClient`` whose ``AsyncRestClient`` is a mock, like :func:`create_client`.
+
+    :param responses: The responses to return from each request in turn, or a coroutine
+        function taking the arguments of ``send_request`` that returns them
+    """
+    # imported here, so only the async tests need the async dependencies
+    from pydantic_tfl_api import AsyncClient, AsyncRestClient
+
+    rest_client = Mock(spec=AsyncRestClient)
+    rest_client.base_url = base_url
+    rest_client.send_request.side_effect = responses
+    return AsyncClient(rest_client=rest_client, **kwargs)
@@ -0,0 +1,214 @@
+import asyncio
+import inspect
+
+import pytest
+
+from pydantic_tfl_api import AsyncClient, AsyncRestClient, Client
+from pydantic_tfl_api.models import ApiError, Mode
+from pydantic_tfl_api.rate_limit import RateLimiter
+from pydantic_tfl_api.retry import RetryPolicy
+
+from .helpers import create_fixture_response, load_fixture
+
+httpx = pytest.importorskip("httpx")
+
+
+def create_client(handler) -> AsyncClient:
+    rest_client = AsyncRestClient()
+    rest_client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncClient(rest_client=rest_client)
+
+
+def fixture_handler(name: str):
+    fixture = load_fixture(name)
+    # the recorded body is already decompressed
+    headers = {k: v for k, v in fixture["headers"].items() if k != "Content-Encoding"}
+
+    def handler(request):
+        return httpx.Response(fixture["status_code"], headers=headers, content=fixture["content"])
+
+    return handler
+
+
+def test_async_client_mirrors_every_client_endpoint():
+    client_methods = {name for name in dir(Client) if name.startswith("get_")}
+    async_client_methods = {name for name in dir(AsyncClient) if name.startswith("get_")}
+
+    assert client_methods
+    assert client_methods <= async_client_methods
+
+
+@pytest.mark.asyncio
+async def test_async_client_deserializes_response():
+    client = create_client(fixture_handler("lineMetaModes_None_None_Mode"))
+
+    call = client.get_line_meta_modes()
+    assert inspect.isawaitable(call)
+    result = await call
+    await client.close()
+
+    sync_client = Client()
+    expected = sync_client._deserialize(
+        "Mode", create_fixture_response("lineMetaModes_None_None_Mode")
+    )
+    assert result == expected
+    assert all(isinstance(item, Mode) for item in result)
+    assert result[0].content_expires is not None
+
+
+@pytest.mark.asyncio
+async def test_async_client_sends_formatted_endpoint_and_params():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url)
+        return httpx.Response(200, json=[], headers={"Date": "Tue, 15 Nov 1994 12:45:26 GMT"})
+
+    async with create_client(handler) as client:
+        await client.get_line_status("victoria", include_details=True)
+
+    assert len(seen) == 1
+    assert seen[0].path == "/Line/victoria/Status"
+    assert seen[0].params["detail"] == "True"
+
+
+@pytest.mark.asyncio
+async def test_async_client_returns_api_error():
+    def handler(request):
+        return httpx.Response(
+            404,
+            text="Not here",
+            headers={"Content-Type": "text/html", "Date": "Tue, 15 Nov 1994 12:45:26 GMT"},
+        )
+
+    async with create_client(handler) as client:
+        result = await client.get_line_status("nonsense")
+
+    assert isinstance(result, ApiError)
+    assert result.http_status_code == 404
+    assert result.http_status == "Not Found"
+    assert "/Line/nonsense/Status?" in result.relative_uri
+
+
+@pytest.mark.asyncio
+async def test_async_client_keeps_requests_in_flight_concurrently():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=[])
+
+    async with create_client(handler) as client:
+        results = await asyncio.gather(*(client.get_line_status(str(i)) for i in range(50)))
+
+    assert results == [[]] * 50
+    assert max_in_flight == 50
+
+
+def test_async_client_rejects_sync_context_manager():
+    client = create_client(fixture_handler("lineMetaModes_None_None_Mode"))
+
+    with pytest.raises(TypeError):
+        with client:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_async_client_coalesces_concurrent_identical_requests():
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[{"id": "victoria"}])
+
+    async with create_client(handler) as client:
+        results = await asyncio.gather(*(client.get_line_status("victoria") for _ in range(50)))
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_async_client_get_line_status_many_batches_ids():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        ids = request.url.path.split("/")[2].split(",")
+        return httpx.Response(200, json=[{"id": id} for id in ids])
+
+    async with create_client(handler) as client:
+        result = await client.get_line_status_many([f"line{i}" for i in range(45)], chunk_size=20)
+
+    assert len(paths) == 3
+    assert set(result) == {f"line{i}" for i in range(45)}
+    assert all(result[line_id].id == line_id for line_id in result)
+
+
+@pytest.mark.asyncio
+async def test_async_client_iter_stop_points_by_line_id():
+    async with create_client(fixture_handler("stopPointsByLineId_victoria_None_StopPoint")) as client:
+        result = [stop_point async for stop_point in client.iter_stop_points_by_line_id("victoria")]
+
+    expected = Client()._deserialize("StopPoint", create_fixture_response("stopPointsByLineId_victoria_None_StopPoint"))
+    assert result == expected
+
+
+@pytest.mark.asyncio
+async def test_async_client_iter_stop_points_yields_api_error():
+    def handler(request):
+        return httpx.Response(404, text="Not here", headers={"Date": "Tue, 15 Nov 1994 12:45:26 GMT"})
+
+    async with create_client(handler) as client:
+        result = [item async for item in client.iter_stop_points_by_mode("nonsense")]
+
+    assert len(result) == 1
+    assert isinstance(result[0], ApiError)
+
+
+@pytest.mark.asyncio
+async def test_async_rest_client_waits_for_rate_limiter():
+    limiter = RateLimiter(rate=1000, burst=5)
+    rest_client = AsyncRestClient(rate_limiter=limiter)
+    transport = httpx.MockTransport(fixture_handler("lineMetaModes_None_None_Mode"))
+    rest_client.session = httpx.AsyncClient(transport=transport)
+
+    await rest_client.send_request("Line/Meta/Modes")
+    async with rest_client.stream_request("StopPoint/Mode/overground"):
+        pass
+    await rest_client.close()
+
+    assert limiter.stats["interactive"].requests == 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_retries_transient_errors():
+    modes = fixture_handler("lineMetaModes_None_None_Mode")
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("reset")
+        if len(calls) == 2:
+            return httpx.Response(503, headers={"Retry-After": "0", "Content-Type": "text/html"}, content=b"busy")
+        return modes(request)
+
+    policy = RetryPolicy(base_delay=0.001)
+    client = create_client(handler)
+    client.retry = policy
+
+    result = await client.get_line_meta_modes()
+    await client.close()
+
+    assert all(isinstance(item, Mode) for item in result)
+    assert len(calls) == 3
+    assert policy.stats.retried_errors == 1
+    assert policy.stats.retries_by_status == {503: 1}
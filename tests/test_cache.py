@@ -0,0 +1,103 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from pydantic_tfl_api.cache import CacheEntry, CacheStats, ResponseCache
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "expires, expected_result",
+    [
+        (NOW + timedelta(hours=1), True),
+        (NOW - timedelta(seconds=1), False),
+        (None, False),
+    ],
+    ids=["future_expiry", "past_expiry", "no_expiry"],
+)
+def test_cache_entry_is_fresh(expires, expected_result):
+    assert CacheEntry("value", expires).is_fresh() == expected_result
+
+
+def test_get_counts_hits_and_misses():
+    cache = ResponseCache()
+    cache.set("fresh", CacheEntry("a", NOW + timedelta(hours=1)))
+    cache.set("stale", CacheEntry("b", NOW - timedelta(hours=1)))
+
+    assert cache.get("fresh").value == "a"
+    # stale entries are still returned, but count as a miss
+    assert cache.get("stale").value == "b"
+    assert cache.get("missing") is None
+
+    assert cache.stats == CacheStats(hits=1, misses=2, evictions=0)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(maxsize=2)
+    expires = NOW + timedelta(hours=1)
+    cache.set("a", CacheEntry(1, expires))
+    cache.set("b", CacheEntry(2, expires))
+    cache.get("a")
+
+    cache.set("c", CacheEntry(3, expires))
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+
+def test_set_replaces_existing_entry_without_eviction():
+    cache = ResponseCache(maxsize=1)
+    cache.set("a", CacheEntry(1, None))
+    cache.set("a", CacheEntry(2, None))
+
+    assert cache.get("a").value == 2
+    assert cache.stats.evictions == 0
+
+
+def test_clear():
+    cache = ResponseCache()
+    cache.set("a", CacheEntry(1, None))
+
+    cache.clear()
+
+    assert len(cache) == 0
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        ResponseCache(maxsize=0)
+
+
+@pytest.mark.parametrize(
+    "etag, last_modified, expected_headers",
+    [
+        ('"abc"', None, {"If-None-Match": '"abc"'}),
+        (None, "Mon, 15 Jul 2024 15:40:43 GMT", {"If-Modified-Since": "Mon, 15 Jul 2024 15:40:43 GMT"}),
+        (
+            '"abc"',
+            "Mon, 15 Jul 2024 15:40:43 GMT",
+            {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 15 Jul 2024 15:40:43 GMT"},
+        ),
+        (None, None, {}),
+    ],
+    ids=["etag", "last_modified", "both", "neither"],
+)
+def test_cache_entry_validator_headers(etag, last_modified, expected_headers):
+    entry = CacheEntry("value", None, etag, last_modified)
+
+    assert entry.get_validator_headers() == expected_headers
+
+
+def test_revalidate_extends_expiry():
+    cache = ResponseCache()
+    cache.set("a", CacheEntry(1, NOW - timedelta(hours=1), etag='"abc"'))
+    new_expiry = NOW + timedelta(hours=1)
+
+    cache.revalidate("a", new_expiry)
+    cache.revalidate("missing", new_expiry)
+
+    assert cache.get("a").expires == new_expiry
+    assert cache.stats.revalidations == 1
@@ -1,4 +1,9 @@
 import pytest
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import json
 from unittest.mock import Mock, patch, MagicMock
 from requests.models import Response
@@ -10,9 +15,16 @@ from email.utils import parsedate_to_datetime
 from pydantic import BaseModel, ValidationError
 from datetime import datetime, timedelta, timezone
 
+from pydantic_tfl_api import models
 from pydantic_tfl_api.client import Client
 from pydantic_tfl_api.rest_client import RestClient
+from pydantic_tfl_api.cache import ResponseCache
+from pydantic_tfl_api.sqlite_cache import SQLiteResponseCache
+from pydantic_tfl_api.envelope import ResponseEnvelope
 from pydantic_tfl_api.models.api_error import ApiError
+from pydantic_tfl_api.models.mode import Mode
+
+from .helpers import MODE_JSON, create_cacheable_response, create_not_modified_response, create_streaming_response
 
 
 # Mock models module
@@ -162,48 +174,80 @@ def test_client_initialization(api_token, expected_client_type, expected_models)
 
 
 @pytest.mark.parametrize(
-    "models_dict, expected_result",
+    "model_name, expected_module",
     [
-        (
-            {"MockModel": MockModel},
-            {"MockModel": MockModel},
-        ),
-        (
-            {"MockModel1": MockModel, "MockModel2": MockModel},
-            {"MockModel1": MockModel, "MockModel2": MockModel},
-        ),
-        (
-            {"NotAModel": object},
-            {},
-        ),
-        (
-            {},
-            {},
-        ),
+        ("Mode", "pydantic_tfl_api.models.mode"),
+        ("StopPoint", "pydantic_tfl_api.models.stop_point"),
+        ("LineStatus", "pydantic_tfl_api.models.line_status"),
     ],
-    ids=["single_model", "multiple_models", "no_pydantic_model", "no_models"],
+    ids=["leaf_model", "stop_point", "model_in_stop_point_cycle"],
 )
-def test_load_models(models_dict, expected_result):
-    # Mock import_module
-    with patch("pydantic_tfl_api.client.import_module") as mock_import_module:
-        mock_module = MagicMock()
-        mock_module.__dict__.update(models_dict)
-        mock_import_module.return_value = mock_module
+def test_load_models(model_name, expected_module):
+    client = Client()
+
+    Model = client._load_models()[model_name]
+
+    assert issubclass(Model, BaseModel)
+    assert Model.__name__ == model_name
+    assert Model.__module__ == expected_module
+    assert getattr(models, model_name) is Model
+
 
-        # Mock pkgutil.iter_modules
-        with patch("pydantic_tfl_api.client.pkgutil.iter_modules") as mock_iter_modules:
-            mock_iter_modules.return_value = [
-                (None, name, None) for name in models_dict.keys()
-            ]
+def test_load_models_only_contains_models():
+    registry = Client()._load_models()
 
-            # Act
-            from pydantic_tfl_api.client import Client
+    assert set(registry) == set(models.__all__)
+    assert len(registry) == len(models.__all__)
+    assert "registry" not in registry
+    with pytest.raises(KeyError):
+        registry["NotAModel"]
 
-            client = Client()
-            result = client._load_models()
 
-            # Assert
-            assert result == expected_result
+def test_models_are_imported_when_first_used():
+    # run in a fresh interpreter, as other tests have already imported every model
+    script = (
+        "import sys\n"
+        "from pydantic_tfl_api import Client\n"
+        "client = Client()\n"
+        "loaded = lambda: sorted(m for m in sys.modules if m.startswith('pydantic_tfl_api.models.'))\n"
+        "print(loaded())\n"
+        "client._get_model('Mode')\n"
+        "print(loaded())\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+    after_client, after_lookup = result.stdout.splitlines()
+    assert after_client == "[]"
+    assert after_lookup == "['pydantic_tfl_api.models.mode']"
+
+
+@pytest.mark.parametrize(
+    "module_name, model_name",
+    [
+        ("stop_point", "StopPoint"),
+        ("line", "Line"),
+        ("disruption", "Disruption"),
+        ("line_status", "LineStatus"),
+        ("affected_route", "AffectedRoute"),
+        ("route_section_naptan_entry_sequence", "RouteSectionNaptanEntrySequence"),
+        ("stop_points_response", "StopPointsResponse"),
+    ],
+)
+def test_models_in_the_stop_point_cycle_are_complete_whichever_module_is_imported_first(module_name, model_name):
+    # run in a fresh interpreter, so the module is the first of the cycle to be imported, then
+    # look its model up through the registry, as the client does
+    script = (
+        "import json\n"
+        f"import pydantic_tfl_api.models.{module_name}\n"
+        "from pydantic_tfl_api.models import registry\n"
+        "def load(name):\n"
+        "    with open(f'tests/tfl_responses/{name}.json') as f:\n"
+        "        return json.loads(json.load(f)['content'])\n"
+        f"registry['{model_name}'].model_json_schema()\n"
+        "registry['StopPoint'].model_validate(load('stopPointsByLineId_victoria_None_StopPoint')[0])\n"
+        "registry['Line'].model_validate(load('lineStatusByMode_tube_None_Line')[0])\n"
+    )
+    subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
 
 
 @pytest.mark.parametrize(
@@ -328,8 +372,7 @@ def test_get_maxage_headers_from_cache_control_header(cache_control_header, expe
 def test_deserialize(model_name, response_content, expected_result):
     # Mock Response
     Response_Object = MagicMock(Response)
-    # json.dumps(response_content)
-    Response_Object.json.return_value = response_content
+    Response_Object.content = bytes(json.dumps(response_content), 'utf-8')
 
     # Act
 
@@ -342,17 +385,39 @@ def test_deserialize(model_name, response_content, expected_result):
     ), patch.object(
         client, "_get_model", return_value=MockModel
     ) as mock_get_model, patch.object(
-        client, "_create_model_instance", return_value=expected_result
-    ) as mock_create_model_instance:
+        client, "_validate_json", return_value=expected_result
+    ) as mock_validate_json, patch.object(
+        client, "_set_expiry"
+    ) as mock_set_expiry:
 
         result = client._deserialize(model_name, Response_Object)
 
     # Assert
     assert result == expected_result
     mock_get_model.assert_called_with(model_name)
-    mock_create_model_instance.assert_called_with(
-        MockModel, Response_Object.json.return_value, return_datetime, return_datetime_2
-    )
+    mock_validate_json.assert_called_with(MockModel, Response_Object.content)
+    mock_set_expiry.assert_called_with(expected_result, return_datetime, return_datetime_2)
+
+
+@pytest.mark.parametrize(
+    "content, expected_result",
+    [
+        (b'{"name": "Alice", "age": 30}', PydanticTestModel(name="Alice", age=30)),
+        (
+            b' \n [{"name": "Alice", "age": 30}, {"name": "Bob", "age": 25}]',
+            [PydanticTestModel(name="Alice", age=30), PydanticTestModel(name="Bob", age=25)],
+        ),
+        (b"[]", []),
+    ],
+    ids=["object", "array_with_leading_whitespace", "empty_array"],
+)
+def test_validate_json(content, expected_result):
+    assert Client._validate_json(PydanticTestModel, content) == expected_result
+
+
+def test_validate_json_raises_validation_error():
+    with pytest.raises(ValidationError):
+        Client._validate_json(PydanticTestModel, b'[{"name": "Alice"}]')
 
 
 @pytest.mark.parametrize(
@@ -546,58 +611,6 @@ def test_get_model(model_name, models_dict, expected_result, exception):
         assert result == expected_result
 
 
-@pytest.mark.parametrize(
-    "Model, response_json, result_expiry, shared_expiry, create_model_mock_return, expected_return",
-    [
-        (
-            MockModel,
-            {"name": "Alice", "age": 30},
-            datetime(2023, 12, 31),
-            datetime(2024, 12, 31),
-            "TestReturn1",
-            "TestReturn1",
-        ),
-        (
-            MockModel,
-            [{"name": "Bob", "age": 30}, {"name": "Charlie", "age": 25}],
-            datetime(2023, 12, 31),
-            datetime(2024, 12, 31),
-            "TestReturn2",
-            ["TestReturn2", "TestReturn2"],
-        ),
-    ],
-    ids=[
-        "single_model",
-        "list_of_models",
-    ],
-)
-def test_create_model_instance(
-    Model, response_json, result_expiry, shared_expiry, create_model_mock_return, expected_return
-):
-    # Mock Client
-    client = Client()
-
-    # Mock _create_model_with_expiry
-    with patch.object(
-        client, "_create_model_with_expiry", return_value=create_model_mock_return
-    ) as mock_create_model_with_expiry:
-
-        # Act
-        result = client._create_model_instance(
-            Model, response_json, result_expiry, shared_expiry)
-
-        # Assert
-        assert result == expected_return
-        if isinstance(response_json, dict):
-            mock_create_model_with_expiry.assert_called_with(
-                Model, response_json, result_expiry, shared_expiry
-            )
-        else:
-            for item in response_json:
-                mock_create_model_with_expiry.assert_any_call(
-                    Model, item, result_expiry, shared_expiry)
-
-
 datetime_object_with_time_and_tz_utc = datetime(
     2023, 12, 31, 1, 2, 3, tzinfo=timezone.utc)
 
@@ -642,3 +655,414 @@ def test_deserialize_error(content_type, response_content, expected_result):
 
     # Assert
     assert result == expected_result
+
+
+def test_client_uses_provided_rest_client():
+    rest_client = RestClient(pool_maxsize=50)
+
+    client = Client(rest_client=rest_client)
+
+    assert client.client is rest_client
+
+
+def test_client_context_manager_closes_rest_client():
+    rest_client = Mock(spec=RestClient)
+
+    with Client(rest_client=rest_client) as client:
+        assert isinstance(client, Client)
+
+    rest_client.close.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "max_age, expected_requests",
+    [
+        (60, 1),
+        (0, 2),
+        (None, 2),
+    ],
+    ids=["fresh_result_served_from_cache", "expired_result_refetched", "no_max_age_not_cached"],
+)
+def test_client_response_cache(max_age, expected_requests):
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.side_effect = lambda *args, **kwargs: create_cacheable_response(MODE_JSON, max_age)
+    client = Client(rest_client=rest_client, cache=ResponseCache())
+
+    first = client.get_line_meta_modes()
+    second = client.get_line_meta_modes()
+
+    assert first == second
+    assert rest_client.send_request.call_count == expected_requests
+    if expected_requests == 1:
+        assert second is first
+
+
+def test_client_response_cache_keys_on_params():
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.side_effect = lambda *args, **kwargs: create_cacheable_response([])
+    client = Client(rest_client=rest_client, cache=ResponseCache())
+
+    client.get_line_status("victoria")
+    client.get_line_status("victoria", include_details=True)
+    client.get_line_status("northern")
+    client.get_line_status("victoria", include_details=True)
+
+    assert rest_client.send_request.call_count == 3
+    assert client.cache.stats.hits == 1
+
+
+def test_client_response_cache_does_not_store_errors():
+    error_response = create_cacheable_response("nope")
+    error_response.status_code = 404
+    error_response.reason = "Not Found"
+    error_response.url = "/uri"
+    error_response.headers["Content-Type"] = "text/html"
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.return_value = error_response
+    client = Client(rest_client=rest_client, cache=ResponseCache())
+
+    assert isinstance(client.get_line_meta_modes(), ApiError)
+    assert len(client.cache) == 0
+
+
+@pytest.mark.parametrize(
+    "validator_headers, expected_request_headers",
+    [
+        ({"ETag": '"v1"'}, {"If-None-Match": '"v1"'}),
+        ({"Last-Modified": "Mon, 15 Jul 2024 15:40:43 GMT"}, {"If-Modified-Since": "Mon, 15 Jul 2024 15:40:43 GMT"}),
+    ],
+    ids=["etag", "last_modified"],
+)
+def test_client_revalidates_expired_cache_entry(validator_headers, expected_request_headers):
+    first_response = create_cacheable_response(MODE_JSON, max_age=0)
+    first_response.headers.update(validator_headers)
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.side_effect = [first_response, create_not_modified_response(max_age=60)]
+    client = Client(rest_client=rest_client, cache=ResponseCache())
+
+    first = client.get_line_meta_modes()
+    with patch.object(client, "_deserialize", wraps=client._deserialize) as mock_deserialize:
+        second = client.get_line_meta_modes()
+
+    assert second is first
+    mock_deserialize.assert_not_called()
+    assert rest_client.send_request.call_args_list[0].kwargs["headers"] == {}
+    assert rest_client.send_request.call_args_list[1].kwargs["headers"] == expected_request_headers
+    assert second[0].content_expires > datetime.now(timezone.utc)
+    assert client.cache.get("Line/Meta/Modes?#Mode").is_fresh()
+    assert client.cache.stats.revalidations == 1
+
+
+def test_client_treats_304_without_cache_entry_as_error():
+    not_modified = create_not_modified_response()
+    not_modified.reason = "Not Modified"
+    not_modified.url = "/uri"
+    del not_modified.headers["Content-Type"]
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.return_value = not_modified
+    client = Client(rest_client=rest_client)
+
+    result = client.get_line_meta_modes()
+
+    assert isinstance(result, ApiError)
+    assert result.http_status_code == 304
+
+
+def test_client_warms_up_from_sqlite_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.side_effect = lambda *args, **kwargs: create_cacheable_response(MODE_JSON)
+    first = Client(rest_client=rest_client, cache=SQLiteResponseCache(path)).get_line_meta_modes()
+
+    # a new process starts with an empty memory but the same database
+    restarted = Client(rest_client=rest_client, cache=SQLiteResponseCache(path))
+    second = restarted.get_line_meta_modes()
+    third = restarted.get_line_meta_modes()
+
+    assert rest_client.send_request.call_count == 1
+    assert second == first
+    assert third is second
+    assert second[0].content_expires == first[0].content_expires
+
+
+@pytest.mark.parametrize("status_code", [200, 304])
+def test_client_deserializes_stale_sqlite_entry_only_if_revalidated(tmp_path, status_code):
+    path = str(tmp_path / "cache.db")
+    first_response = create_cacheable_response(MODE_JSON, max_age=0)
+    first_response.headers["ETag"] = '"v1"'
+    second_response = create_cacheable_response(MODE_JSON) if status_code == 200 else create_not_modified_response()
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.side_effect = [first_response, second_response]
+    Client(rest_client=rest_client, cache=SQLiteResponseCache(path)).get_line_meta_modes()
+
+    restarted = Client(rest_client=rest_client, cache=SQLiteResponseCache(path))
+    with patch.object(restarted, "_deserialize", wraps=restarted._deserialize) as mock_deserialize:
+        result = restarted.get_line_meta_modes()
+
+    # either the new response or, after a 304, the stored one is deserialized
+    assert mock_deserialize.call_count == 1
+    assert isinstance(result[0], Mode)
+
+
+def test_client_envelope_holds_expiry_once():
+    response = create_cacheable_response(MODE_JSON, max_age=60)
+    response.headers["Age"] = "12"
+    response.url = "https://api.tfl.gov.uk/Line/Meta/Modes"
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.return_value = response
+    client = Client(rest_client=rest_client, envelope=True)
+
+    result = client.get_line_meta_modes()
+
+    assert isinstance(result, ResponseEnvelope)
+    assert result.status_code == 200
+    assert result.age == 12
+    assert result.url == "https://api.tfl.gov.uk/Line/Meta/Modes"
+    assert result.date == parsedate_to_datetime(response.headers["Date"])
+    assert result.content_expires == result.date + timedelta(seconds=60)
+    assert result.shared_expires == result.date + timedelta(seconds=120)
+    assert result.is_fresh()
+    assert not result.from_cache
+    assert result.items[0].mode_name == "tube"
+    assert result.items[0].content_expires is None
+
+
+def test_client_envelope_served_from_cache_and_revalidated():
+    rest_client = Mock(spec=RestClient)
+    first_response = create_cacheable_response(MODE_JSON, max_age=0)
+    first_response.headers["ETag"] = '"v1"'
+    rest_client.send_request.side_effect = [first_response, create_not_modified_response(max_age=60)]
+    client = Client(rest_client=rest_client, cache=ResponseCache(), envelope=True)
+
+    first = client.get_line_meta_modes()
+    second = client.get_line_meta_modes()
+    third = client.get_line_meta_modes()
+
+    assert rest_client.send_request.call_count == 2
+    assert not first.from_cache
+    assert second.from_cache and third.from_cache
+    assert second.items is first.items and third.items is first.items
+    assert second.content_expires > datetime.now(timezone.utc)
+
+
+def test_client_envelope_leaves_errors_bare():
+    error_response = create_cacheable_response({
+        "timestampUtc": "Mon, 15 Jul 2024 15:40:43 GMT",
+        "exceptionType": "EntityNotFoundException",
+        "httpStatusCode": 404,
+        "httpStatus": "NotFound",
+        "relativeUri": "/Line/nope/Status",
+        "message": "The following line id is not recognised: nope",
+    })
+    error_response.status_code = 404
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.return_value = error_response
+    client = Client(rest_client=rest_client, envelope=True)
+
+    assert isinstance(client.get_line_status("nope"), ApiError)
+
+
+def test_get_line_status_many_unwraps_envelopes():
+    client = Client(rest_client=create_batch_rest_client(), envelope=True)
+
+    result = client.get_line_status_many(["a", "b", "c"], chunk_size=2)
+
+    assert {line_id: line.id for line_id, line in result.items()} == {"a": "a", "b": "b", "c": "c"}
+
+
+@pytest.mark.parametrize(
+    "validation, expected_type",
+    [
+        ("full", Mode),
+        ("raw", dict),
+    ],
+)
+def test_client_validation_levels(validation, expected_type):
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.return_value = create_cacheable_response(MODE_JSON)
+    client = Client(rest_client=rest_client, validation=validation)
+
+    result = client.get_line_meta_modes()
+
+    assert isinstance(result[0], expected_type)
+    if validation == "raw":
+        assert result == MODE_JSON
+    else:
+        assert result[0].mode_name == "tube" and result[0].is_tfl_service is True
+        assert result[0].content_expires is not None
+
+
+def test_client_rejects_unknown_validation_level():
+    with pytest.raises(ValueError):
+        Client(validation="none")
+
+
+def test_get_line_status_many_with_raw_results():
+    client = Client(rest_client=create_batch_rest_client(), validation="raw")
+
+    result = client.get_line_status_many(["a", "b", "c"], chunk_size=2)
+
+    assert result == {"a": {"id": "a"}, "b": {"id": "b"}, "c": {"id": "c"}}
+
+
+@pytest.mark.parametrize(
+    "coalesce_requests, expected_requests",
+    [
+        (True, 1),
+        (False, 20),
+    ],
+    ids=["coalesced", "not_coalesced"],
+)
+def test_client_coalesces_concurrent_identical_requests(coalesce_requests, expected_requests):
+    barrier = threading.Barrier(20)
+
+    def send_request(*args, **kwargs):
+        time.sleep(0.05)
+        return create_cacheable_response([{"id": "victoria"}])
+
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.side_effect = send_request
+    client = Client(rest_client=rest_client, coalesce_requests=coalesce_requests)
+
+    def call():
+        barrier.wait()
+        return client.get_line_status("victoria")
+
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        results = list(executor.map(lambda _: call(), range(20)))
+
+    assert rest_client.send_request.call_count == expected_requests
+    assert all(result[0].id == "victoria" for result in results)
+
+
+def create_batch_rest_client(error_chunk: int | None = None) -> Mock:
+    # answers Line/{ids}/Status with one Line per requested id
+    calls = []
+
+    def send_request(endpoint, *args, **kwargs):
+        calls.append(endpoint)
+        ids = endpoint.split("/")[1].split(",")
+        if error_chunk is not None and len(calls) - 1 == error_chunk:
+            response = create_cacheable_response("error")
+            response.status_code = 500
+            response.reason = "Internal Server Error"
+            response.url = endpoint
+            response.headers["Content-Type"] = "text/html"
+            return response
+        return create_cacheable_response([{"id": id} for id in ids])
+
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.side_effect = send_request
+    rest_client.calls = calls
+    return rest_client
+
+
+def test_get_line_status_many_batches_ids():
+    rest_client = create_batch_rest_client()
+    client = Client(rest_client=rest_client)
+    line_ids = [f"line{i}" for i in range(45)] + ["line0"]
+
+    result = client.get_line_status_many(line_ids, chunk_size=20)
+
+    assert sorted(rest_client.calls) == sorted([
+        "Line/" + ",".join(f"line{i}" for i in range(0, 20)) + "/Status",
+        "Line/" + ",".join(f"line{i}" for i in range(20, 40)) + "/Status",
+        "Line/" + ",".join(f"line{i}" for i in range(40, 45)) + "/Status",
+    ])
+    assert set(result) == {f"line{i}" for i in range(45)}
+    assert all(result[line_id].id == line_id for line_id in result)
+
+
+def test_get_line_status_many_reports_failed_chunk_against_its_ids():
+    client = Client(rest_client=create_batch_rest_client(error_chunk=0))
+
+    result = client.get_line_status_many(["a", "b", "c"], chunk_size=2, max_workers=1)
+
+    assert isinstance(result["a"], ApiError)
+    assert result["a"] is result["b"]
+    assert result["c"].id == "c"
+
+
+def test_get_line_status_many_with_no_ids():
+    rest_client = Mock(spec=RestClient)
+    client = Client(rest_client=rest_client)
+
+    assert client.get_line_status_many([]) == {}
+    rest_client.send_request.assert_not_called()
+
+
+def test_get_arrivals_by_line_ids_groups_predictions():
+    predictions = [
+        {"lineId": "victoria", "id": 1},
+        {"lineId": "victoria", "id": 2},
+    ]
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.side_effect = lambda *args, **kwargs: create_cacheable_response(predictions)
+    client = Client(rest_client=rest_client)
+
+    with patch.object(client, "_deserialize", side_effect=lambda model, response, transfer=None: [
+        Mock(line_id=p["lineId"], id=p["id"]) for p in response.json()
+    ]):
+        result = client.get_arrivals_by_line_ids(["victoria", "northern"])
+
+    assert [p.id for p in result["victoria"]] == [1, 2]
+    assert result["northern"] == []
+    rest_client.send_request.assert_called_once()
+    assert rest_client.send_request.call_args.args[0] == "Line/victoria,northern/Arrivals"
+
+
+def test_get_stop_points_by_ids_handles_single_result():
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.side_effect = lambda *args, **kwargs: create_cacheable_response({})
+    client = Client(rest_client=rest_client)
+
+    with patch.object(client, "_deserialize", return_value=Mock(naptan_id="940GZZLUVIC")):
+        result = client.get_stop_points_by_ids("940GZZLUVIC")
+
+    assert list(result) == ["940GZZLUVIC"]
+    assert rest_client.send_request.call_args.args[0] == "StopPoint/940GZZLUVIC"
+
+
+def test_iter_stop_points_by_mode_matches_full_deserialization():
+    fixture_name = "stopPointByMode_overground_None_StopPointsResponse"
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.return_value = create_streaming_response(fixture_name)
+    client = Client(rest_client=rest_client)
+    full_result = client._deserialize("StopPointsResponse", create_streaming_response(fixture_name))
+
+    result = list(client.iter_stop_points_by_mode("overground"))
+
+    assert [stop_point.model_dump(exclude={"content_expires", "shared_expires"}) for stop_point in result] == \
+        [stop_point.model_dump(exclude={"content_expires", "shared_expires"}) for stop_point in full_result.stop_points]
+    assert all(stop_point.content_expires == full_result.content_expires for stop_point in result)
+    assert all(stop_point.shared_expires == full_result.shared_expires for stop_point in result)
+    assert rest_client.send_request.call_args.args[0] == "StopPoint/Mode/overground"
+    assert rest_client.send_request.call_args.kwargs["stream"] is True
+
+
+def test_iter_stop_points_by_line_id_matches_full_deserialization():
+    fixture_name = "stopPointsByLineId_victoria_None_StopPoint"
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.return_value = create_streaming_response(fixture_name)
+    client = Client(rest_client=rest_client)
+
+    result = list(client.iter_stop_points_by_line_id("victoria"))
+
+    assert result == client._deserialize("StopPoint", create_streaming_response(fixture_name))
+    assert rest_client.send_request.call_args.args[0] == "Line/victoria/StopPoints"
+
+
+def test_iter_stop_points_yields_api_error():
+    error_response = create_cacheable_response("error")
+    error_response.status_code = 404
+    error_response.reason = "Not Found"
+    error_response.url = "/uri"
+    error_response.headers["Content-Type"] = "text/html"
+    rest_client = Mock(spec=RestClient)
+    rest_client.send_request.return_value = error_response
+    client = Client(rest_client=rest_client)
+
+    result = list(client.iter_stop_points_by_mode("nonsense"))
+
+    assert len(result) == 1
+    assert isinstance(result[0], ApiError)
@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pydantic_tfl_api.cache import ResponseCache
+from pydantic_tfl_api.columnar import MISSING, CodedColumn, PredictionColumns
+from pydantic_tfl_api.models import Prediction
+
+from .helpers import create_cacheable_response, create_client, load_fixture_json, prediction_json
+
+
+@pytest.mark.parametrize(
+    "fixture_name",
+    ["arrivalsByLineId_victoria_None_Prediction", "arrivalsByLineId_1_4_None_Prediction"],
+)
+def test_prediction_columns_match_models(fixture_name):
+    content = load_fixture_json(fixture_name)
+    predictions = [Prediction.model_validate(item) for item in content]
+
+    columns = PredictionColumns.from_json(content)
+
+    assert len(columns) == len(predictions)
+    assert list(columns.time_to_station) == [p.time_to_station for p in predictions]
+    assert list(columns.id) == [p.id for p in predictions]
+    assert list(columns.expected_arrival) == [int(p.expected_arrival.timestamp()) for p in predictions]
+    assert list(columns.naptan_id) == [p.naptan_id for p in predictions]
+    assert list(columns.platform_name) == [p.platform_name for p in predictions]
+    assert columns.row(3)["expected_arrival"] == predictions[3].expected_arrival.replace(microsecond=0)
+    assert columns.row(3)["vehicle_id"] == predictions[3].vehicle_id
+
+
+def test_coded_column_stores_each_value_once():
+    column = CodedColumn.from_values(["b", "a", "b", None, "a"])
+
+    assert list(column.codes) == [0, 1, 0, 2, 1]
+    assert column.values == ["b", "a", None]
+    assert list(column) == ["b", "a", "b", None, "a"]
+    assert column.code_of("a") == 1
+    assert column.code_of("missing") is None
+    assert column.sort_keys() == [1, 0, 1, 2, 0]
+
+
+def test_prediction_columns_filter_and_sort():
+    columns = PredictionColumns.from_json([
+        prediction_json(id="1", naptanId="A", timeToStation=300),
+        prediction_json(id="2", naptanId="B", timeToStation=60, lineId="northern"),
+        prediction_json(id="3", naptanId="A", timeToStation=120),
+        prediction_json(id="4", naptanId="C", timeToStation=30),
+    ])
+
+    assert list(columns.filter(naptan_id="A").id) == [1, 3]
+    assert list(columns.filter(naptan_id=["A", "C"], line_id="victoria").id) == [1, 3, 4]
+    assert list(columns.filter(naptan_id="missing").id) == []
+    assert list(columns.filter(time_to_station=60).id) == [2]
+    assert list(columns.select(t < 200 for t in columns.time_to_station).id) == [2, 3, 4]
+    assert list(columns.sort_by("time_to_station").id) == [4, 2, 3, 1]
+    assert list(columns.sort_by("naptan_id", "time_to_station").id) == [3, 1, 2, 4]
+    assert list(columns.sort_by("naptan_id", reverse=True).naptan_id) == ["C", "B", "A", "A"]
+    with pytest.raises(ValueError):
+        columns.filter(unknown="x")
+
+
+def test_prediction_columns_missing_values():
+    columns = PredictionColumns.from_json([
+        prediction_json(id="1", timeToStation=120),
+        prediction_json(id="2", timeToStation=None, expectedArrival=None, platformName=None),
+        prediction_json(id="3", timeToStation=0),
+    ])
+
+    missing = columns.row(1)
+    assert missing["time_to_station"] is None
+    assert missing["expected_arrival"] is None
+    assert missing["platform_name"] is None
+    assert columns.row(2)["time_to_station"] == 0
+    assert columns.time_to_station[1] == MISSING
+    assert list(columns.sort_by("expected_arrival").id) == [1, 3, 2]
+    assert list(columns.sort_by("time_to_station").id) == [3, 1, 2]
+    assert list(columns.filter(time_to_station=None).id) == [2]
+    assert list(columns.select(t < 300 for t in columns.time_to_station).id) == [1, 3]
+
+
+def test_prediction_columns_times_are_epoch_seconds():
+    columns = PredictionColumns.from_json([prediction_json()])
+
+    assert columns.timestamp[0] == int(datetime(2024, 7, 15, 15, 40, 43, tzinfo=timezone.utc).timestamp())
+    assert columns.row(0)["time_to_live"] == datetime(2024, 7, 15, 15, 42, 13, tzinfo=timezone.utc)
+
+
+def test_client_get_arrival_columns_by_line_id():
+    response = create_cacheable_response([prediction_json()])
+    client = create_client(lambda *args, **kwargs: response, cache=ResponseCache())
+
+    columns = client.get_arrival_columns_by_line_id("victoria")
+    predictions = client.get_arrivals_by_line_id("victoria")
+
+    assert isinstance(columns, PredictionColumns)
+    assert columns.content_expires is not None
+    assert isinstance(predictions[0], Prediction)
+    assert client.get_arrival_columns_by_line_id("victoria") is columns
+    assert client.client.send_request.call_count == 2
+    assert client.client.send_request.call_args.args[0] == "Line/victoria/Arrivals"
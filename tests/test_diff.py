@@ -0,0 +1,164 @@
+import copy
+from unittest.mock import patch
+
+import pytest
+
+from pydantic_tfl_api import LineStatusDiff, StopPointIdentityMap
+from pydantic_tfl_api.diff import LineStatusChanges, SeverityChange
+from pydantic_tfl_api.models import Line, LineStatus
+from pydantic_tfl_api.watch import content_digest, digesting
+
+from .helpers import create_cacheable_response, create_client, load_fixture_json
+
+
+def load_lines() -> list[dict]:
+    return load_fixture_json("lineStatusByMode_tube_None_Line")
+
+
+def disruption_json(description: str) -> dict:
+    return {
+        "category": "RealTime", "type": "lineInfo", "categoryDescription": "RealTime",
+        "description": description, "affectedRoutes": [], "affectedStops": [], "closureText": "minorDelays",
+    }
+
+
+def validate(lines: list[dict]) -> list[Line]:
+    return [Line.model_validate(line) for line in lines]
+
+
+def by_id(lines: list[dict]) -> dict[str, dict]:
+    return {line["id"]: line for line in lines}
+
+
+def by_id_of_models(lines: list[Line]) -> dict[str, Line]:
+    return {line.id: line for line in lines}
+
+
+def test_unchanged_lines():
+    diff = LineStatusDiff()
+    first = diff.update(validate(load_lines()))
+    second = diff.update(validate(load_lines()))
+
+    assert isinstance(first, LineStatusChanges)
+    assert len(first.added) == 11
+    assert not first.severity_changes and not first.new_disruptions
+    assert not second
+
+
+def test_severity_and_disruption_changes():
+    diff = LineStatusDiff()
+    before = load_lines()
+    by_id(before)["victoria"]["lineStatuses"][0]["disruptions"] = [disruption_json("Signal failure")]
+    diff.update(validate(before))
+
+    after = copy.deepcopy(before)
+    lines = by_id(after)
+    lines["central"]["lineStatuses"][0].update(statusSeverity=10, statusSeverityDescription="Good Service")
+    lines["victoria"]["lineStatuses"][0]["disruptions"] = []
+    lines["victoria"]["disruptions"] = [disruption_json("Escalator closed")]
+    lines["jubilee"]["lineStatuses"][0]["reason"] = "Minor delays"
+    lines["district"]["name"] = "District line"
+    after.remove(lines["bakerloo"])
+    changes = diff.update(validate(after))
+
+    assert set(changes.changed) == {"central", "victoria", "jubilee"}
+    assert set(changes.removed) == {"bakerloo"}
+    assert changes.severity_changes == [SeverityChange("central", (9,), (10,), ("Good Service",))]
+    assert [(id, d.description) for id, d in changes.new_disruptions] == [("victoria", "Escalator closed")]
+    assert [(id, d.description) for id, d in changes.cleared_disruptions] == [("victoria", "Signal failure")]
+
+
+def test_disruption_moving_to_the_line_is_not_a_new_disruption():
+    diff = LineStatusDiff()
+    before = load_lines()
+    by_id(before)["victoria"]["lineStatuses"][0]["disruptions"] = [disruption_json("Signal failure")]
+    diff.update(validate(before))
+    after = copy.deepcopy(before)
+    victoria = by_id(after)["victoria"]
+    victoria["disruptions"] = victoria["lineStatuses"][0].pop("disruptions")
+
+    changes = diff.update(validate(after))
+
+    assert set(changes.changed) == {"victoria"}
+    assert not changes.new_disruptions and not changes.cleared_disruptions
+
+
+@patch("pydantic_tfl_api.client.time.sleep")
+def test_watch_with_line_status_diff(mock_sleep):
+    after = load_lines()
+    by_id(after)["piccadilly"]["lineStatuses"][0].update(statusSeverity=10, statusSeverityDescription="Good Service")
+    client = create_client([create_cacheable_response(load_lines()), create_cacheable_response(after)])
+
+    watch = client.watch("get_line_status_by_mode", "tube", tracker=LineStatusDiff())
+    next(watch)
+    changes = next(watch)
+
+    assert changes.severity_changes == [SeverityChange("piccadilly", (3,), (10,), ("Good Service",))]
+    assert changes.content_expires is not None
+
+
+def test_lines_fetched_while_digesting_have_content_digests():
+    client = create_client([create_cacheable_response(load_lines()) for _ in range(2)])
+
+    with digesting():
+        digested = client.get_line_status_by_mode("tube")
+    not_digested = client.get_line_status_by_mode("tube")
+
+    assert all(content_digest(line) is not None for line in digested)
+    assert all(content_digest(line) is None for line in not_digested)
+
+
+def test_content_digests_only_depend_on_content():
+    changed = load_lines()
+    by_id(changed)["central"]["lineStatuses"][0]["statusSeverity"] = 10
+    client = create_client([
+        create_cacheable_response(load_lines()),
+        create_cacheable_response(load_lines(), max_age=None),
+        create_cacheable_response(changed),
+    ])
+
+    with digesting():
+        first = by_id_of_models(client.get_line_status_by_mode("tube"))
+        without_expiry = by_id_of_models(client.get_line_status_by_mode("tube"))
+        changed = by_id_of_models(client.get_line_status_by_mode("tube"))
+
+    assert {id: content_digest(line) for id, line in first.items()} == {
+        id: content_digest(line) for id, line in without_expiry.items()}
+    assert len({content_digest(line) for line in first.values()}) == len(first)
+    assert [id for id in first if content_digest(first[id]) != content_digest(changed[id])] == ["central"]
+
+
+@pytest.mark.parametrize(
+    "client_kwargs", [{"identity_map": StopPointIdentityMap()}, {"validation": "raw"}], ids=["identity_map", "raw"],
+)
+def test_no_content_digests_are_recorded(client_kwargs):
+    client = create_client([create_cacheable_response(load_lines())], **client_kwargs)
+
+    with digesting():
+        lines = client.get_line_status_by_mode("tube")
+
+    assert all(content_digest(line) is None for line in lines)
+
+
+def test_lines_with_the_same_digest_are_not_compared():
+    lines = load_lines()
+    client = create_client([create_cacheable_response(lines), create_cacheable_response(lines)])
+    diff = LineStatusDiff()
+    with digesting():
+        diff.update(client.get_line_status_by_mode("tube"))
+        after = client.get_line_status_by_mode("tube")
+
+    with patch.object(LineStatus, "__eq__", side_effect=AssertionError("compared")):
+        changes = diff.update(after)
+
+    assert not changes
+
+
+@patch("pydantic_tfl_api.client.time.sleep")
+def test_watch_records_digests_for_line_status_diff(mock_sleep):
+    client = create_client([create_cacheable_response(load_lines())])
+    diff = LineStatusDiff()
+
+    next(client.watch("get_line_status_by_mode", "tube", tracker=diff))
+
+    assert all(content_digest(line) is not None for line in diff.items.values())
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from pydantic_tfl_api.models import ApiError, Line, Mode
+
+from .helpers import MODE_JSON, create_async_client, create_cacheable_response, create_client
+
+DELAY = 0.05
+
+
+def respond(location: str):
+    if location.startswith("Line/Meta/Modes"):
+        return create_cacheable_response(MODE_JSON)
+    if "broken" in location:
+        raise requests.ConnectionError("reset")
+    line_id = location.split("/")[1]
+    return create_cacheable_response([{"id": line_id, "name": line_id, "modeName": "tube"}])
+
+
+def send_request(location, params=None, headers=None, stream=False):
+    time.sleep(1 if "slow" in location else DELAY)
+    return respond(location)
+
+
+async def send_request_async(location, params=None, headers=None, stream=False):
+    await asyncio.sleep(1 if "slow" in location else DELAY)
+    return respond(location)
+
+
+def test_results_are_in_order():
+    client = create_client(send_request)
+    line_ids = [f"line{i}" for i in range(8)]
+
+    start = time.monotonic()
+    results = client.gather(
+        [("get_line_status", line_id) for line_id in line_ids] + ["get_line_meta_modes", (client.get_line_meta_modes,)],
+        max_workers=10,
+    )
+
+    assert [result[0].id for result in results[:8]] == line_ids
+    assert isinstance(results[8][0], Mode) and isinstance(results[9][0], Mode)
+    # the calls overlapped rather than taking 10 * DELAY
+    assert time.monotonic() - start < 5 * DELAY
+
+
+def test_exceptions_become_errors():
+    results = create_client(send_request).gather([("get_line_status", "broken"), ("get_line_status", "victoria")])
+
+    assert isinstance(results[0], ApiError)
+    assert results[0].exception_type == "ConnectionError"
+    assert results[0].relative_uri == "get_line_status('broken',)"
+    assert isinstance(results[1][0], Line)
+
+
+def test_timeout():
+    client = create_client(send_request)
+    start = time.monotonic()
+    results = client.gather([("get_line_status", "slow"), ("get_line_status", "victoria")], timeout=0.2)
+
+    assert time.monotonic() - start < 0.8
+    assert isinstance(results[0], ApiError) and results[0].exception_type == "TimeoutError"
+    assert isinstance(results[1][0], Line)
+
+
+def test_unknown_method():
+    with pytest.raises(AttributeError):
+        create_client(send_request).gather([("get_nothing", "victoria")])
+
+
+def test_empty():
+    assert create_client(send_request).gather([]) == []
+
+
+def test_async_gather():
+    client = create_async_client(send_request_async)
+    calls = [("get_line_status", "victoria"), ("get_line_status", "broken"), ("get_line_status", "slow"),
+             ("get_line_meta_modes",)]
+
+    start = time.monotonic()
+    results = asyncio.run(client.gather(calls, max_workers=2, timeout=0.3))
+
+    assert time.monotonic() - start < 0.8
+    assert results[0][0].id == "victoria"
+    assert [result.exception_type for result in results[1:3]] == ["ConnectionError", "TimeoutError"]
+    assert isinstance(results[3][0], Mode)
+
+
+def test_async_gather_returns_cancelled_calls_as_errors():
+    client = create_async_client(send_request_async)
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    results = asyncio.run(client.gather([(cancelled,), ("get_line_status", "victoria")]))
+
+    assert isinstance(results[0], ApiError) and results[0].exception_type == "CancelledError"
+    assert results[1][0].id == "victoria"
+
+
+def test_async_gather_timing_out_leaves_coalesced_calls_alone():
+    client = create_async_client(send_request_async)
+
+    async def main():
+        return await asyncio.gather(
+            client.gather(["get_line_meta_modes"], timeout=0.01), client.gather(["get_line_meta_modes"]),
+        )
+
+    timed_out, finished = asyncio.run(main())
+
+    assert timed_out[0].exception_type == "TimeoutError"
+    assert isinstance(finished[0][0], Mode)
@@ -0,0 +1,139 @@
+import gc
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pydantic_tfl_api.identity_map import StopPointIdentityMap
+from pydantic_tfl_api.models import Disruption, StopPoint
+
+from .helpers import create_cacheable_response, create_client, create_streaming_response, load_fixture_json
+
+
+def disruption_json(affected_stops: list) -> dict:
+    return {
+        "category": "RealTime", "type": "routeInfo", "categoryDescription": "RealTime",
+        "description": "Minor delays", "affectedRoutes": [], "affectedStops": affected_stops, "closureText": "",
+    }
+
+
+@pytest.fixture(scope="module")
+def victoria_stops():
+    return load_fixture_json("stopPointsByLineId_victoria_None_StopPoint")
+
+
+def test_stop_points_are_shared_within_a_response(victoria_stops):
+    content = [disruption_json(victoria_stops[:3]), disruption_json(victoria_stops[2:5])]
+    client = create_client([create_cacheable_response(content)], identity_map=StopPointIdentityMap())
+
+    disruptions = client.get_line_disruptions_by_line_id("victoria")
+
+    assert disruptions[0].affected_stops[2] is disruptions[1].affected_stops[0]
+    expiry_fields = {"content_expires", "shared_expires"}
+    assert [d.model_dump(exclude=expiry_fields) for d in disruptions] == \
+        [Disruption.model_validate(d).model_dump(exclude=expiry_fields) for d in content]
+
+
+def test_stop_points_are_shared_across_responses(victoria_stops):
+    identity_map = StopPointIdentityMap()
+    client = create_client([
+        create_cacheable_response(victoria_stops),
+        create_cacheable_response([disruption_json(victoria_stops[3:4])]),
+    ], identity_map=identity_map)
+
+    stop_points = client.get_stop_points_by_line_id("victoria")
+    disruptions = client.get_line_disruptions_by_line_id("victoria")
+
+    assert disruptions[0].affected_stops[0] is stop_points[3]
+    assert all(identity_map.get(stop_point.naptan_id) is stop_point for stop_point in stop_points)
+
+
+def test_expired_stop_points_are_replaced(victoria_stops):
+    identity_map = StopPointIdentityMap()
+    client = create_client([
+        create_cacheable_response(victoria_stops[:2], max_age=None),
+        create_cacheable_response(victoria_stops[:2], max_age=0),
+        create_cacheable_response(victoria_stops[:2]),
+    ], identity_map=identity_map)
+
+    without_max_age = client.get_stop_points_by_line_id("victoria")
+    stale = client.get_stop_points_by_line_id("victoria")
+    fresh = client.get_stop_points_by_line_id("victoria")
+
+    assert stale[0] is not without_max_age[0]
+    assert fresh[0] is not stale[0]
+    assert identity_map.get(fresh[0].naptan_id) is fresh[0]
+
+
+def test_identity_map_only_keeps_stop_points_in_use(victoria_stops):
+    identity_map = StopPointIdentityMap()
+    client = create_client([create_cacheable_response(victoria_stops)], identity_map=identity_map)
+
+    stop_points = client.get_stop_points_by_line_id("victoria")
+    assert len(identity_map) > 0
+
+    del stop_points
+    gc.collect()
+    assert len(identity_map) == 0
+    assert victoria_stops[0]["naptanId"] not in identity_map
+
+
+def test_nested_children_match_plain_validation():
+    fixture_name = "stopPointByMode_overground_None_StopPointsResponse"
+    client = create_client([], identity_map=StopPointIdentityMap())
+
+    result = client._deserialize("StopPointsResponse", create_streaming_response(fixture_name))
+    plain_result = create_client([])._deserialize(
+        "StopPointsResponse", create_streaming_response(fixture_name))
+
+    assert result.model_dump() == plain_result.model_dump()
+
+
+def test_streamed_stop_points_are_shared(victoria_stops):
+    identity_map = StopPointIdentityMap()
+    client = create_client([
+        create_cacheable_response(victoria_stops),
+        create_streaming_response("stopPointsByLineId_victoria_None_StopPoint"),
+    ], identity_map=identity_map)
+
+    stop_points = client.get_stop_points_by_line_id("victoria")
+    streamed = list(client.iter_stop_points_by_line_id("victoria"))
+
+    assert all(isinstance(stop_point, StopPoint) for stop_point in streamed)
+    assert all(a is b for a, b in zip(streamed, stop_points))
+
+
+def test_identity_map_can_be_shared_between_threads():
+    identity_map = StopPointIdentityMap()
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    errors = []
+    stop = threading.Event()
+
+    def write():
+        for _ in range(20000):
+            # the previous stop point is dropped, so readers see it disappear and come back
+            stop_point = StopPoint.model_construct(naptan_id="x")
+            identity_map.add(stop_point, expires)
+        stop.set()
+
+    def read():
+        try:
+            while not stop.is_set():
+                identity_map.get("x")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+    switch_interval = sys.getswitchinterval()
+    # switch threads as often as possible, to interleave the reads and writes
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
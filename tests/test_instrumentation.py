@@ -0,0 +1,254 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from pydantic_tfl_api import AsyncClient, AsyncRestClient, Client, RateLimiter, ResponseCache, RetryPolicy
+from pydantic_tfl_api.config import base_url, endpoints
+from pydantic_tfl_api.instrumentation import RequestMetrics, current_metrics, measure
+from pydantic_tfl_api.models import ApiError, Mode
+from pydantic_tfl_api.rest_client import RestClient
+
+from .helpers import MODE_JSON, create_cacheable_response, create_not_modified_response
+from .helpers import create_client as create_mock_client
+
+httpx = pytest.importorskip("httpx")
+
+
+def create_client(*responses, **kwargs) -> tuple[Client, list[RequestMetrics]]:
+    calls = []
+    return create_mock_client(responses, on_request=calls.append, **kwargs), calls
+
+
+class ModesHandler(BaseHTTPRequestHandler):
+    # keep connections open, so the second request reuses the first one's
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps(MODE_JSON).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ModesHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize(
+    "validation, expect_parse",
+    [
+        ("full", False),
+        ("raw", True),
+    ],
+)
+def test_reports_response_and_deserialization(validation, expect_parse):
+    response = create_cacheable_response(MODE_JSON)
+    client, calls = create_client(response, validation=validation)
+
+    client.get_line_meta_modes()
+
+    [metrics] = calls
+    assert metrics.endpoint == endpoints["lineMetaModes"]["uri"]
+    assert metrics.model_name == "Mode"
+    assert metrics.url == f"{base_url}Line/Meta/Modes?"
+    assert metrics.status == 200
+    assert metrics.bytes_received == len(response.content)
+    assert metrics.attempts == 1
+    assert metrics.cache is None
+    assert not metrics.coalesced
+    assert (metrics.parse is not None) == expect_parse
+    assert metrics.validate >= 0
+    assert metrics.total >= (metrics.parse or 0) + metrics.validate
+    # the mocked transport doesn't time the network
+    assert metrics.connect is None and metrics.ttfb is None and metrics.download is None
+    assert metrics.error is None
+
+
+def test_reports_formatted_url_with_params():
+    response = create_cacheable_response([{"id": "victoria", "name": "Victoria", "modeName": "tube"}])
+    client, calls = create_client(response)
+
+    client.get_line_status("victoria", include_details=True)
+
+    assert calls[0].endpoint == endpoints["lineStatus"]["uri"]
+    assert calls[0].url == f"{base_url}Line/victoria/Status?detail=True"
+
+
+def test_reports_cache_outcomes():
+    first_response = create_cacheable_response(MODE_JSON, max_age=0)
+    first_response.headers["ETag"] = '"v1"'
+    client, calls = create_client(first_response, create_not_modified_response(max_age=60), cache=ResponseCache())
+
+    for _ in range(3):
+        client.get_line_meta_modes()
+
+    assert [metrics.cache for metrics in calls] == ["miss", "revalidated", "hit"]
+    assert [metrics.status for metrics in calls] == [200, 304, None]
+    assert [metrics.attempts for metrics in calls] == [1, 1, 0]
+    assert calls[2].validate is None and not calls[2].coalesced
+
+
+def test_reports_retries():
+    busy = create_cacheable_response(None)
+    busy.status_code = 503
+    busy.headers["Retry-After"] = "0"
+    busy._content = b"busy"
+    response = create_cacheable_response(MODE_JSON)
+    client, calls = create_client(
+        requests.ConnectionError("reset"), busy, response, retry=RetryPolicy(base_delay=0.001),
+    )
+
+    assert isinstance(client.get_line_meta_modes()[0], Mode)
+
+    [metrics] = calls
+    assert metrics.attempts == 3
+    assert metrics.status == 200
+    assert metrics.bytes_received == len(b"busy") + len(response.content)
+    assert metrics.backoff > 0
+
+
+def test_reports_errors_and_reraises():
+    error = requests.ConnectionError("reset")
+    client, calls = create_client(error)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get_line_meta_modes()
+
+    assert calls[0].error is error
+    assert calls[0].status is None
+    assert calls[0].total is not None
+
+
+def test_reports_api_errors_as_results():
+    response = create_cacheable_response({
+        "timestampUtc": "Mon, 15 Jul 2024 15:40:43 GMT",
+        "exceptionType": "EntityNotFoundException",
+        "httpStatusCode": 404,
+        "httpStatus": "NotFound",
+        "relativeUri": "/Line/nope/Status",
+        "message": "The following line id is not recognised: nope",
+    })
+    response.status_code = 404
+    client, calls = create_client(response)
+
+    assert isinstance(client.get_line_status("nope"), ApiError)
+
+    assert calls[0].status == 404
+    assert calls[0].error is None
+
+
+def test_reports_coalesced_calls():
+    def send_request(location, params=None, headers=None, stream=False):
+        time.sleep(0.1)
+        return create_cacheable_response(MODE_JSON)
+
+    client, calls = create_client()
+    client.client.send_request.side_effect = send_request
+    threads = [threading.Thread(target=client.get_line_meta_modes) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client.client.send_request.call_count == 1
+    assert sorted(metrics.coalesced for metrics in calls) == [False, True]
+    assert sorted(metrics.attempts for metrics in calls) == [0, 1]
+
+
+def test_metrics_are_only_recorded_with_on_request():
+    seen = []
+
+    def send_request(location, params=None, headers=None, stream=False):
+        seen.append(current_metrics())
+        return create_cacheable_response(MODE_JSON)
+
+    client, _ = create_client()
+    client.on_request = None
+    client.client.send_request.side_effect = send_request
+
+    client.get_line_meta_modes()
+
+    assert seen == [None]
+
+
+def test_rest_client_times_connection_and_transfer(server_url):
+    limiter = RateLimiter(rate=1000, burst=1)
+    rest_client = RestClient(base_url=server_url, rate_limiter=limiter)
+    calls = []
+    client = Client(rest_client=rest_client, on_request=calls.append)
+
+    with client:
+        client.get_line_meta_modes()
+        client.get_line_meta_modes()
+
+    first, second = calls
+    assert first.url == f"{server_url}Line/Meta/Modes?"
+    assert first.status == 200
+    assert first.connect > 0
+    # the second request reuses the pooled connection
+    assert second.connect == 0.0
+    for metrics in calls:
+        assert metrics.queue is not None
+        assert metrics.ttfb > 0 and metrics.download >= 0
+        assert metrics.total >= metrics.queue + metrics.connect + metrics.ttfb + metrics.download + metrics.validate
+
+
+def test_rest_client_streamed_requests_have_no_download_time(server_url):
+    with RestClient(base_url=server_url) as rest_client:
+        with measure(RequestMetrics("Line/Meta/Modes", "Mode", "")) as metrics:
+            rest_client.send_request("Line/Meta/Modes", stream=True).close()
+
+    assert metrics.ttfb > 0
+    assert metrics.download is None
+
+
+@pytest.mark.asyncio
+async def test_async_client_reports_timings(server_url):
+    calls = []
+    client = AsyncClient(rest_client=AsyncRestClient(base_url=server_url), on_request=calls.append)
+
+    async with client:
+        await client.get_line_meta_modes()
+        await client.get_line_meta_modes()
+
+    first, second = calls
+    assert first.url == f"{server_url}Line/Meta/Modes?"
+    assert first.status == 200
+    assert first.bytes_received == len(json.dumps(MODE_JSON))
+    assert first.connect > 0
+    assert second.connect == 0.0
+    for metrics in calls:
+        assert metrics.ttfb > 0 and metrics.download >= 0 and metrics.validate >= 0
+
+
+@pytest.mark.asyncio
+async def test_async_client_reports_coalesced_calls():
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, headers={"Content-Type": "application/json"}, json=MODE_JSON)
+
+    rest_client = AsyncRestClient()
+    rest_client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    calls = []
+    client = AsyncClient(rest_client=rest_client, on_request=calls.append)
+
+    await asyncio.gather(client.get_line_meta_modes(), client.get_line_meta_modes())
+    await client.close()
+
+    assert sorted(metrics.coalesced for metrics in calls) == [False, True]
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pydantic_tfl_api.interning import Interner
+from pydantic_tfl_api.models import AdditionalProperties, LineGroup, StopPoint, StopPointsResponse
+
+from .helpers import create_client, create_streaming_response, load_fixture
+
+OVERGROUND = "stopPointByMode_overground_None_StopPointsResponse"
+
+
+def walk(stop_points):
+    for stop_point in stop_points:
+        yield stop_point
+        yield from walk(stop_point.children or [])
+
+
+@pytest.fixture(scope="module")
+def overground():
+    content = load_fixture(OVERGROUND)["content"]
+    return StopPointsResponse.model_validate_json(content), content
+
+
+def test_interned_result_is_unchanged(overground):
+    response, content = overground
+
+    interned = Interner().intern(StopPointsResponse.model_validate_json(content))
+
+    assert interned.model_dump() == response.model_dump()
+
+
+def test_repeated_values_are_shared(overground):
+    _, content = overground
+    response = Interner().intern(StopPointsResponse.model_validate_json(content))
+    stop_points = list(walk(response.stop_points))
+
+    lines = {}
+    for line in (line for stop_point in stop_points for line in stop_point.lines):
+        lines.setdefault(line.id, set()).add(id(line))
+    categories = [p.category for stop_point in stop_points for p in stop_point.additional_properties]
+
+    assert all(len(ids) == 1 for ids in lines.values())
+    assert len({id(category) for category in categories}) == len(set(categories))
+
+
+@pytest.mark.parametrize(
+    "first, second, shared",
+    [
+        (
+            LineGroup(naptanIdReference="A", lineIdentifier=["x"]),
+            LineGroup(naptanIdReference="A", lineIdentifier=["x"]),
+            True,
+        ),
+        (
+            LineGroup(naptanIdReference="A", lineIdentifier=["x"]),
+            LineGroup(naptanIdReference="A", lineIdentifier=["y"]),
+            False,
+        ),
+        (LineGroup(naptanIdReference="A"), LineGroup(naptanIdReference="A", lineIdentifier=[]), False),
+        (
+            AdditionalProperties(key="k", modified=datetime(2024, 1, 1, tzinfo=timezone.utc)),
+            AdditionalProperties(key="k", modified=datetime(2024, 1, 1, 1, tzinfo=timezone(timedelta(hours=1)))),
+            False,
+        ),
+    ],
+    ids=["identical", "different_list", "different_fields_set", "same_instant_different_zone"],
+)
+def test_only_identical_models_are_shared(first, second, shared):
+    result = Interner().intern([{"groups": [first]}, {"groups": [second]}])
+
+    assert (result[0]["groups"][0] is result[1]["groups"][0]) == shared
+
+
+def test_top_level_results_are_not_replaced():
+    results = [LineGroup(naptanIdReference="A"), LineGroup(naptanIdReference="A")]
+
+    interned = Interner().intern(list(results))
+
+    assert interned[0] is results[0] and interned[1] is results[1]
+
+
+def test_interner_shared_across_responses():
+    interner = Interner()
+    first = interner.intern([{"modes": ["".join(["b", "us"])]}])
+    second = interner.intern([{"modes": ["".join(["b", "us"])]}])
+
+    assert first[0]["modes"][0] is second[0]["modes"][0]
+    assert len(interner) == 1
+    interner.clear()
+    assert len(interner) == 0
+
+
+@pytest.mark.parametrize("intern", [True, Interner()], ids=["per_response", "shared"])
+@pytest.mark.parametrize("validation", ["full", "raw"])
+def test_client_interns_results(intern, validation):
+    client = create_client([], intern=intern, validation=validation)
+    plain_client = create_client([], validation=validation)
+
+    result = client._deserialize("StopPointsResponse", create_streaming_response(OVERGROUND))
+    plain_result = plain_client._deserialize("StopPointsResponse", create_streaming_response(OVERGROUND))
+
+    if validation == "raw":
+        lines = [line for stop_point in result["stopPoints"] for line in stop_point["lines"]]
+        assert result == plain_result
+        assert len({id(line["id"]) for line in lines}) == len({line["id"] for line in lines})
+    else:
+        lines = [line for stop_point in result.stop_points for line in stop_point.lines]
+        assert result.model_dump() == plain_result.model_dump()
+        assert len({id(line) for line in lines}) == len({line.id for line in lines})
+        assert result.content_expires == plain_result.content_expires
+
+
+def test_client_interns_streamed_results():
+    client = create_client([create_streaming_response(OVERGROUND)], intern=True)
+
+    stop_points = list(client.iter_stop_points_by_mode("overground"))
+    lines = [line for stop_point in stop_points for line in stop_point.lines]
+
+    assert all(isinstance(stop_point, StopPoint) for stop_point in stop_points)
+    assert len({id(line) for line in lines}) == len({line.id for line in lines})
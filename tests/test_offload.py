@@ -0,0 +1,153 @@
+import asyncio
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from pydantic_tfl_api import Client, StopPointIdentityMap
+from pydantic_tfl_api.columnar import PredictionColumns
+from pydantic_tfl_api.models import ApiError, Mode, StopPoint, StopPointsResponse
+from pydantic_tfl_api.offload import CHUNK_SIZE, deserialize_in_worker, pack, unpack
+from pydantic_tfl_api.sqlite_cache import SQLiteResponseCache
+
+from .helpers import (
+    MODE_JSON,
+    create_async_client,
+    create_cacheable_response,
+    create_client,
+    create_fixture_response,
+    create_not_modified_response,
+    error_response,
+    prediction_json,
+)
+
+STOP_POINTS = "stopPointByMode_overground_None_StopPointsResponse"
+
+
+def stop_points_response():
+    return create_fixture_response(STOP_POINTS)
+
+
+@pytest.mark.parametrize(
+    "model_name, content",
+    [
+        ("StopPointsResponse", stop_points_response().content),
+        ("Mode", create_cacheable_response(MODE_JSON * (CHUNK_SIZE * 2 + 1)).content),
+        ("Mode", create_cacheable_response(MODE_JSON).content),
+        ("PredictionColumns", create_cacheable_response([prediction_json(id=str(i)) for i in range(5)]).content),
+    ],
+    ids=["model_with_long_list", "long_list", "short_list", "columns"],
+)
+def test_pack_and_unpack(model_name, content):
+    expected = Client()._load_result(model_name, content)
+
+    transfer = deserialize_in_worker(model_name, content, "full")
+    result = unpack(transfer)
+
+    if isinstance(expected, PredictionColumns):
+        assert result.id == expected.id and len(result) == len(expected)
+    else:
+        assert result == expected
+
+
+def test_long_lists_are_chunked():
+    result = Client()._load_result("StopPointsResponse", stop_points_response().content)
+
+    transfer = pack(result)
+
+    assert len(transfer.fields["stop_points"]) == -(-len(result.stop_points) // CHUNK_SIZE)
+    # the original result keeps its stop points
+    assert len(result.stop_points) == 536
+
+
+def test_large_responses_are_deserialized_in_a_worker_process():
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        client = create_client(
+            [stop_points_response()], deserialize_executor=executor, offload_threshold=1024,
+            offload_models={"StopPointsResponse"},
+        )
+        result = client.get_stop_points_by_mode("overground")
+
+    assert isinstance(result, StopPointsResponse)
+    assert isinstance(result.stop_points[0], StopPoint)
+    assert result.content_expires is not None
+    assert result == create_client([stop_points_response()]).get_stop_points_by_mode("overground")
+
+
+@pytest.mark.parametrize(
+    "response, kwargs",
+    [
+        (create_cacheable_response({"stopPoints": [], "pageSize": 0, "total": 0, "page": 1}), {}),
+        (stop_points_response(), {"offload_threshold": 10 * 1024 * 1024}),
+        (stop_points_response(), {"validation": "raw"}),
+        (stop_points_response(), {"identity_map": StopPointIdentityMap()}),
+        (error_response(503), {}),
+        (stop_points_response(), {"offload_models": None}),
+    ],
+    ids=["small", "below_threshold", "raw", "identity_map", "error", "model_not_offloaded_by_default"],
+)
+def test_stays_in_process(response, kwargs):
+    executor = Mock(spec=Executor)
+    kwargs = {"offload_threshold": 1024, "offload_models": {"StopPointsResponse"}, **kwargs}
+    client = create_client([response], deserialize_executor=executor, **kwargs)
+
+    result = client.get_stop_points_by_mode("overground")
+
+    executor.submit.assert_not_called()
+    assert isinstance(result, (StopPointsResponse, dict, ApiError))
+
+
+def test_async_client_awaits_the_worker():
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            client = create_async_client(
+                [create_cacheable_response(MODE_JSON * 50)], deserialize_executor=executor, offload_threshold=1024,
+                offload_models={"Mode"},
+            )
+            return await client.get_line_meta_modes()
+
+    result = asyncio.run(main())
+
+    assert len(result) == 50
+    assert isinstance(result[0], Mode)
+
+
+class UnfinishedFuture(Future):
+    """A future that is completed later by the event loop, so waiting for it blocks forever."""
+
+    def result(self, timeout=None):
+        assert self.done(), "waited for the worker on the event loop"
+        return super().result(timeout)
+
+
+class EventLoopExecutor(Executor):
+    """Runs each call straight away, but only completes its future on a later turn of the event loop."""
+
+    def submit(self, fn, *args):
+        future = UnfinishedFuture()
+        asyncio.get_running_loop().call_soon(future.set_result, fn(*args))
+        return future
+
+
+@pytest.mark.parametrize(
+    "max_age, responses",
+    [(60, []), (0, [create_not_modified_response()])],
+    ids=["fresh", "revalidated"],
+)
+def test_async_client_awaits_the_worker_for_cached_responses(tmp_path, max_age, responses):
+    path = str(tmp_path / "cache.db")
+    create_client([create_cacheable_response(MODE_JSON * 50, max_age)], cache=SQLiteResponseCache(path)) \
+        .get_line_meta_modes()
+
+    async def main():
+        # a new cache, as if in another process, so the entry only has the raw body
+        client = create_async_client(
+            responses, cache=SQLiteResponseCache(path), deserialize_executor=EventLoopExecutor(),
+            offload_threshold=1024, offload_models={"Mode"},
+        )
+        return await client.get_line_meta_modes()
+
+    result = asyncio.run(main())
+
+    assert len(result) == 50
+    assert isinstance(result[0], Mode)
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pydantic_tfl_api.models import ApiError, StopPoint
+
+from .helpers import create_async_client, create_cacheable_response, create_client, error_response
+
+
+def stop_point_json(naptan_id: str) -> dict:
+    return {
+        "naptanId": naptan_id, "modes": ["bus"], "lines": [], "lineGroup": [], "lineModeGroups": [],
+        "id": naptan_id, "commonName": naptan_id, "placeType": "StopPoint", "additionalProperties": [],
+        "lat": 51.5, "lon": -0.1,
+    }
+
+
+class PagedApi:
+    """Serves ``total`` bus stops ``page_size`` at a time, and records how many requests overlap."""
+
+    def __init__(self, total: int, page_size: int, failing_page: int = None, delay: float = 0.01):
+        self.total = total
+        self.page_size = page_size
+        self.failing_page = failing_page
+        self.delay = delay
+        self.pages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def send_request(self, location, params=None, headers=None, stream=False):
+        page = params["page"]
+        with self._lock:
+            self.pages.append(page)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return self.response(page)
+
+    async def send_request_async(self, location, params=None, headers=None, stream=False):
+        page = params["page"]
+        self.pages.append(page)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return self.response(page)
+
+    def response(self, page: int):
+        if page == self.failing_page:
+            return error_response(503)
+        start = (page - 1) * self.page_size
+        ids = [f"stop{i}" for i in range(start, min(start + self.page_size, self.total))]
+        return create_cacheable_response({
+            "stopPoints": [stop_point_json(id) for id in ids],
+            "pageSize": self.page_size, "total": self.total, "page": page,
+        })
+
+    def expected_ids(self, pages: int = None) -> list[str]:
+        count = self.total if pages is None else min(self.total, pages * self.page_size)
+        return [f"stop{i}" for i in range(count)]
+
+
+def naptan_ids(items) -> list[str]:
+    return [item["naptanId"] if isinstance(item, dict) else item.naptan_id for item in items]
+
+
+@pytest.mark.parametrize(
+    "total, page_size, prefetch, expected_pages",
+    [(25, 5, 2, 5), (23, 5, 3, 5), (5, 5, 2, 1), (0, 5, 2, 1), (12, 5, 8, 3)],
+    ids=["whole_pages", "partial_last_page", "one_page", "empty", "prefetch_more_than_pages"],
+)
+def test_pages_are_yielded_in_order(total, page_size, prefetch, expected_pages):
+    api = PagedApi(total, page_size)
+
+    items = list(create_client(api.send_request).paginate_stop_points_by_mode("bus", prefetch=prefetch))
+
+    assert all(isinstance(item, StopPoint) for item in items)
+    assert naptan_ids(items) == api.expected_ids()
+    assert sorted(api.pages) == list(range(1, expected_pages + 1))
+    assert api.max_in_flight <= prefetch
+
+
+def test_requests_in_flight_are_bounded():
+    api = PagedApi(100, 5)
+
+    items = list(create_client(api.send_request).paginate_stop_points_by_mode("bus", prefetch=3))
+
+    assert len(items) == 100
+    assert api.max_in_flight == 3
+
+
+def test_stopping_early_cancels_queued_pages():
+    api = PagedApi(100, 5)
+    pages = create_client(api.send_request).paginate_stop_points_by_mode("bus", prefetch=2)
+
+    items = [next(pages) for _ in range(7)]
+    pages.close()
+
+    assert naptan_ids(items) == api.expected_ids()[:7]
+    # the first page, the second being used and at most two queued behind it
+    assert len(api.pages) <= 4
+
+
+def test_failed_page_is_the_last_item():
+    api = PagedApi(30, 5, failing_page=3)
+
+    items = list(create_client(api.send_request).paginate_stop_points_by_mode("bus"))
+
+    assert isinstance(items[-1], ApiError)
+    assert naptan_ids(items[:-1]) == api.expected_ids(pages=2)
+
+
+@pytest.mark.parametrize("kwargs", [{"validation": "raw"}, {"envelope": True}], ids=["raw", "envelope"])
+def test_other_result_shapes(kwargs):
+    api = PagedApi(12, 5)
+    client = create_client(api.send_request, **kwargs)
+
+    assert naptan_ids(client.paginate_stop_points_by_mode("bus")) == api.expected_ids()
+
+
+def test_invalid_prefetch():
+    with pytest.raises(ValueError):
+        next(create_client(PagedApi(10, 5).send_request).paginate_stop_points_by_mode("bus", prefetch=0))
+
+
+def test_async_pages_are_yielded_in_order():
+    api = PagedApi(42, 5)
+    client = create_async_client(api.send_request_async)
+
+    async def main():
+        return [item async for item in client.paginate_stop_points_by_mode("bus", prefetch=3)]
+
+    items = asyncio.run(main())
+
+    assert naptan_ids(items) == api.expected_ids()
+    assert api.max_in_flight == 3
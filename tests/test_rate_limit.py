@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pydantic_tfl_api.rate_limit import RateLimiter, _current_lane, lane
+from pydantic_tfl_api.rest_client import RestClient
+
+from .helpers import create_cacheable_response, create_client
+
+
+def test_burst_is_sent_straight_away():
+    limiter = RateLimiter(rate=1, burst=3)
+
+    waits = [limiter.acquire() for _ in range(3)]
+
+    assert max(waits) < 0.05
+    assert limiter.stats["interactive"].requests == 3
+    assert limiter.stats["interactive"].delayed == 0
+
+
+def test_requests_are_spaced_out_at_the_rate():
+    limiter = RateLimiter(rate=100, burst=1)
+
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+
+    assert time.monotonic() - start >= 0.045
+    stats = limiter.stats["interactive"]
+    assert stats.delayed == 5
+    assert stats.max_wait > 0 and stats.mean_wait > 0
+    assert stats.queued == 0
+
+
+def test_interactive_lane_goes_ahead_of_queued_background_requests():
+    limiter = RateLimiter(rate=20, burst=1)
+    limiter.acquire()
+    order = []
+
+    def request(name):
+        limiter.acquire(name)
+        order.append(name)
+
+    threads = [threading.Thread(target=request, args=("background",)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while limiter.stats["background"].queued < 3:
+        time.sleep(0.001)
+    interactive = threading.Thread(target=request, args=("interactive",))
+    interactive.start()
+    for thread in threads + [interactive]:
+        thread.join()
+
+    assert order == ["interactive", "background", "background", "background"]
+    assert limiter.stats["background"].max_wait > limiter.stats["interactive"].max_wait
+
+
+def test_async_interactive_lane_goes_ahead_of_queued_background_requests():
+    limiter = RateLimiter(rate=20, burst=1)
+    order = []
+
+    async def request(name):
+        await limiter.acquire_async(name)
+        order.append(name)
+
+    async def main():
+        await limiter.acquire_async()
+        background = [asyncio.create_task(request("background")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        with lane("interactive"):
+            interactive = asyncio.create_task(request("interactive"))
+        await asyncio.gather(interactive, *background)
+
+    asyncio.run(main())
+
+    assert order == ["interactive", "background", "background", "background"]
+
+
+def test_lane_context():
+    limiter = RateLimiter(rate=1000, burst=10, lanes=("urgent", "bulk"))
+
+    limiter.acquire()
+    with lane("bulk"):
+        limiter.acquire()
+        limiter.acquire("urgent")
+
+    assert limiter.stats["urgent"].requests == 2
+    assert limiter.stats["bulk"].requests == 1
+    with pytest.raises(ValueError):
+        limiter.acquire("unknown")
+    assert limiter.stats["urgent"].queued == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"rate": 0}, {"rate": 1, "burst": 0}, {"rate": 1, "lanes": ()}],
+    ids=["rate", "burst", "lanes"],
+)
+def test_invalid_settings(kwargs):
+    with pytest.raises(ValueError):
+        RateLimiter(**kwargs)
+
+
+def test_rest_client_waits_for_rate_limiter():
+    limiter = Mock(spec=RateLimiter)
+    client = RestClient(rate_limiter=limiter)
+
+    with patch.object(client.session, "get") as mock_get:
+        mock_get.side_effect = lambda *args, **kwargs: limiter.acquire.assert_called_once()
+        client.send_request("Line/Meta/Modes")
+
+    mock_get.assert_called_once()
+
+
+def test_get_many_workers_keep_the_callers_lane():
+    lanes = []
+
+    def send_request(location, *args, **kwargs):
+        lanes.append(_current_lane.get())
+        ids = location.split("/")[1].split(",")
+        return create_cacheable_response([{"id": id, "name": id, "modeName": "tube"} for id in ids])
+
+    client = create_client(send_request)
+
+    with lane("background"):
+        client.get_line_status_many(["a", "b", "c"], chunk_size=1)
+
+    assert lanes == ["background"] * 3
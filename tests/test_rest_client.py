@@ -0,0 +1,106 @@
+import pytest
+from unittest.mock import patch
+
+from requests.adapters import HTTPAdapter
+
+from pydantic_tfl_api.rest_client import RestClient
+from pydantic_tfl_api.config import base_url
+
+
+@pytest.mark.parametrize(
+    "pool_connections, pool_maxsize, pool_block",
+    [
+        (10, 10, False),
+        (2, 50, True),
+    ],
+    ids=["defaults", "custom_pool"],
+)
+def test_session_adapter_uses_pool_settings(pool_connections, pool_maxsize, pool_block):
+    client = RestClient(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+    adapter = client.session.get_adapter("https://api.tfl.gov.uk/")
+
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_connections == pool_connections
+    assert adapter._pool_maxsize == pool_maxsize
+    assert adapter._pool_block == pool_block
+
+
+@pytest.mark.parametrize(
+    "keep_alive, expected_connection_header",
+    [
+        (True, "keep-alive"),
+        (False, "close"),
+    ],
+    ids=["keep_alive", "no_keep_alive"],
+)
+def test_keep_alive(keep_alive, expected_connection_header):
+    client = RestClient(keep_alive=keep_alive)
+
+    assert client.session.headers["Connection"] == expected_connection_header
+
+
+@pytest.mark.parametrize(
+    "app_key, params, timeout, expected_url, expected_headers",
+    [
+        (
+            None,
+            None,
+            None,
+            f"{base_url}Line/Meta/Modes?",
+            {"Content-Type": "application/json", "Accept": "application/json"},
+        ),
+        (
+            "key",
+            {"detail": True},
+            5,
+            f"{base_url}Line/victoria/Status?detail=True",
+            {"Content-Type": "application/json", "Accept": "application/json", "app_key": "key"},
+        ),
+    ],
+    ids=["no_params", "with_params_and_key"],
+)
+def test_send_request_uses_session(app_key, params, timeout, expected_url, expected_headers):
+    client = RestClient(app_key, timeout=timeout)
+    location = "Line/Meta/Modes" if params is None else "Line/victoria/Status"
+
+    with patch.object(client.session, "get") as mock_get:
+        result = client.send_request(location, params)
+
+    assert result == mock_get.return_value
+    mock_get.assert_called_once_with(expected_url, headers=expected_headers, timeout=timeout, stream=False)
+
+
+def test_send_request_uses_custom_base_url():
+    client = RestClient(base_url="http://localhost:8080/")
+
+    with patch.object(client.session, "get") as mock_get:
+        client.send_request("Line/Meta/Modes")
+
+    assert mock_get.call_args.args[0] == "http://localhost:8080/Line/Meta/Modes?"
+
+
+def test_context_manager_closes_session():
+    with patch.object(RestClient, "close") as mock_close:
+        with RestClient() as client:
+            assert isinstance(client, RestClient)
+        mock_close.assert_called_once()
+
+
+def test_close_closes_session():
+    client = RestClient()
+
+    with patch.object(client.session, "close") as mock_session_close:
+        client.close()
+
+    mock_session_close.assert_called_once()
+
+
+def test_send_request_adds_extra_headers():
+    client = RestClient()
+
+    with patch.object(client.session, "get") as mock_get:
+        client.send_request("Line/Meta/Modes", headers={"If-None-Match": '"abc"'})
+
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+    assert mock_get.call_args.kwargs["headers"]["Accept"] == "application/json"
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from pydantic_tfl_api.client import Client
+from pydantic_tfl_api.models import ApiError, Mode
+from pydantic_tfl_api.retry import RetryPolicy
+
+from .helpers import MODE_JSON, create_cacheable_response, error_response
+from .helpers import create_client as create_mock_client
+
+
+def create_client(responses: list, **policy_kwargs) -> tuple[Client, RetryPolicy]:
+    policy = RetryPolicy(**{"base_delay": 0.001, **policy_kwargs})
+    return create_mock_client(responses, retry=policy), policy
+
+
+@pytest.mark.parametrize(
+    "retry, expected",
+    [(0, 1.0), (1, 2.0), (3, 8.0), (5, 10.0)],
+)
+def test_backoff_doubles_up_to_max_delay(retry, expected):
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=False)
+
+    assert policy.backoff(retry) == expected
+    assert 0 <= RetryPolicy(base_delay=1.0, max_delay=10.0).backoff(retry) <= expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        ("2", 2.0),
+        ("-1", 0.0),
+        (format_datetime(datetime(2024, 7, 15, 15, 41, 4, tzinfo=timezone.utc), usegmt=True), 30.0),
+        ("soon", None),
+    ],
+    ids=["missing", "seconds", "negative", "http_date", "invalid"],
+)
+def test_retry_after(value, expected):
+    response = error_response(429, value)
+    now = datetime(2024, 7, 15, 15, 40, 34, tzinfo=timezone.utc)
+
+    assert RetryPolicy.retry_after(response, now) == expected
+
+
+def test_transient_errors_are_retried():
+    client, policy = create_client([
+        error_response(503), error_response(429, retry_after="0"), create_cacheable_response(MODE_JSON),
+    ])
+
+    result = client.get_line_meta_modes()
+
+    assert isinstance(result[0], Mode)
+    assert client.client.send_request.call_count == 3
+    assert policy.stats.calls == 1
+    assert policy.stats.retries == 2
+    assert policy.stats.retries_by_status == {503: 1, 429: 1}
+    assert policy.stats.gave_up == 0
+
+
+@pytest.mark.parametrize(
+    "responses, policy_kwargs, expected_requests",
+    [
+        ([error_response(404)], {}, 1),
+        ([error_response(502)] * 3, {"max_retries": 2}, 3),
+        ([error_response(429, retry_after="120")], {"max_delay": 60}, 1),
+        ([error_response(503)], {"base_delay": 10, "jitter": False, "deadline": 5}, 1),
+        ([error_response(503)], {"methods": ()}, 1),
+    ],
+    ids=["not_transient", "out_of_retries", "retry_after_too_long", "past_deadline", "method_not_retried"],
+)
+def test_gives_up(responses, policy_kwargs, expected_requests):
+    client, policy = create_client(responses, **policy_kwargs)
+
+    result = client.get_line_meta_modes()
+
+    assert isinstance(result, ApiError)
+    assert client.client.send_request.call_count == expected_requests
+    assert policy.stats.gave_up == (0 if responses[0].status_code == 404 else 1)
+
+
+def test_connection_errors_are_retried():
+    client, policy = create_client([
+        requests.ConnectionError("reset"), requests.Timeout("slow"), create_cacheable_response(MODE_JSON),
+    ])
+
+    assert isinstance(client.get_line_meta_modes()[0], Mode)
+    assert policy.stats.retried_errors == 2
+
+
+def test_connection_errors_are_raised_after_retrying():
+    client, policy = create_client([requests.ConnectionError("reset")] * 2, max_retries=1)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get_line_meta_modes()
+    assert client.client.send_request.call_count == 2
+    assert policy.stats.gave_up == 1
+
+
+def test_no_retries_without_a_policy():
+    client = create_mock_client([error_response(503), create_cacheable_response(MODE_JSON)])
+
+    assert isinstance(client.get_line_meta_modes(), ApiError)
+
+
+def test_deadline_counts_from_the_start_of_the_call():
+    now = [0.0]
+    policy = RetryPolicy(base_delay=1, jitter=False, deadline=2.5, clock=lambda: now[0])
+    attempts = policy.start()
+
+    assert attempts.next_delay(error_response(503)) == 1
+    now[0] = 1.2
+    assert attempts.next_delay(error_response(503)) is None
+    assert policy.stats.retries == 1 and policy.stats.gave_up == 1
+
+
+def test_retry_after_as_http_date_in_the_past():
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(minutes=1), usegmt=True)
+
+    assert RetryPolicy.retry_after(error_response(503, past)) == 0.0
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pydantic_tfl_api.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_with_same_key_run_once():
+    single_flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def fn():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        leader = executor.submit(single_flight.do, "key", fn)
+        started.wait()
+        followers = [executor.submit(single_flight.do, "key", fn) for _ in range(19)]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.coalesced == 19
+
+
+def test_sequential_calls_are_not_coalesced():
+    single_flight = SingleFlight()
+
+    assert single_flight.do("key", lambda: 1) == 1
+    assert single_flight.do("key", lambda: 2) == 2
+    assert single_flight.coalesced == 0
+
+
+def test_exception_is_shared_with_waiters():
+    single_flight = SingleFlight()
+    started = threading.Event()
+
+    def fn():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(single_flight.do, "key", fn)
+        started.wait()
+        follower = executor.submit(single_flight.do, "key", fn)
+        for future in [leader, follower]:
+            with pytest.raises(RuntimeError):
+                future.result()
+
+    # the failed call is forgotten, so the next one runs again
+    assert single_flight.do("key", lambda: "ok") == "ok"
+
+
+@pytest.mark.asyncio
+async def test_async_concurrent_calls_with_same_key_run_once():
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*(single_flight.do("key", fn) for _ in range(50)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.coalesced == 49
+
+
+@pytest.mark.asyncio
+async def test_async_exception_is_shared_with_waiters():
+    single_flight = AsyncSingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*(single_flight.do("key", fn) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_async_cancelling_the_first_caller_leaves_the_others_waiting():
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    first = asyncio.ensure_future(single_flight.do("key", fn))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(single_flight.do("key", fn))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "ok"
+    assert first.cancelled()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_call_is_cancelled_once_every_caller_is():
+    single_flight = AsyncSingleFlight()
+    cancelled = asyncio.Event()
+
+    async def fn():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    callers = [asyncio.ensure_future(single_flight.do("key", fn)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    callers[0].cancel()
+    await asyncio.sleep(0.01)
+    assert not cancelled.is_set()
+
+    callers[1].cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    # the next call starts afresh
+    assert await single_flight.do("key", lambda: asyncio.sleep(0, "again")) == "again"
@@ -0,0 +1,112 @@
+from math import asin, cos, radians, sin, sqrt
+from types import SimpleNamespace
+
+import pytest
+
+from pydantic_tfl_api.envelope import ResponseEnvelope
+from pydantic_tfl_api.models import StopPoint, StopPointsResponse
+from pydantic_tfl_api.spatial import EARTH_RADIUS_M, StopPointIndex
+
+from .helpers import load_fixture_json
+
+
+def load_stop_points(fixture_name: str = "stopPointsByLineId_14_None_StopPoint") -> list[StopPoint]:
+    return [StopPoint.model_validate(item) for item in load_fixture_json(fixture_name)]
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * asin(sqrt(a))
+
+
+def stop(id: str, lat: float, lon: float) -> SimpleNamespace:
+    return SimpleNamespace(id=id, lat=lat, lon=lon)
+
+
+def brute_force(stop_points, lat, lon):
+    return sorted((haversine(lat, lon, s.lat, s.lon), s.id) for s in stop_points)
+
+
+@pytest.fixture(scope="module")
+def stop_points():
+    return load_stop_points()
+
+
+@pytest.mark.parametrize("cell_size", [100.0, 500.0, 5000.0])
+@pytest.mark.parametrize(
+    "lat, lon",
+    [(51.5074, -0.1278), (51.4613, -0.1156), (51.7, 0.3)],
+    ids=["charing_cross", "brixton", "outside_london"],
+)
+def test_nearest_and_within_match_a_linear_scan(stop_points, cell_size, lat, lon):
+    index = StopPointIndex(stop_points, cell_size=cell_size)
+    expected = brute_force(stop_points, lat, lon)
+
+    nearest = index.nearest(lat, lon, k=5)
+    within = index.within(lat, lon, 1500)
+
+    assert [(round(d, 6), s.id) for d, s in nearest] == [(round(d, 6), id) for d, id in expected[:5]]
+    assert [s.id for _, s in within] == [id for d, id in expected if d <= 1500]
+
+
+def test_nearest_respects_max_distance(stop_points):
+    index = StopPointIndex(stop_points)
+
+    assert index.nearest(51.7, 0.3, k=3, max_distance=100) == []
+    assert len(index.nearest(51.5074, -0.1278, k=len(stop_points) + 10)) == len(stop_points)
+
+
+def test_index_accepts_responses_and_envelopes(stop_points):
+    response = StopPointsResponse(stopPoints=stop_points[:10], pageSize=10, total=10, page=1)
+
+    assert len(StopPointIndex(response)) == 10
+    assert len(StopPointIndex(ResponseEnvelope(stop_points[:4], 200))) == 4
+    assert len(StopPointIndex(ResponseEnvelope(response, 200))) == 10
+
+
+def test_update_replaces_points_with_the_same_key():
+    index = StopPointIndex([stop("a", 51.5, -0.1)])
+
+    index.update([stop("a", 51.6, -0.2)])
+
+    assert len(index) == 1
+    assert index["a"].lat == 51.6
+    assert index.nearest(51.6, -0.2)[0][0] == pytest.approx(0)
+
+
+def test_group_update_only_touches_that_group():
+    index = StopPointIndex()
+    index.update([stop("a", 51.5, -0.1), stop("shared", 51.51, -0.11)], group="victoria")
+    index.update([stop("b", 51.52, -0.12), stop("shared", 51.51, -0.11)], group="northern")
+    index.update([stop("c", 51.53, -0.13)])
+
+    index.update([stop("d", 51.54, -0.14)], group="victoria")
+
+    assert sorted(s.id for s in index) == ["b", "c", "d", "shared"]
+
+    index.remove_group("northern")
+
+    assert sorted(s.id for s in index) == ["c", "d"]
+    assert "shared" not in index
+
+
+def test_remove():
+    index = StopPointIndex([stop("a", 51.5, -0.1), stop("b", 51.5, -0.1)])
+
+    index.remove("a")
+
+    assert [s.id for _, s in index.within(51.5, -0.1, 10)] == ["b"]
+    with pytest.raises(KeyError):
+        index.remove("a")
+
+
+def test_points_without_coordinates_are_skipped():
+    index = StopPointIndex([stop("a", None, None), stop("b", 51.5, -0.1)])
+
+    assert "a" not in index and "b" in index
+
+
+def test_invalid_cell_size():
+    with pytest.raises(ValueError):
+        StopPointIndex(cell_size=0)
@@ -0,0 +1,104 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from pydantic_tfl_api.cache import CacheEntry, CacheStats
+from pydantic_tfl_api.sqlite_cache import SQLiteResponseCache
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def create_entry(value="value", expires=NOW + timedelta(hours=1), content=b"[]") -> CacheEntry:
+    return CacheEntry(
+        value, expires, etag='"v1"', last_modified="Mon, 15 Jul 2024 15:40:43 GMT",
+        content=content, headers={"Date": "Mon, 15 Jul 2024 15:40:43 GMT"},
+    )
+
+
+def read_entry(path: str, key: str):
+    entry = SQLiteResponseCache(path).get(key)
+    return entry.content, entry.expires, entry.is_fresh()
+
+
+def test_get_returns_memorised_entry_in_same_process(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.db"))
+    entry = create_entry()
+    cache.set("a", entry)
+
+    assert cache.get("a") is entry
+    assert cache.get("missing") is None
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+
+def test_new_instance_reads_raw_response_from_disk(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SQLiteResponseCache(path).set("a", create_entry(content=b'[{"a": 1}]'))
+
+    entry = SQLiteResponseCache(path).get("a")
+
+    assert entry.value is None
+    assert entry.content == b'[{"a": 1}]'
+    assert entry.headers == {"Date": "Mon, 15 Jul 2024 15:40:43 GMT"}
+    assert entry.expires == NOW + timedelta(hours=1)
+    assert entry.etag == '"v1"'
+    assert entry.last_modified == "Mon, 15 Jul 2024 15:40:43 GMT"
+    assert entry.is_fresh()
+
+
+def test_memory_maxsize_zero_always_reads_from_disk(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.db"), memory_maxsize=0)
+    cache.set("a", create_entry())
+
+    assert cache.get("a").value is None
+
+
+def test_oldest_responses_are_evicted(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.db"), maxsize=2)
+    for key in ["a", "b", "c"]:
+        cache.set(key, create_entry())
+
+    assert "a" not in cache
+    assert "b" in cache
+    assert "c" in cache
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+
+def test_revalidate_is_seen_by_other_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    writer = SQLiteResponseCache(path)
+    reader = SQLiteResponseCache(path)
+    writer.set("a", create_entry(expires=NOW - timedelta(hours=1)))
+    assert not reader.get("a").is_fresh()
+
+    writer.revalidate("a", NOW + timedelta(hours=2))
+
+    assert reader.get("a").expires == NOW + timedelta(hours=2)
+    assert writer.stats.revalidations == 1
+
+
+def test_clear(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.db"))
+    cache.set("a", create_entry())
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get("a") is None
+
+
+def test_set_requires_raw_content(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.db"))
+
+    with pytest.raises(ValueError):
+        cache.set("a", CacheEntry("value", None))
+
+
+def test_concurrent_reads_from_several_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SQLiteResponseCache(path).set("a", create_entry(content=b"x" * 100_000))
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(read_entry, [path] * 8, ["a"] * 8))
+
+    assert results == [(b"x" * 100_000, NOW + timedelta(hours=1), True)] * 8
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from pydantic_tfl_api.streaming import JsonArrayStream
+
+from .helpers import load_fixture
+
+
+def feed_in_chunks(stream: JsonArrayStream, body: bytes, chunk_size: int) -> list:
+    items = []
+    for i in range(0, len(body), chunk_size):
+        items += stream.feed(body[i:i + chunk_size])
+    return items + stream.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 100_000], ids=["1_byte", "3_bytes", "64_bytes", "whole_body"])
+@pytest.mark.parametrize(
+    "key, body, expected_items, expected_metadata",
+    [
+        (None, '[{"a": 1}, {"b": [1, 2]}, "x", 12345, null]', [{"a": 1}, {"b": [1, 2]}, "x", 12345, None], {}),
+        (None, " [ ] ", [], {}),
+        (
+            "stopPoints",
+            '{"$type": "t", "stopPoints": [{"id": "1"}, {"id": "2"}], "pageSize": 2, "total": 2, "page": 1}',
+            [{"id": "1"}, {"id": "2"}],
+            {"$type": "t", "pageSize": 2, "total": 2, "page": 1},
+        ),
+        ("stopPoints", '{"stopPoints": null, "total": 0}', [], {"stopPoints": None, "total": 0}),
+        ("stopPoints", '{"total": 0}', [], {"total": 0}),
+        (None, '["café →", "\\u00e9\\"]"]', ["café →", "é\"]"], {}),
+    ],
+    ids=["array", "empty_array", "object", "null_array", "missing_key", "unicode_and_escapes"],
+)
+def test_stream_yields_array_items(key, body, expected_items, expected_metadata, chunk_size):
+    stream = JsonArrayStream(key)
+
+    items = feed_in_chunks(stream, body.encode("utf-8"), chunk_size)
+
+    assert items == expected_items
+    assert stream.metadata == expected_metadata
+
+
+def test_stream_yields_items_before_body_is_complete():
+    stream = JsonArrayStream()
+
+    assert stream.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    assert stream.feed(b': 2}]') == [{"b": 2}]
+    assert stream.close() == []
+
+
+@pytest.mark.parametrize(
+    "body",
+    ['[{"a": 1}, {"b"', '[1, 2', '{"stopPoints": [1]', '[1; 2]', '{"a": 1}'],
+    ids=["truncated_item", "truncated_array", "truncated_object", "bad_separator", "not_an_array"],
+)
+def test_stream_rejects_invalid_body(body):
+    stream = JsonArrayStream()
+
+    with pytest.raises(ValueError):
+        feed_in_chunks(stream, body.encode("utf-8"), 4)
+
+
+def test_stream_matches_json_loads_for_recorded_response():
+    body = load_fixture("stopPointByMode_overground_None_StopPointsResponse")["content"].encode("utf-8")
+    stream = JsonArrayStream("stopPoints")
+
+    items = feed_in_chunks(stream, body, 65536)
+
+    expected = json.loads(body)
+    assert items == expected.pop("stopPoints")
+    assert stream.metadata == expected
@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from unittest.mock import patch
+
+import pytest
+
+from pydantic_tfl_api import Delta
+from pydantic_tfl_api.models import ApiError, Line
+from pydantic_tfl_api.watch import DeltaTracker, natural_key, next_delay, same_content
+
+from .helpers import create_async_client, create_cacheable_response, create_client, error_response
+
+
+def line_json(id: str, severity: int = 10) -> dict:
+    return {
+        "id": id, "name": id.title(), "modeName": "tube",
+        "lineStatuses": [{
+            "id": 0, "statusSeverity": severity, "statusSeverityDescription": "Good Service",
+            "created": "2024-07-15T15:40:00Z",
+        }],
+    }
+
+
+@pytest.mark.parametrize(
+    "item, expected",
+    [
+        (Line(id="victoria"), "victoria"),
+        ({"naptanId": "940GZZLUVIC", "commonName": "Victoria"}, "940GZZLUVIC"),
+    ],
+    ids=["model", "raw"],
+)
+def test_natural_key(item, expected):
+    assert natural_key(item) == expected
+
+
+def test_natural_key_unknown():
+    with pytest.raises(ValueError):
+        natural_key(object())
+
+
+def test_same_content_ignores_expiry():
+    old = Line.model_validate(line_json("victoria"))
+    new = Line.model_validate(line_json("victoria"))
+    new.content_expires = datetime.now(timezone.utc)
+
+    assert same_content(old, new)
+    assert not same_content(old, Line.model_validate(line_json("victoria", severity=6)))
+
+
+def test_tracker():
+    tracker = DeltaTracker()
+    first = tracker.update([{"id": "a", "v": 1}, {"id": "b", "v": 1}])
+    second = tracker.update([{"id": "a", "v": 2}, {"id": "c", "v": 1}, {"id": "b", "v": 1}])
+
+    assert set(first.added) == {"a", "b"}
+    assert second.added == {"c": {"id": "c", "v": 1}}
+    assert second.changed == {"a": {"id": "a", "v": 2}}
+    assert second.removed == {}
+    assert tracker.update([]).removed.keys() == {"a", "b", "c"}
+    assert not tracker.update([])
+
+
+@pytest.mark.parametrize(
+    "expires, expected",
+    [(None, 30.0), (timedelta(seconds=10), 10.0), (timedelta(seconds=-5), 1.0)],
+    ids=["no_expiry", "future", "past"],
+)
+def test_next_delay(expires, expected):
+    now = datetime(2024, 7, 15, 15, 40, tzinfo=timezone.utc)
+
+    assert next_delay(expires and now + expires, 1.0, 30.0, now) == expected
+
+
+@patch("pydantic_tfl_api.client.time.sleep")
+def test_watch_yields_deltas(mock_sleep):
+    client = create_client([
+        create_cacheable_response([line_json("victoria"), line_json("central")], max_age=30),
+        create_cacheable_response([line_json("victoria"), line_json("central")], max_age=30),
+        create_cacheable_response([line_json("victoria", severity=6)], max_age=30),
+    ])
+
+    first, second = islice(client.watch("get_line_status_by_mode", "tube"), 2)
+
+    assert set(first.added) == {"victoria", "central"}
+    assert first.content_expires is not None
+    # the unchanged second fetch wasn't yielded
+    assert client.client.send_request.call_count == 3
+    assert second.changed["victoria"].line_statuses[0].status_severity == 6
+    assert set(second.removed) == {"central"}
+    # each fetch waited for the previous result to expire
+    assert 25 < mock_sleep.call_args_list[0].args[0] <= 30
+
+
+@patch("pydantic_tfl_api.client.time.sleep")
+def test_watch_errors(mock_sleep):
+    client = create_client([
+        error_response(503), create_cacheable_response([line_json("victoria")], max_age=None),
+    ])
+
+    error, delta = islice(client.watch(client.get_line_status_by_mode, "tube", error_interval=5), 2)
+
+    assert isinstance(error.error, ApiError)
+    assert not error.added
+    assert set(delta.added) == {"victoria"}
+    assert mock_sleep.call_args_list[0].args[0] == 5
+
+
+@patch("pydantic_tfl_api.client.time.sleep")
+def test_watch_emit_empty(mock_sleep):
+    client = create_client([create_cacheable_response([line_json("victoria")])] * 2)
+
+    deltas = list(islice(client.watch("get_line_status_by_mode", "tube", emit_empty=True), 2))
+
+    assert isinstance(deltas[1], Delta)
+    assert not deltas[1]
+
+
+def test_async_watch():
+    client = create_async_client([
+        create_cacheable_response([line_json("victoria")], max_age=0),
+        create_cacheable_response([line_json("victoria", severity=6)], max_age=0),
+    ])
+
+    async def main():
+        deltas = []
+        async for delta in client.watch("get_line_status_by_mode", "tube", min_interval=0):
+            deltas.append(delta)
+            if len(deltas) == 2:
+                return deltas
+
+    first, second = asyncio.run(main())
+
+    assert set(first.added) == {"victoria"}
+    assert set(second.changed) == {"victoria"}